@@ -0,0 +1,107 @@
+"""partition job_progress_events by month
+
+Revision ID: 9b1f6c2d4e7a
+Revises: ec05e0687cde
+Create Date: 2026-10-18 10:12:41.503118
+
+Recreates job_progress_events as a table range-partitioned on created_at,
+with one partition per month from the oldest existing event up to two
+months ahead, plus a DEFAULT partition. The primary key becomes
+(id, created_at) since it must contain the partition key, and the
+redundant single-column job_id index is gone: idx_job_progress_job_created
+serves lookups by job_id. Later partitions are created (and expired ones
+dropped) by the worker's maintain_progress_partitions cron job.
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1f6c2d4e7a'
+down_revision: Union[str, None] = 'ec05e0687cde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 2
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE job_progress_events RENAME TO job_progress_events_unpartitioned")
+    op.execute("ALTER TABLE job_progress_events_unpartitioned RENAME CONSTRAINT job_progress_events_pkey TO job_progress_events_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_job_progress_job_created")
+    op.execute("DROP INDEX IF EXISTS ix_job_progress_events_job_id")
+
+    op.execute("""
+        CREATE TABLE job_progress_events (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            job_id UUID NOT NULL REFERENCES processing_jobs(id) ON DELETE CASCADE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            progress_data JSONB NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.create_index('idx_job_progress_job_created', 'job_progress_events', ['job_id', 'created_at'])
+    op.execute("CREATE TABLE job_progress_events_default PARTITION OF job_progress_events DEFAULT")
+
+    # Monthly partitions from the oldest event (or now) to MONTHS_AHEAD ahead
+    now = datetime.now(timezone.utc)
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM job_progress_events_unpartitioned")
+    ).scalar() or now
+    oldest = oldest.astimezone(timezone.utc)
+    month = _month_start(oldest.year, oldest.month)
+    last = _month_start(now.year, now.month + MONTHS_AHEAD)
+    while month <= last:
+        following = _month_start(month.year, month.month + 1)
+        op.execute(
+            f"CREATE TABLE job_progress_events_p{month.year:04d}{month.month:02d} "
+            f"PARTITION OF job_progress_events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    op.execute("""
+        INSERT INTO job_progress_events (id, job_id, created_at, updated_at, progress_data)
+        SELECT id, job_id, created_at, updated_at, progress_data
+        FROM job_progress_events_unpartitioned
+    """)
+    op.drop_table('job_progress_events_unpartitioned')
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE job_progress_events RENAME TO job_progress_events_partitioned")
+    op.execute("ALTER TABLE job_progress_events_partitioned RENAME CONSTRAINT job_progress_events_pkey TO job_progress_events_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_job_progress_job_created")
+
+    op.create_table(
+        'job_progress_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('processing_jobs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('progress_data', postgresql.JSONB, nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()'))
+    )
+    op.create_index(
+        'idx_job_progress_job_created',
+        'job_progress_events',
+        ['job_id', sa.text('created_at DESC')]
+    )
+
+    op.execute("""
+        INSERT INTO job_progress_events (id, job_id, created_at, updated_at, progress_data)
+        SELECT id, job_id, created_at, updated_at, progress_data
+        FROM job_progress_events_partitioned
+    """)
+    # Drops all partitions with it
+    op.drop_table('job_progress_events_partitioned')
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
+from app.core.user_cache import cache_user, get_cached_user
 from app.models.user import User
 
 
@@ -22,6 +23,10 @@ async def get_current_ws_user(
     """
     Authenticate WebSocket connection via query parameter token.
 
+    Active users are served from the user cache (see app.core.user_cache)
+    so reconnect storms don't each cost a database round trip; a cached
+    user is a transient User with id, email and is_active only.
+
     Args:
         websocket: WebSocket connection
         token: JWT token from query parameter
@@ -52,6 +57,10 @@ async def get_current_ws_user(
         await websocket.close(code=1008)
         raise credentials_exception
 
+    user = await get_cached_user(user_id)
+    if user is not None:
+        return user
+
     # Query user from database using context manager
     async with AsyncSessionLocal() as db:
         stmt = select(User).where(User.id == user_id)
@@ -62,4 +71,5 @@ async def get_current_ws_user(
             await websocket.close(code=1008)
             raise credentials_exception
 
-        return user
+    await cache_user(user)
+    return user
@@ -0,0 +1,127 @@
+"""
+Liveness and readiness endpoints.
+
+Liveness (GET /api/health/live) only says the process serves requests.
+Readiness (GET /api/health/ready) checks what requests need: a SELECT 1
+through the pool, Redis PING, pool saturation, and the heartbeat the ARQ
+workers write to ARQ_HEALTH_CHECK_KEY. It answers 503 while the database,
+Redis or the pool fail so the load balancer stops routing here. A missing
+worker heartbeat is reported as a warning only: the API keeps serving.
+
+Readiness results are cached for settings.health_cache_ttl seconds and
+concurrent probes share one check, so probes stay cheap.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from fastapi import APIRouter, Response
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.redis import ARQ_HEALTH_CHECK_KEY, get_redis_client
+from app.schemas.health import DependencyCheck, ReadinessStatus
+
+router = APIRouter(prefix="/api/health", tags=["health"])
+
+# (monotonic time, result) of the last readiness check
+_readiness: Optional[tuple[float, ReadinessStatus]] = None
+_readiness_lock = asyncio.Lock()
+
+
+async def _timed(check: Callable[[], Awaitable[Optional[str]]]) -> DependencyCheck:
+    """Run a check with the configured timeout; it returns a detail or raises."""
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(check(), settings.health_check_timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        status, detail = "fail", f"Timed out after {settings.health_check_timeout}s"
+    except Exception as e:
+        status, detail = "fail", str(e) or type(e).__name__
+    return DependencyCheck(
+        status=status,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        detail=detail
+    )
+
+
+async def _check_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_redis() -> None:
+    redis = await get_redis_client()
+    await redis.ping()
+
+
+def _check_pool() -> DependencyCheck:
+    profile = settings.db_profile
+    capacity = getattr(settings, f"db_{profile}_pool_size") + getattr(settings, f"db_{profile}_max_overflow")
+    in_use = engine.pool.checkedout()
+    saturated = in_use >= capacity * settings.health_pool_saturation
+    return DependencyCheck(
+        status="fail" if saturated else "ok",
+        detail=f"{in_use}/{capacity} connections in use"
+    )
+
+
+async def _check_workers() -> DependencyCheck:
+    try:
+        redis = await get_redis_client()
+        heartbeat = await asyncio.wait_for(redis.get(ARQ_HEALTH_CHECK_KEY), settings.health_check_timeout)
+    except Exception as e:
+        return DependencyCheck(status="warn", detail=f"Worker heartbeat unavailable: {e}")
+    if heartbeat is None:
+        return DependencyCheck(status="warn", detail="No worker heartbeat")
+    return DependencyCheck(status="ok", detail=heartbeat)
+
+
+async def check_readiness() -> ReadinessStatus:
+    """Check all dependencies now (uncached)."""
+    # Before our own SELECT 1 takes a connection
+    pool = _check_pool()
+    database, redis, workers = await asyncio.gather(
+        _timed(_check_database),
+        _timed(_check_redis),
+        _check_workers()
+    )
+    checks = {"database": database, "redis": redis, "db_pool": pool, "workers": workers}
+    return ReadinessStatus(
+        ready=all(check.status != "fail" for check in checks.values()),
+        checked_at=datetime.now(timezone.utc),
+        checks=checks
+    )
+
+
+async def get_readiness() -> ReadinessStatus:
+    """Cached readiness: at most one check per health_cache_ttl seconds."""
+    global _readiness
+
+    if _readiness is not None and time.monotonic() - _readiness[0] < settings.health_cache_ttl:
+        return _readiness[1]
+
+    async with _readiness_lock:
+        # Another probe may have refreshed it while we waited
+        if _readiness is not None and time.monotonic() - _readiness[0] < settings.health_cache_ttl:
+            return _readiness[1]
+        status = await check_readiness()
+        _readiness = (time.monotonic(), status)
+        return status
+
+
+@router.get("/live")
+async def liveness() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadinessStatus)
+async def readiness(response: Response) -> ReadinessStatus:
+    status = await get_readiness()
+    if not status.ready:
+        response.status_code = 503
+    return status
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import BookmarkList, Video, User
 from app.schemas.list import ListCreate, ListResponse
 
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/api/lists", tags=["lists"])
 
 
 @router.get("", response_model=List[ListResponse])
-async def get_lists(db: AsyncSession = Depends(get_db)):
+async def get_lists(db: AsyncSession = Depends(get_read_db)):
     # First get all lists with video counts
     result = await db.execute(
         select(
@@ -76,13 +76,11 @@ async def create_list(
             )
             db.add(test_user)
             await db.flush()
-            await db.refresh(test_user)
         list_data.user_id = test_user.id
 
     new_list = BookmarkList(**list_data.model_dump())
     db.add(new_list)
-    await db.flush()
-    await db.refresh(new_list)
+    # created_at/updated_at come back with the INSERT (eager_defaults)
     await db.commit()
 
     return ListResponse(
@@ -98,7 +96,7 @@ async def create_list(
 
 
 @router.get("/{list_id}", response_model=ListResponse)
-async def get_list(list_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_list(list_id: UUID, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(
             BookmarkList.id,
@@ -1,19 +1,33 @@
+import base64
+import logging
+from collections import OrderedDict
 from uuid import UUID
 from datetime import datetime
 from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from arq.jobs import Job, JobStatus as ArqJobStatus
 
-from app.core.database import get_db
+from app.core.database import get_db, get_primary_read_db, get_read_db
+from app.core.job_control import (
+    clear_control,
+    enqueue_video_list,
+    get_arq_job_id,
+    request_cancel,
+    request_pause,
+    take_checkpoint,
+)
+from app.core.progress_snapshot import get_snapshot
+from app.core.redis import get_arq_pool, get_redis_client
 from app.models import BookmarkList, Video, ProcessingJob, User
 from app.models.job_progress import JobProgressEvent
-from app.schemas.job import JobResponse, JobStatus
+from app.schemas.job import JobProgress, JobResponse, JobStatus
 from app.schemas.job_progress import JobProgressEventRead
 
 router = APIRouter(prefix="/api", tags=["processing"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("/lists/{list_id}/process", response_model=JobResponse, status_code=201)
@@ -49,8 +63,6 @@ async def start_processing(
             status="running"
         )
         db.add(job)
-        await db.flush()
-        await db.refresh(job)
         await db.commit()
 
         # TODO: Enqueue ARQ tasks
@@ -68,7 +80,7 @@ async def start_processing(
 
 
 @router.get("/jobs/{job_id}", response_model=JobStatus)
-async def get_job_status(job_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_job_status(job_id: UUID, db: AsyncSession = Depends(get_primary_read_db)):
     try:
         result = await db.execute(
             select(ProcessingJob).where(ProcessingJob.id == job_id)
@@ -86,16 +98,54 @@ async def get_job_status(job_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Database error occurred")
 
 
+async def _get_job_or_404(db: AsyncSession, job_id: UUID) -> ProcessingJob:
+    result = await db.execute(
+        select(ProcessingJob).where(ProcessingJob.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def _abort_arq_job(arq_pool, arq_job_id: str) -> None:
+    """
+    Ask ARQ to drop a queued/deferred run without waiting for the outcome.
+
+    A running job is left alone: aborting it would cancel its task mid-video,
+    skipping the worker's own cancel path (buffered status flush, the
+    "cancelled" event). It sees the cancel flag before its next video.
+    """
+    job = Job(arq_job_id, arq_pool)
+    try:
+        if await job.status() in (ArqJobStatus.queued, ArqJobStatus.deferred):
+            await job.abort(timeout=0, poll_delay=0)
+    except Exception:
+        # Timed out (picked up meanwhile) or re-raised the error of a finished run
+        pass
+
+
+async def _has_live_arq_job(arq_pool, job_id: UUID) -> bool:
+    """True if the job's latest ARQ run is queued, deferred or in progress."""
+    arq_job_id = await get_arq_job_id(arq_pool, str(job_id))
+    if arq_job_id is None:
+        return False
+    return await Job(arq_job_id, arq_pool).status() in (
+        ArqJobStatus.queued, ArqJobStatus.deferred, ArqJobStatus.in_progress
+    )
+
+
 @router.post("/jobs/{job_id}/pause", status_code=204)
 async def pause_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
-    try:
-        result = await db.execute(
-            select(ProcessingJob).where(ProcessingJob.id == job_id)
-        )
-        job = result.scalar_one_or_none()
+    """
+    Pause a running job.
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    The worker checks the pause flag before every video, checkpoints the
+    unprocessed remainder and stops.
+    """
+    try:
+        job = await _get_job_or_404(db, job_id)
 
         if job.status != "running":
             raise HTTPException(
@@ -103,6 +153,8 @@ async def pause_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
                 detail=f"Cannot pause job with status '{job.status}'. Only running jobs can be paused."
             )
 
+        await request_pause(await get_arq_pool(), str(job_id))
+
         job.status = "paused"
         await db.commit()
         return None
@@ -113,57 +165,281 @@ async def pause_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Database error occurred")
 
 
+@router.post("/jobs/{job_id}/resume", status_code=204)
+async def resume_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Resume a paused job.
+
+    Re-enqueues the checkpointed remainder. If the worker has not reached its
+    next pause check yet (or the run is still queued), clearing the flag is
+    enough and it simply continues. With neither, the run already ended, e.g.
+    completed after a late pause: 409 with the job's actual status.
+    """
+    try:
+        job = await _get_job_or_404(db, job_id)
+
+        if job.status != "paused":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot resume job with status '{job.status}'. Only paused jobs can be resumed."
+            )
+
+        arq_pool = await get_arq_pool()
+        await clear_control(arq_pool, str(job_id))
+        saved = await take_checkpoint(arq_pool, str(job_id))
+        if saved is not None:
+            await enqueue_video_list(
+                arq_pool,
+                str(job_id),
+                saved["list_id"],
+                saved["video_ids"],
+                checkpoint=saved["checkpoint"]
+            )
+        elif not await _has_live_arq_job(arq_pool, job_id):
+            await db.refresh(job)
+            raise HTTPException(
+                status_code=409,
+                detail=f"Nothing to resume: job status is '{job.status}'"
+            )
+
+        job.status = "running"
+        await db.commit()
+        return None
+    except HTTPException:
+        raise
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+@router.post("/jobs/{job_id}/cancel", status_code=204)
+async def cancel_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Cancel a running or paused job.
+
+    A running worker stops before its next video; a queued or deferred run
+    (e.g. waiting for the quota reset) is aborted in ARQ.
+    """
+    try:
+        job = await _get_job_or_404(db, job_id)
+
+        if job.status not in ("running", "paused"):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot cancel job with status '{job.status}'. Only running or paused jobs can be cancelled."
+            )
+
+        arq_pool = await get_arq_pool()
+        await request_cancel(arq_pool, str(job_id))
+        arq_job_id = await get_arq_job_id(arq_pool, str(job_id))
+        if arq_job_id is not None:
+            await _abort_arq_job(arq_pool, arq_job_id)
+
+        job.status = "cancelled"
+        await db.commit()
+        return None
+    except HTTPException:
+        raise
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+@router.get("/jobs/{job_id}/progress", response_model=JobProgress)
+async def get_job_progress(job_id: UUID, db: AsyncSession = Depends(get_primary_read_db)):
+    """
+    Get the latest progress of a job.
+
+    Served in O(1) from the snapshot the worker keeps in Redis. Falls back to
+    the job row and its latest progress event if there is no snapshot (e.g.
+    it expired) or Redis is unavailable.
+    """
+    try:
+        snapshot = await get_snapshot(await get_redis_client(), job_id)
+    except Exception as e:
+        logger.warning(f"Reading progress snapshot of job {job_id} failed: {e}")
+        snapshot = None
+
+    if snapshot is not None and "total_videos" in snapshot:
+        return JobProgress(job_id=job_id, source="redis", **snapshot)
+
+    try:
+        job = await _get_job_or_404(db, job_id)
+
+        latest = await db.execute(
+            select(JobProgressEvent.progress_data, JobProgressEvent.created_at)
+            .where(JobProgressEvent.job_id == job_id)
+            .order_by(JobProgressEvent.created_at.desc())
+            .limit(1)
+        )
+        latest = latest.first()
+        last_error = await db.execute(
+            select(JobProgressEvent.progress_data)
+            .where(
+                JobProgressEvent.job_id == job_id,
+                JobProgressEvent.progress_data.has_key("error")
+            )
+            .order_by(JobProgressEvent.created_at.desc())
+            .limit(1)
+        )
+        last_error = last_error.scalar_one_or_none()
+
+        data = latest.progress_data if latest else {}
+        if last_error is None and data.get("last_error"):
+            # Compacted history: the summary row carries the last error
+            last_error = {"error": data["last_error"], "video_id": data.get("last_error_video_id")}
+        return JobProgress(
+            job_id=job.id,
+            status=data.get("status", job.status),
+            progress=data.get("progress", 0),
+            current_video=data.get("current_video", 0),
+            total_videos=job.total_videos,
+            processed=job.processed_count,
+            failed=job.failed_count,
+            message=data.get("message"),
+            eta_seconds=data.get("eta_seconds"),
+            last_error=last_error["error"] if last_error else None,
+            last_error_video_id=last_error.get("video_id") if last_error else None,
+            event_id=data.get("event_id"),
+            updated_at=latest.created_at if latest else job.updated_at,
+            source="database"
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
+# job_id -> owner user_id, most recently used last. A job never changes
+# owner, so entries need no invalidation.
+_job_owners: OrderedDict[UUID, UUID] = OrderedDict()
+JOB_OWNER_CACHE_SIZE = 10000
+
+
+def _remember_job_owner(job_id: UUID, owner_id: UUID) -> None:
+    _job_owners[job_id] = owner_id
+    _job_owners.move_to_end(job_id)
+    while len(_job_owners) > JOB_OWNER_CACHE_SIZE:
+        _job_owners.popitem(last=False)
+
+
+async def _check_job_owner(db: AsyncSession, job_id: UUID, user_id: UUID) -> None:
+    """
+    Look up (and cache) the owner of a job.
+
+    Raises:
+        HTTPException: 404 if the job doesn't exist, 403 if it isn't user_id's
+    """
+    result = await db.execute(
+        select(BookmarkList.user_id)
+        .join(ProcessingJob, ProcessingJob.list_id == BookmarkList.id)
+        .where(ProcessingJob.id == job_id)
+    )
+    owner_id = result.scalar_one_or_none()
+
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    _remember_job_owner(job_id, owner_id)
+    if owner_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this job")
+
+
+def _encode_cursor(event: JobProgressEvent) -> str:
+    raw = f"{event.created_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Split an opaque history cursor into (created_at, id).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, event_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), UUID(event_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/jobs/{job_id}/progress-history", response_model=List[JobProgressEventRead])
 async def get_progress_history(
     job_id: UUID,
+    response: Response,
     user_id: UUID = Query(..., description="User ID for authentication (temporary mock auth)"),
     since: Optional[datetime] = Query(None, description="Return events after this timestamp"),
-    offset: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, gt=0, le=100, description="Maximum records to return"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    offset: int = Query(0, ge=0, description="Number of records to skip (prefer cursor)"),
+    limit: int = Query(100, gt=0, le=1000, description="Maximum records to return"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get progress history for a job with pagination and filtering.
 
     Supports:
     - Filtering by 'since' timestamp for efficient reconnection
-    - Pagination with offset/limit (max 100 per request)
-    - Authorization: user can only access their own jobs
+    - Keyset pagination: a full page sets the X-Next-Cursor header; pass it
+      as 'cursor' to continue after the last event, without duplicates.
+      Each page is an index range scan on (job_id, created_at), however
+      deep. 'since' and 'offset' are ignored with a cursor.
+    - Legacy pagination with offset/limit
+    - Up to 1000 events per request (gzip-compressed for clients that accept it)
+    - Authorization: user can only access their own jobs. Ownership is
+      joined into the events query and job owners are cached, so a request
+      is usually a single round trip.
 
     Note: Uses user_id query param for temporary mock authentication.
     This will be replaced with proper JWT authentication later.
     """
+    after = _decode_cursor(cursor) if cursor else None
     try:
-        # Verify job exists and load list relationship (with eager loading)
-        stmt = select(ProcessingJob).where(
-            ProcessingJob.id == job_id
-        ).options(selectinload(ProcessingJob.list))
-
-        result = await db.execute(stmt)
-        job = result.scalar_one_or_none()
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Authorization: Check ownership via job -> list -> user relationship
-        if job.list.user_id != user_id:
+        # Authorization: a known owner is checked without touching the DB
+        owner_id = _job_owners.get(job_id)
+        if owner_id is not None and owner_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized to access this job")
 
-        # Query progress events with filters and pagination
-        query = select(JobProgressEvent).where(
-            JobProgressEvent.job_id == job_id
+        # Query progress events with filters and pagination; ownership via
+        # job -> list -> user is part of the same query
+        query = select(JobProgressEvent).join(
+            ProcessingJob, ProcessingJob.id == JobProgressEvent.job_id
+        ).join(
+            BookmarkList, BookmarkList.id == ProcessingJob.list_id
+        ).where(
+            JobProgressEvent.job_id == job_id,
+            BookmarkList.user_id == user_id
         )
 
-        # Apply since filter if provided (inclusive to avoid missing events on reconnect)
-        if since:
-            query = query.where(JobProgressEvent.created_at >= since)
+        if after:
+            # The plain created_at bound is what the index range scan uses;
+            # the row comparison breaks ties between equal timestamps
+            query = query.where(
+                JobProgressEvent.created_at >= after[0],
+                tuple_(JobProgressEvent.created_at, JobProgressEvent.id) > after
+            )
+        else:
+            # Apply since filter if provided (inclusive to avoid missing events on reconnect)
+            if since:
+                query = query.where(JobProgressEvent.created_at >= since)
+            query = query.offset(offset)
 
-        # Order chronologically and apply pagination
-        query = query.order_by(JobProgressEvent.created_at).offset(offset).limit(limit)
+        # Order chronologically (id makes the order total for the cursor)
+        query = query.order_by(JobProgressEvent.created_at, JobProgressEvent.id).limit(limit)
 
         result = await db.execute(query)
         events = result.scalars().all()
 
+        if events:
+            _remember_job_owner(job_id, user_id)
+        elif owner_id is None:
+            # No rows: unknown job, someone else's job or no (new) events
+            await _check_job_owner(db, job_id, user_id)
+
+        if len(events) == limit:
+            response.headers["X-Next-Cursor"] = _encode_cursor(events[-1])
+
         return events
     except HTTPException:
         raise
@@ -0,0 +1,28 @@
+"""
+Upstream quota status endpoint.
+
+Exposes the budgets tracked by the workers' shared QuotaTracker so the UI can
+show how much YouTube/Gemini quota is left before jobs get paused.
+"""
+
+from fastapi import APIRouter
+
+from app.core.quota import QuotaTracker
+from app.core.redis import get_redis_client
+from app.schemas.quota import QuotaStatus, UpstreamQuota
+
+router = APIRouter(prefix="/api", tags=["quota"])
+
+
+@router.get("/quota", response_model=QuotaStatus)
+async def get_quota_status() -> QuotaStatus:
+    """
+    Get the remaining daily budget for each upstream API.
+
+    Returns:
+        QuotaStatus: Per-upstream usage, remaining units and reset time
+    """
+    redis = await get_redis_client()
+    tracker = QuotaTracker(redis)
+    snapshot = await tracker.snapshot()
+    return QuotaStatus(upstreams=[UpstreamQuota(**entry) for entry in snapshot])
@@ -27,7 +27,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.job_control import enqueue_video_list
 from app.core.redis import get_arq_pool
 from app.models.list import BookmarkList
 from app.models.video import Video
@@ -133,8 +134,7 @@ async def add_video_to_list(
 
     try:
         db.add(new_video)
-        await db.flush()
-        await db.refresh(new_video)
+        # Server defaults come back with the INSERT (eager_defaults)
         await db.commit()  # CRITICAL FIX: Commit to persist data
     except IntegrityError:
         # CRITICAL FIX: Handle race conditions and duplicate constraint violations
@@ -150,7 +150,7 @@ async def add_video_to_list(
 @router.get("/lists/{list_id}/videos", response_model=List[VideoResponse])
 async def get_videos_in_list(
     list_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[Video]:
     """
     Get all videos in a bookmark list.
@@ -287,6 +287,7 @@ async def bulk_upload_videos(
             )
 
         videos_to_create = []
+        seen_ids = set()
         failures = []
         row_num = 1  # Start at 1 (header is row 0)
 
@@ -307,7 +308,7 @@ async def bulk_upload_videos(
                 youtube_id = extract_youtube_id(url)
 
                 # Check for duplicates in this batch
-                if any(v.youtube_id == youtube_id for v in videos_to_create):
+                if youtube_id in seen_ids:
                     failures.append(BulkUploadFailure(
                         row=row_num,
                         url=url,
@@ -322,6 +323,7 @@ async def bulk_upload_videos(
                     processing_status="pending"
                 )
                 videos_to_create.append(video)
+                seen_ids.add(youtube_id)
 
             except ValueError as e:
                 failures.append(BulkUploadFailure(
@@ -363,7 +365,6 @@ async def bulk_upload_videos(
                     )
                     db.add(job)
                     await db.commit()
-                    await db.refresh(job)
 
                     # Get all pending video IDs for this list
                     result = await db.execute(
@@ -376,12 +377,7 @@ async def bulk_upload_videos(
 
                     # Enqueue ARQ task
                     arq_pool = await get_arq_pool()
-                    await arq_pool.enqueue_job(
-                        "process_video_list",
-                        str(job.id),
-                        str(list_id),
-                        video_ids
-                    )
+                    await enqueue_video_list(arq_pool, str(job.id), str(list_id), video_ids)
 
                 return BulkUploadResponse(
                     created_count=created,
@@ -398,7 +394,6 @@ async def bulk_upload_videos(
             )
             db.add(job)
             await db.commit()
-            await db.refresh(job)
 
             # Get all pending video IDs for this list
             result = await db.execute(
@@ -411,12 +406,7 @@ async def bulk_upload_videos(
 
             # Enqueue ARQ task
             arq_pool = await get_arq_pool()
-            await arq_pool.enqueue_job(
-                "process_video_list",
-                str(job.id),
-                str(list_id),
-                video_ids
-            )
+            await enqueue_video_list(arq_pool, str(job.id), str(list_id), video_ids)
 
         return BulkUploadResponse(
             created_count=len(videos_to_create),
@@ -439,7 +429,7 @@ async def bulk_upload_videos(
 @router.get("/lists/{list_id}/export/csv")
 async def export_videos_csv(
     list_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> StreamingResponse:
     """
     Export all videos in a list to CSV format.
@@ -1,43 +1,116 @@
 """
 WebSocket endpoint for real-time progress updates.
 
-Provides WebSocket connections that subscribe to user-specific Redis channels
-for progress updates from video processing jobs.
+Provides WebSocket connections that receive user-specific progress updates
+from video processing jobs through the process-wide ProgressHub (one Redis
+subscription per process, not per socket). Reconnecting clients can
+pass the last event_id they received to replay missed events from the
+user's progress stream.
 """
 
-import json
+import asyncio
 import logging
+from typing import Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from opentelemetry.trace import SpanKind
 
 from app.api.deps import get_current_ws_user
+from app.core.progress_hub import ConnectionQueue, get_progress_hub
+from app.core.progress_stream import parse_event_id, read_progress_since
 from app.core.redis import get_redis_client
+from app.core.tracing import extract_context, tracer
 
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def _forward(websocket: WebSocket, queue: ConnectionQueue, replayed_up_to, user_id) -> None:
+    """Send messages dispatched by the hub to the client, as received from Redis."""
+    while True:
+        message = await queue.get()
+        if replayed_up_to and not _is_newer(message.event_id, replayed_up_to):
+            continue
+        try:
+            # Last hop of the trace the event was published in
+            with tracer.start_as_current_span(
+                "websocket send progress",
+                context=extract_context(message.trace_context),
+                kind=SpanKind.CONSUMER,
+            ):
+                await websocket.send_text(message.text)
+        except WebSocketDisconnect:
+            # Non-recoverable: client disconnected, stop processing
+            logger.info(f"WebSocket disconnected while sending message for user {user_id}")
+            return
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume (and ignore) client messages until the client disconnects."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def _replay(websocket: WebSocket, redis, user_id, last_event_id: str) -> Optional[tuple[int, int]]:
+    """Send events newer than last_event_id; returns the id replayed up to."""
+    try:
+        events, complete = await read_progress_since(redis, user_id, last_event_id)
+        replayed_up_to = parse_event_id(last_event_id)
+    except ValueError:
+        await websocket.send_json({"type": "replay_incomplete"})
+        return None
+
+    if not complete:
+        await websocket.send_json({"type": "replay_incomplete"})
+    for event in events:
+        await websocket.send_json(event)
+    if events:
+        replayed_up_to = parse_event_id(events[-1]["event_id"])
+    logger.info(f"Replayed {len(events)} progress events for user {user_id}")
+    return replayed_up_to
+
+
+def _is_newer(event_id: Optional[str], replayed_up_to: tuple[int, int]) -> bool:
+    if event_id is None:
+        return True
+    try:
+        return parse_event_id(event_id) > replayed_up_to
+    except ValueError:
+        return True
+
+
 @router.websocket("/ws/progress")
 async def websocket_progress_endpoint(
     websocket: WebSocket,
     token: str,
+    last_event_id: Optional[str] = None,
 ):
     """
     WebSocket endpoint for real-time progress updates.
 
-    Authenticates via token query parameter, subscribes to user-specific
-    Redis channel, and forwards progress messages to the client.
+    Authenticates via token query parameter, registers with the progress hub
+    for the user's messages, and forwards them to the client.
 
     Args:
         websocket: WebSocket connection
         token: JWT authentication token (query parameter)
+        last_event_id: event_id of the last message the client received
+            (query parameter, optional)
 
     Flow:
         1. Authenticate user via JWT token
         2. Accept WebSocket connection
-        3. Subscribe to Redis channel: progress:user:{user_id}
-        4. Forward all messages from Redis to WebSocket client
-        5. Handle disconnection and cleanup
+        3. Register with the hub for messages of progress:user:{user_id}
+        4. If last_event_id is given, replay newer events from the stream.
+           Sends {"type": "replay_incomplete"} first if the stream no longer
+           reaches back that far (client falls back to progress-history).
+        5. Forward all messages from the hub to WebSocket client, skipping
+           those already replayed. Stale progress updates are coalesced
+           while the client is behind; a client that stays behind is
+           closed with code 1013.
+        6. Handle disconnection and cleanup
     """
     # Authenticate first (before accepting connection)
     user = await get_current_ws_user(websocket, token)
@@ -46,44 +119,37 @@ async def websocket_progress_endpoint(
     await websocket.accept()
     logger.info(f"WebSocket connected for user {user.id}")
 
-    # Setup Redis Pub/Sub
-    redis = await get_redis_client()
-    pubsub = redis.pubsub()
-    channel = f"progress:user:{user.id}"
+    # Register with the process-wide hub before replaying so nothing
+    # falls between the two
+    hub = await get_progress_hub()
+    queue = hub.connect(user.id)
 
     try:
-        await pubsub.subscribe(channel)
-        logger.info(f"Subscribed to Redis channel: {channel}")
-
-        # Listen for messages from Redis
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                try:
-                    # Parse and forward message to WebSocket client
-                    progress_data = json.loads(message["data"])
-                    await websocket.send_json(progress_data)
-                except json.JSONDecodeError as e:
-                    # Recoverable: skip malformed message and continue
-                    logger.error(f"Failed to parse progress message: {e}")
-                    continue
-                except WebSocketDisconnect:
-                    # Non-recoverable: client disconnected, stop processing
-                    logger.info(f"WebSocket disconnected while sending message for user {user.id}")
-                    break
-                except Exception as e:
-                    # Other errors: log and continue (network issues, etc.)
-                    logger.error(f"Error forwarding message: {e}")
-                    continue
+        replayed_up_to = None
+        if last_event_id:
+            replayed_up_to = await _replay(websocket, await get_redis_client(), user.id, last_event_id)
+
+        # Forward until either side stops: the client disconnects (detected by
+        # the receiver even while no messages arrive), sending fails, or the
+        # hub flags the client as too slow to keep up
+        sender = asyncio.create_task(_forward(websocket, queue, replayed_up_to, user.id))
+        receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+        slow = asyncio.create_task(queue.slow.wait())
+        done, pending = await asyncio.wait({sender, receiver, slow}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if slow in done:
+            # 1013 "Try Again Later": the client reconnects and replays what it missed
+            await websocket.close(code=1013, reason="Slow consumer")
+        for task in done:
+            task.result()
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for user {user.id}")
     except Exception as e:
         logger.error(f"WebSocket error for user {user.id}: {e}")
     finally:
-        # Cleanup: unsubscribe and close pubsub
-        try:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-            logger.info(f"Cleaned up WebSocket for user {user.id}")
-        except Exception as e:
-            logger.error(f"Error during WebSocket cleanup: {e}")
+        hub.disconnect(user.id, queue)
+        logger.info(f"Cleaned up WebSocket for user {user.id}")
@@ -3,19 +3,201 @@ Database connection and session management.
 
 This module provides the async database engine, session factory, and
 the FastAPI dependency for getting database sessions in route handlers.
+
+Pool and connection settings come from one of two profiles, selected with
+DB_PROFILE: "api" (default: many short requests, short statement timeout)
+or "worker" (ARQ worker: max_jobs concurrent jobs, long-running
+statements allowed). See the db_* fields of Settings.
+
+Read replica (optional, settings.database_replica_url): read-only GET
+handlers depend on get_read_db instead of get_db. Reads go to the replica
+unless the client wrote shortly before: ReadYourWritesMiddleware marks
+clients with a cookie after every successful write request, and
+get_read_db sends marked clients to the primary until the cookie expires
+(settings.db_read_your_writes_window), so replica lag never hides their
+own writes.
+
+Instrumentation: every engine made by create_engine records its statements
+(prometheus metrics, a warning with the normalized SQL for statements over
+settings.db_slow_query_threshold) and adds them up in the query_stats of
+the current HTTP request (QueryTimingMiddleware, also sent back as a
+Server-Timing header) or worker job (track_queries()).
+
+Read-only handlers never open a write transaction: get_read_db and
+get_primary_read_db (reads that must not lag, such as job progress) yield
+autocommit sessions. Writes go through get_db; mapped models fetch server
+defaults with INSERT ... RETURNING (eager_defaults), so handlers commit
+without a flush/refresh round trip.
 """
 
-from typing import AsyncGenerator
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Iterator, Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from opentelemetry.trace import SpanKind
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from .config import settings
+from .tracing import record_error, tracer
+from .metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_SLOW_STATEMENTS,
+    DB_STATEMENT_DURATION,
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def engine_options(profile: str) -> dict[str, Any]:
+    """Keyword arguments for create_async_engine for a profile ("api" or "worker")."""
+    return {
+        "echo": settings.env == "development",
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": getattr(settings, f"db_{profile}_pool_size"),
+        "max_overflow": getattr(settings, f"db_{profile}_max_overflow"),
+        "pool_timeout": getattr(settings, f"db_{profile}_pool_timeout"),
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            # asyncpg's own cache and SQLAlchemy's (set both to 0 behind
+            # PgBouncer in transaction mode)
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": {
+                "application_name": f"youtube-bookmarks-{profile}",
+                "statement_timeout": str(getattr(settings, f"db_{profile}_statement_timeout")),
+                "idle_in_transaction_session_timeout": str(settings.db_idle_in_transaction_session_timeout),
+            },
+        },
+    }
+
+
+class QueryStats:
+    """SQL statements executed within one HTTP request or worker job."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0  # seconds
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+# Stats of the current request/job; None outside of track_queries()
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# Expanded IN lists and multi-row VALUES
+_PARAM_LISTS = re.compile(r"(\$\?(?:::[\w\[\]]+)?)(?:, \$\?(?:::[\w\[\]]+)?)+")
+_ROW_LISTS = re.compile(r"(\([^()]*\))(?:, \([^()]*\))+")
+MAX_LOGGED_SQL = 1000
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement with literals and parameter lists collapsed, for logging and grouping."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _LITERALS.sub("?", sql)
+    sql = _PARAM_LISTS.sub(r"\1, ...", sql)
+    sql = _ROW_LISTS.sub(r"\1, ...", sql)
+    return sql[:MAX_LOGGED_SQL]
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_span = tracer.start_span(
+        f"db {_operation(statement)}",
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "postgresql", "db.statement": normalize_sql(statement)},
+    )
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._query_started
+    context._query_span.end()
+    operation = _operation(statement)
+    DB_STATEMENT_DURATION.labels(operation).observe(elapsed)
+
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    threshold = settings.db_slow_query_threshold
+    if threshold and elapsed * 1000 >= threshold:
+        DB_SLOW_STATEMENTS.labels(operation).inc()
+        logger.warning(f"Slow query ({elapsed * 1000:.0f} ms): {normalize_sql(statement)}")
+
+
+def _handle_error(exception_context) -> None:
+    span = getattr(exception_context.execution_context, "_query_span", None)
+    if span is not None:
+        record_error(span, exception_context.original_exception)
+        span.end()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record statement count and time (query_stats, metrics, slow-query log, spans) of an engine."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements of the enclosed code (and tasks it starts) in a fresh QueryStats."""
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+def record_query_stats(endpoint: str, stats: QueryStats) -> None:
+    DB_STATEMENTS_PER_REQUEST.labels(endpoint).observe(stats.count)
+    DB_TIME_PER_REQUEST.labels(endpoint).observe(stats.duration)
+
+
+def create_engine(profile: str, url: str | None = None) -> AsyncEngine:
+    engine = create_async_engine(url or settings.database_url, **engine_options(profile))
+    instrument_engine(engine)
+    return engine
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.env == "development",
-    future=True
-)
+engine = create_engine(settings.db_profile)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -24,6 +206,31 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Replica engine and session factory (the primary if no replica is configured)
+read_engine = create_engine(settings.db_profile, settings.database_replica_url) if settings.database_replica_url else engine
+
+
+
+def read_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """
+    Session factory for read-only sessions on an engine.
+
+    The sessions run in autocommit mode: no BEGIN/COMMIT round trips
+    around their SELECTs. They share the engine's pool.
+    """
+    return async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+
+ReadSessionLocal = read_sessionmaker(read_engine)
+PrimaryReadSessionLocal = read_sessionmaker(engine)
+
+PRIMARY_STICKY_COOKIE = "db_primary"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -39,3 +246,81 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only handlers.
+
+    Yields a session on the read replica, or on the primary if there is no
+    replica or the client wrote within the read-your-writes window. Nothing
+    is committed.
+    """
+    session_factory = PrimaryReadSessionLocal if PRIMARY_STICKY_COOKIE in request.cookies else ReadSessionLocal
+    async with session_factory() as session:
+        yield session
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only handlers that must see the latest data
+    (job status and progress written by the worker moments ago).
+
+    Yields an autocommit session on the primary. Nothing is committed.
+    """
+    async with PrimaryReadSessionLocal() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Mark clients whose write request succeeded as sticky to the primary."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cookie = (
+            f"{PRIMARY_STICKY_COOKIE}=1; Max-Age={settings.db_read_your_writes_window}; "
+            f"Path=/; HttpOnly; SameSite=Lax"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or read_engine is engine:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+class QueryTimingMiddleware:
+    """
+    Track the SQL statements of each HTTP request.
+
+    Adds a Server-Timing header (statement count and DB time) and records
+    the per-endpoint metrics. Statements run while a streaming response is
+    sent count towards the metrics but not the header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("server-timing", stats.server_timing())
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                endpoint = f"{scope['method']} {route.path}" if route else "unmatched"
+                record_query_stats(endpoint, stats)
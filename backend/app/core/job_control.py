@@ -0,0 +1,124 @@
+"""
+Cooperative control of processing jobs through Redis.
+
+The API never touches a running worker directly. Instead it sets a small
+control flag per job that `process_video_list` reads (one GET) between
+videos. On "pause" the worker checkpoints the unprocessed remainder and
+stops; on "cancel" it stops without a checkpoint.
+
+Keys (all expire after CONTROL_TTL):
+    job:{job_id}:control     "pause" | "cancel"
+    job:{job_id}:checkpoint  JSON {"list_id", "video_ids", "checkpoint"}
+    job:{job_id}:arq_job     ARQ job id of the latest enqueued run
+
+Pause/resume handshake (no lost or duplicated remainders):
+    worker: SET checkpoint, then re-read the flag. If it was cleared in the
+            meantime, GETDEL the checkpoint and keep going if it got it.
+    resume: DEL flag, then GETDEL the checkpoint and enqueue it if present.
+Exactly one side wins the GETDEL.
+"""
+
+import json
+from typing import Optional
+
+import redis.asyncio as redis
+from arq.connections import ArqRedis
+from opentelemetry.trace import SpanKind
+
+from app.core.tracing import inject_context, tracer
+
+CONTROL_TTL = 7 * 24 * 3600  # seconds
+
+PAUSE = "pause"
+CANCEL = "cancel"
+
+
+def _control_key(job_id: str) -> str:
+    return f"job:{job_id}:control"
+
+
+def _checkpoint_key(job_id: str) -> str:
+    return f"job:{job_id}:checkpoint"
+
+
+def _arq_job_key(job_id: str) -> str:
+    return f"job:{job_id}:arq_job"
+
+
+def _decode(value) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode()
+    return value if isinstance(value, str) else None
+
+
+async def request_pause(redis_client: redis.Redis, job_id: str) -> None:
+    await redis_client.set(_control_key(job_id), PAUSE, ex=CONTROL_TTL)
+
+
+async def request_cancel(redis_client: redis.Redis, job_id: str) -> None:
+    await redis_client.set(_control_key(job_id), CANCEL, ex=CONTROL_TTL)
+    await redis_client.delete(_checkpoint_key(job_id))
+
+
+async def clear_control(redis_client: redis.Redis, job_id: str) -> None:
+    await redis_client.delete(_control_key(job_id))
+
+
+async def get_control_signal(redis_client: redis.Redis, job_id: str) -> Optional[str]:
+    """Return "pause", "cancel" or None. Cheap enough to call per video."""
+    signal = _decode(await redis_client.get(_control_key(job_id)))
+    return signal if signal in (PAUSE, CANCEL) else None
+
+
+async def save_checkpoint(
+    redis_client: redis.Redis,
+    job_id: str,
+    list_id: str,
+    video_ids: list[str],
+    checkpoint: dict
+) -> None:
+    """Store the unprocessed remainder of a job and its progress counters."""
+    payload = json.dumps({"list_id": list_id, "video_ids": video_ids, "checkpoint": checkpoint})
+    await redis_client.set(_checkpoint_key(job_id), payload, ex=CONTROL_TTL)
+
+
+async def take_checkpoint(redis_client: redis.Redis, job_id: str) -> Optional[dict]:
+    """Atomically read and delete a job's checkpoint (None if absent)."""
+    payload = _decode(await redis_client.getdel(_checkpoint_key(job_id)))
+    return json.loads(payload) if payload else None
+
+
+async def enqueue_video_list(
+    arq_pool: ArqRedis,
+    job_id: str,
+    list_id: str,
+    video_ids: list[str],
+    checkpoint: Optional[dict] = None,
+    defer_by: Optional[int] = None
+) -> None:
+    """
+    Enqueue process_video_list and remember its ARQ job id for cancellation.
+
+    The job continues the current trace (trace_context argument).
+    """
+    kwargs = {}
+    if checkpoint is not None:
+        kwargs["checkpoint"] = checkpoint
+    if defer_by is not None:
+        kwargs["_defer_by"] = defer_by
+
+    with tracer.start_as_current_span(
+        "arq enqueue process_video_list",
+        kind=SpanKind.PRODUCER,
+        attributes={"job.id": job_id, "job.videos": len(video_ids)},
+    ):
+        trace_context = inject_context()
+        if trace_context:
+            kwargs["trace_context"] = trace_context
+        arq_job = await arq_pool.enqueue_job("process_video_list", job_id, list_id, video_ids, **kwargs)
+        if arq_job is not None:
+            await arq_pool.set(_arq_job_key(job_id), arq_job.job_id, ex=CONTROL_TTL)
+
+
+async def get_arq_job_id(redis_client: redis.Redis, job_id: str) -> Optional[str]:
+    return _decode(await redis_client.get(_arq_job_key(job_id)))
@@ -0,0 +1,114 @@
+"""
+Event-loop lag monitor.
+
+CPU work on the event loop (CSV parsing, building exports, serializing
+large responses) stalls every request and WebSocket of the process.
+`LoopLagMonitor` finds such blockers:
+
+- a task sleeps `interval` seconds and measures how much later than
+  scheduled it wakes up (the loop lag, EVENT_LOOP_LAG)
+- a watchdog thread notices when that task stops checking in for more
+  than `threshold` seconds. While the loop is still blocked, it logs a
+  stack sample of the loop thread and the task that was running, once
+  per stall (EVENT_LOOP_STALLS).
+
+The API starts it in its lifespan; settings.loop_monitor_interval = 0
+disables it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Measures the lag of the running event loop.
+
+    Usage:
+        monitor = LoopLagMonitor()
+        monitor.start()
+        ...
+        await monitor.close()
+    """
+
+    def __init__(self, *, interval: Optional[float] = None, threshold: Optional[float] = None):
+        self.interval = settings.loop_monitor_interval if interval is None else interval
+        self.threshold = settings.loop_lag_threshold if threshold is None else threshold
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start measuring the current loop (from within it)."""
+        if self.running or not self.interval:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def close(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - scheduled, 0.0))
+            self._last_beat = time.monotonic()
+
+    def _watch(self) -> None:
+        """Watchdog thread: sample the loop thread's stack once per stall."""
+        sampled_beat = None
+        while not self._stopped.wait(self.interval / 2):
+            beat = self._last_beat
+            # The monitor task is due every `interval`
+            stalled_for = time.monotonic() - beat - self.interval
+            if stalled_for > self.threshold and beat != sampled_beat:
+                sampled_beat = beat
+                EVENT_LOOP_STALLS.inc()
+                self._log_stack(stalled_for)
+
+    def _log_stack(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        # Read-only lookup from another thread: fine for a diagnostic
+        task = asyncio.current_task(self._loop)
+        coro = task.get_coro() if task is not None else None
+        running = f"task {task.get_name()} ({getattr(coro, '__qualname__', coro)})" if task else "no task"
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            f"Event loop blocked for {stalled_for * 1000:.0f} ms, running {running}:\n{stack}"
+        )
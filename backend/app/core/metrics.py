@@ -0,0 +1,127 @@
+"""
+Prometheus metrics shared by the API and worker processes.
+
+Metrics are defined once here and recorded by the hot paths that own them.
+Each process exposes its own default registry: the API at GET /metrics,
+each worker on settings.worker_metrics_port.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Event loop (API)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How much later than scheduled the loop lag monitor woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Event loop stalls longer than loop_lag_threshold (a stack sample is logged)",
+)
+
+# HTTP (API)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+# Database pool (API and worker)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection (including connecting)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# Redis (worker)
+REDIS_PUBLISH_DURATION = Histogram(
+    "redis_publish_duration_seconds",
+    "Latency of the pipelined PUBLISH/snapshot write of a progress batch",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+# Video processing (worker)
+VIDEO_PROCESSING_DURATION = Histogram(
+    "video_processing_duration_seconds",
+    "Processing time per video",
+    ["status"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+VIDEO_RETRIES = Counter(
+    "video_retries_total",
+    "Video processing retries by transient error class",
+    ["error_class"],
+)
+ARQ_QUEUE_DEPTH = Gauge(
+    "arq_queue_depth",
+    "Jobs waiting in the ARQ queue (sampled by the workers)",
+)
+
+# Outbound calls (worker)
+UPSTREAM_CONCURRENCY_LIMIT = Gauge(
+    "upstream_concurrency_limit",
+    "Adaptive (AIMD) in-flight limit for outbound calls",
+    ["upstream"],
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "upstream_in_flight_requests",
+    "Outbound calls currently in flight",
+    ["upstream"],
+)
+UPSTREAM_OVERLOADS = Counter(
+    "upstream_overloads_total",
+    "Outbound calls that signalled overload (429/503 or timeout)",
+    ["upstream"],
+)
+
+# Progress events (worker)
+PROGRESS_SINK_BACKLOG = Gauge(
+    "progress_sink_backlog",
+    "Progress events buffered for the next flush",
+)
+PROGRESS_EVENTS_DROPPED = Counter(
+    "progress_events_dropped_total",
+    "Progress events lost (backlog full, Redis stream, Redis publish or DB error)",
+    ["reason"],
+)
+
+# WebSockets (API)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Open progress WebSocket connections",
+)
+WEBSOCKET_MESSAGES_DROPPED = Counter(
+    "websocket_messages_dropped_total",
+    "Progress messages dropped because a client's queue was full",
+)
+WEBSOCKET_MESSAGES_COALESCED = Counter(
+    "websocket_messages_coalesced_total",
+    "Queued progress messages replaced by a newer one of the same job",
+)
+WEBSOCKET_SLOW_CONSUMERS = Counter(
+    "websocket_slow_consumer_disconnects_total",
+    "WebSocket clients disconnected because their queue stayed full",
+)
+
+# SQL statements (API and worker)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Execution time of SQL statements",
+    ["operation"],
+)
+DB_SLOW_STATEMENTS = Counter(
+    "db_slow_statements_total",
+    "SQL statements slower than db_slow_query_threshold",
+    ["operation"],
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements per HTTP request or worker job",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Cumulative SQL execution time per HTTP request or worker job",
+    ["endpoint"],
+)
@@ -0,0 +1,322 @@
+"""
+In-process fan-out of progress events to WebSocket connections.
+
+Each API process keeps ONE Redis pattern subscription (`progress:user:*`)
+instead of one Pub/Sub connection per open socket. Every message is
+decoded once and put on the bounded queue of each connection of that
+user; messages for users without a connection in this process are
+skipped without decoding. The hub only reads the fields it routes on
+(job_id, event_id, status, error); sockets are sent the original text
+frame, so nothing is re-encoded per client.
+
+Backpressure (per connection, see ConnectionQueue):
+- a queued progress event is replaced by a newer one of the same job
+- error and final events (completed, failed, paused, ...) are never dropped
+- a connection whose queue stays full for `websocket_slow_consumer_timeout`
+  seconds is flagged as a slow consumer and disconnected; the client
+  catches up through stream replay when it reconnects
+
+Usage:
+    hub = await get_progress_hub()      # started in the app lifespan
+    queue = hub.connect(user_id)
+    try:
+        message = await queue.get()
+        await websocket.send_text(message.text)
+    finally:
+        hub.disconnect(user_id, queue)
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.metrics import (
+    WEBSOCKET_CONNECTIONS,
+    WEBSOCKET_MESSAGES_COALESCED,
+    WEBSOCKET_MESSAGES_DROPPED,
+    WEBSOCKET_SLOW_CONSUMERS,
+)
+from app.core.progress_stream import progress_channel
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PATTERN = progress_channel("*")
+_CHANNEL_PREFIX = progress_channel("")
+
+RECONNECT_DELAY = 1.0  # seconds
+
+# Events a client must see even if it is behind
+FINAL_STATUSES = {"completed", "completed_with_errors", "failed", "cancelled", "paused"}
+
+
+def is_coalescible(progress_data: dict) -> bool:
+    """True for plain progress updates that a newer one of the same job supersedes."""
+    return (
+        progress_data.get("job_id") is not None
+        and not progress_data.get("error")
+        and progress_data.get("status") not in FINAL_STATUSES
+    )
+
+
+class ProgressMessage:
+    """A progress event as published (raw JSON text) plus the fields the hub needs."""
+
+    __slots__ = ("text", "job_id", "event_id", "coalescible", "trace_context")
+
+    def __init__(
+        self,
+        text: str,
+        job_id: Optional[str],
+        event_id: Optional[str],
+        coalescible: bool,
+        trace_context: Optional[dict] = None
+    ):
+        self.text = text
+        self.job_id = job_id
+        self.event_id = event_id
+        self.coalescible = coalescible
+        self.trace_context = trace_context
+
+    @classmethod
+    def from_data(
+        cls,
+        progress_data: dict,
+        text: Optional[str] = None,
+        trace_context: Optional[dict] = None
+    ) -> "ProgressMessage":
+        job_id = progress_data.get("job_id")
+        return cls(
+            text if text is not None else json.dumps(progress_data),
+            str(job_id) if job_id is not None else None,
+            progress_data.get("event_id"),
+            is_coalescible(progress_data),
+            trace_context,
+        )
+
+    @classmethod
+    def parse(cls, text) -> "ProgressMessage":
+        """
+        Decode a published message once, keeping its original text.
+
+        A "trace_context" field (added by the worker's ProgressSink) is
+        moved out of the text, so clients never see internal trace ids.
+
+        Raises:
+            ValueError: If the message is not a JSON object
+        """
+        if isinstance(text, bytes):
+            text = text.decode()
+        progress_data = json.loads(text)
+        if not isinstance(progress_data, dict):
+            raise ValueError("Progress message is not a JSON object")
+        trace_context = progress_data.pop("trace_context", None)
+        if trace_context is not None:
+            text = json.dumps(progress_data)
+        return cls.from_data(progress_data, text, trace_context)
+
+
+class ConnectionQueue:
+    """
+    Bounded send queue of one WebSocket connection.
+
+    Holds at most one pending plain progress update per job. When full, the
+    oldest pending plain update is dropped; error and final events are
+    always kept, up to twice `maxsize`, beyond which the consumer is
+    flagged as slow at once.
+    """
+
+    def __init__(self, maxsize: int, slow_consumer_timeout: float):
+        self.maxsize = maxsize
+        self.slow_consumer_timeout = slow_consumer_timeout
+        self.slow = asyncio.Event()
+        self._items: OrderedDict[int, ProgressMessage] = OrderedDict()
+        self._latest: dict[str, int] = {}  # job_id -> seq of its pending plain update
+        self._seq = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._full_since: Optional[float] = None
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put(self, message: ProgressMessage) -> None:
+        """Enqueue without blocking, applying the coalescing policy."""
+        if message.coalescible:
+            job_id = message.job_id
+            previous = self._latest.pop(job_id, None)
+            if previous is not None:
+                del self._items[previous]
+                WEBSOCKET_MESSAGES_COALESCED.inc()
+            elif len(self._items) >= self.maxsize and self._latest:
+                oldest_job, oldest = min(self._latest.items(), key=lambda item: item[1])
+                del self._items[oldest]
+                del self._latest[oldest_job]
+                WEBSOCKET_MESSAGES_DROPPED.inc()
+            seq = next(self._seq)
+            self._latest[job_id] = seq
+        else:
+            seq = next(self._seq)
+        self._items[seq] = message
+        self._not_empty.set()
+        self._check_slow()
+
+    def get_nowait(self) -> ProgressMessage:
+        seq, message = self._items.popitem(last=False)
+        if message.coalescible and self._latest.get(message.job_id) == seq:
+            del self._latest[message.job_id]
+        if len(self._items) < self.maxsize:
+            self._full_since = None
+        if not self._items:
+            self._not_empty.clear()
+        return message
+
+    async def get(self) -> ProgressMessage:
+        while not self._items:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def _check_slow(self) -> None:
+        if len(self._items) < self.maxsize:
+            self._full_since = None
+            return
+        now = time.monotonic()
+        if self._full_since is None:
+            self._full_since = now
+        if len(self._items) >= 2 * self.maxsize or now - self._full_since >= self.slow_consumer_timeout:
+            self.slow.set()
+
+
+class ProgressHub:
+    """One pattern subscription per process, dispatched to per-connection queues."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        queue_size: Optional[int] = None,
+        slow_consumer_timeout: Optional[float] = None
+    ):
+        self._redis = redis_client
+        self.queue_size = queue_size or settings.websocket_queue_size
+        self.slow_consumer_timeout = slow_consumer_timeout or settings.websocket_slow_consumer_timeout
+        self._connections: dict[str, set[ConnectionQueue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._first_attempt = asyncio.Event()
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._connections.values())
+
+    def connect(self, user_id) -> ConnectionQueue:
+        """Register a connection of `user_id` and return its message queue."""
+        queue = ConnectionQueue(self.queue_size, self.slow_consumer_timeout)
+        self._connections.setdefault(str(user_id), set()).add(queue)
+        WEBSOCKET_CONNECTIONS.inc()
+        return queue
+
+    def disconnect(self, user_id, queue: ConnectionQueue) -> None:
+        queues = self._connections.get(str(user_id))
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._connections[str(user_id)]
+        WEBSOCKET_CONNECTIONS.dec()
+
+    async def start(self) -> None:
+        """Start dispatching; returns after the first subscription attempt."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        await self._first_attempt.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def dispatch(self, channel: str, data) -> None:
+        """Deliver one Pub/Sub message to the connections of its user."""
+        queues = self._connections.get(channel[len(_CHANNEL_PREFIX):])
+        if not queues:
+            return
+        try:
+            message = ProgressMessage.parse(data)
+        except ValueError as e:
+            logger.error(f"Failed to parse progress message: {e}")
+            return
+        for queue in list(queues):
+            if queue.slow.is_set():
+                continue
+            queue.put(message)
+            if queue.slow.is_set():
+                # The endpoint closes the socket; stop feeding it meanwhile
+                WEBSOCKET_SLOW_CONSUMERS.inc()
+                logger.warning(f"Slow WebSocket consumer for user {channel[len(_CHANNEL_PREFIX):]}, disconnecting")
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                self._first_attempt.set()
+                logger.info(f"Progress hub subscribed to {CHANNEL_PATTERN}")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        channel = message["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode()
+                        self.dispatch(channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Events published meanwhile are lost to live sockets; clients
+                # recover them through stream replay when they reconnect
+                logger.error(f"Progress hub subscription failed, resubscribing: {e}")
+                self._first_attempt.set()
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# Global hub instance (singleton, one per API process)
+_hub: ProgressHub | None = None
+_hub_lock = asyncio.Lock()
+
+
+async def get_progress_hub() -> ProgressHub:
+    """Get or create and start the process-wide hub."""
+    global _hub
+
+    if _hub is not None:
+        return _hub
+
+    async with _hub_lock:
+        if _hub is None:
+            hub = ProgressHub(await get_redis_client())
+            await hub.start()
+            _hub = hub
+        return _hub
+
+
+async def close_progress_hub() -> None:
+    """Stop the hub. Should be called during application shutdown."""
+    global _hub
+    if _hub:
+        await _hub.stop()
+        _hub = None
@@ -0,0 +1,61 @@
+"""
+Latest-state snapshot of each job's progress in Redis.
+
+Alongside every flush of progress events the worker HSETs a compact hash
+per job, so "where is this job now?" is one HGETALL instead of a scan of
+job_progress_events. Fields are only ever overwritten, which keeps the
+last error around until the next one.
+
+Key (expires after settings.progress_snapshot_ttl):
+    job:{job_id}:progress   status, progress, current_video, total_videos,
+                            processed, failed, message, eta_seconds,
+                            last_error, last_error_video_id, event_id,
+                            updated_at
+"""
+
+from datetime import datetime
+from typing import Optional
+
+import redis.asyncio as redis
+
+# progress_data keys copied as-is into the snapshot
+SNAPSHOT_FIELDS = (
+    "status",
+    "progress",
+    "current_video",
+    "total_videos",
+    "processed",
+    "failed",
+    "message",
+    "eta_seconds",
+    "event_id",
+)
+
+
+def snapshot_key(job_id) -> str:
+    return f"job:{job_id}:progress"
+
+
+def snapshot_fields(progress_data: dict, updated_at: datetime) -> dict[str, str]:
+    """Map one progress event to the hash fields it updates."""
+    fields = {
+        name: str(progress_data[name])
+        for name in SNAPSHOT_FIELDS
+        if progress_data.get(name) is not None
+    }
+    if progress_data.get("error"):
+        fields["last_error"] = str(progress_data["error"])
+        fields["last_error_video_id"] = str(progress_data.get("video_id", ""))
+    fields["updated_at"] = updated_at.isoformat()
+    return fields
+
+
+async def get_snapshot(redis_client: redis.Redis, job_id) -> Optional[dict[str, str]]:
+    """Return the job's snapshot (string values) or None if there is none."""
+    snapshot = await redis_client.hgetall(snapshot_key(job_id))
+    if not snapshot:
+        return None
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in snapshot.items()
+    }
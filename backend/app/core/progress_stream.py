@@ -0,0 +1,89 @@
+"""
+Replayable progress log in Redis Streams.
+
+Pub/Sub drops every message sent while a client is disconnected. The
+worker therefore also appends each event to a capped per-user stream
+(XADD ... MAXLEN ~) and publishes it with its stream id as "event_id".
+A reconnecting WebSocket passes the last event_id it saw and the endpoint
+replays the newer entries with XREAD from Redis instead of querying
+Postgres.
+
+Keys:
+    progress:user:{user_id}     Pub/Sub channel (live events)
+    progress:stream:{user_id}   Stream, field "data" = JSON event
+"""
+
+import json
+from typing import Optional
+
+import redis.asyncio as redis
+
+REPLAY_BATCH_SIZE = 100
+
+
+def progress_channel(user_id) -> str:
+    return f"progress:user:{user_id}"
+
+
+def progress_stream(user_id) -> str:
+    return f"progress:stream:{user_id}"
+
+
+def parse_event_id(event_id: str) -> tuple[int, int]:
+    """
+    Split a stream id ("<ms>-<seq>") into a comparable tuple.
+
+    Raises:
+        ValueError: If event_id is not a stream id
+    """
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def with_event_id(event_id: Optional[str], progress_data: dict) -> dict:
+    """Return the event as sent to clients (event_id first, if known)."""
+    if event_id is None:
+        return progress_data
+    return {"event_id": event_id, **progress_data}
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def read_progress_since(
+    redis_client: redis.Redis,
+    user_id,
+    last_event_id: str
+) -> tuple[list[dict], bool]:
+    """
+    Read all events of a user newer than `last_event_id`.
+
+    Returns (events, complete). `complete` is False when the stream no
+    longer reaches back to `last_event_id` (trimmed or expired), in which
+    case the client must fill the gap from the progress history.
+
+    Raises:
+        ValueError: If last_event_id is not a stream id
+    """
+    last = parse_event_id(last_event_id)
+    stream = progress_stream(user_id)
+
+    oldest = await redis_client.xrange(stream, count=1)
+    complete = bool(oldest) and parse_event_id(_decode(oldest[0][0])) <= last
+
+    events = []
+    cursor = f"{last[0]}-{last[1]}"
+    while True:
+        response = await redis_client.xread({stream: cursor}, count=REPLAY_BATCH_SIZE)
+        if not response:
+            break
+        entries = response[0][1]
+        for entry_id, fields in entries:
+            cursor = _decode(entry_id)
+            data = fields.get("data", fields.get(b"data"))
+            events.append(with_event_id(cursor, json.loads(data)))
+        if len(entries) < REPLAY_BATCH_SIZE:
+            break
+
+    return events, complete
@@ -0,0 +1,240 @@
+"""
+Distributed quota tracking for upstream APIs (YouTube Data API, Gemini).
+
+All worker processes share their budgets through Redis so that ten
+concurrent jobs cannot collectively exceed what the upstream allows.
+Two kinds of buckets are maintained, both updated atomically by Lua scripts:
+
+- Rate buckets (token bucket): one per upstream and cost class, refilled
+  continuously. Callers wait for a token instead of provoking a 429.
+- Daily budgets (fixed window): one per upstream, measured in the upstream's
+  own units (YouTube quota units, Gemini requests) and reset at midnight in
+  ``settings.quota_reset_timezone`` (YouTube resets at 00:00 Pacific Time).
+
+When a daily budget is exhausted ``QuotaExceededError`` is raised with the
+number of seconds until the reset, so the worker can pause instead of failing.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Cost in daily budget units per cost class (YouTube Data API v3 quota costs)
+COST_CLASSES: dict[str, dict[str, int]] = {
+    "youtube": {
+        "videos.list": 1,
+        "captions.list": 50,
+        "search.list": 100,
+        "captions.download": 200,
+    },
+    "gemini": {
+        "generate_content": 1,
+    },
+}
+
+# Token bucket: KEYS[1] = bucket hash, ARGV = capacity, refill rate (tokens/s), cost.
+# Uses the Redis server clock so that workers with skewed clocks agree.
+# Returns {allowed, tokens_left, seconds_to_wait} (floats as strings, since
+# Lua numbers are truncated to integers when converted to Redis replies).
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+# Daily budget: KEYS[1] = counter, ARGV = limit, cost, ttl seconds.
+# Only consumes units if the whole cost fits. Returns {allowed, used}.
+DAILY_BUDGET_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if used + cost > limit then
+    return {0, used}
+end
+used = redis.call('INCRBY', KEYS[1], cost)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return {1, used}
+"""
+
+
+class QuotaExceededError(Exception):
+    """Raised when an upstream's daily budget is exhausted."""
+
+    def __init__(self, upstream: str, retry_after: int):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(
+            f"Daily {upstream} quota exhausted, resets in {retry_after}s"
+        )
+
+
+def cost_of(upstream: str, cost_class: str) -> int:
+    """
+    Look up the daily budget cost of a call.
+
+    Raises:
+        ValueError: If upstream or cost class is unknown
+    """
+    try:
+        return COST_CLASSES[upstream][cost_class]
+    except KeyError:
+        raise ValueError(f"Unknown cost class {upstream}/{cost_class}") from None
+
+
+def _daily_limit(upstream: str) -> int:
+    """Daily budget for an upstream (0 means unlimited)."""
+    if upstream == "youtube":
+        return settings.youtube_daily_quota
+    return settings.gemini_daily_quota
+
+
+def _requests_per_second(upstream: str) -> float:
+    if upstream == "youtube":
+        return settings.youtube_requests_per_second
+    return settings.gemini_requests_per_minute / 60
+
+
+def next_reset(now: datetime | None = None) -> datetime:
+    """Return the next daily quota reset (midnight in the quota timezone)."""
+    tz = ZoneInfo(settings.quota_reset_timezone)
+    now = (now or datetime.now(tz)).astimezone(tz)
+    return datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+
+
+class QuotaTracker:
+    """
+    Redis-backed quota tracker shared by all worker processes.
+
+    Usage:
+        tracker = QuotaTracker(redis_client)
+        await tracker.acquire("youtube", "videos.list")  # waits or raises
+        response = await http_client.get(...)
+    """
+
+    def __init__(self, redis_client: redis.Redis, prefix: str = "quota"):
+        self._redis = redis_client
+        self._prefix = prefix
+        self._bucket_script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._daily_script = redis_client.register_script(DAILY_BUDGET_SCRIPT)
+
+    def _daily_key(self, upstream: str) -> str:
+        tz = ZoneInfo(settings.quota_reset_timezone)
+        return f"{self._prefix}:daily:{upstream}:{datetime.now(tz).date().isoformat()}"
+
+    def _bucket_key(self, upstream: str, cost_class: str) -> str:
+        return f"{self._prefix}:bucket:{upstream}:{cost_class}"
+
+    @staticmethod
+    def seconds_until_reset() -> int:
+        """Seconds until the daily budgets reset (at least 1)."""
+        tz = ZoneInfo(settings.quota_reset_timezone)
+        return max(1, int((next_reset() - datetime.now(tz)).total_seconds()) + 1)
+
+    async def has_quota(self, upstream: str, units: int) -> bool:
+        """Check (without consuming) whether the daily budget covers `units`."""
+        limit = _daily_limit(upstream)
+        if limit <= 0:
+            return True
+        used = int(await self._redis.get(self._daily_key(upstream)) or 0)
+        return used + units <= limit
+
+    async def consume(self, upstream: str, units: int) -> None:
+        """
+        Atomically consume units from the daily budget.
+
+        Raises:
+            QuotaExceededError: If the budget cannot cover `units`
+        """
+        limit = _daily_limit(upstream)
+        if limit <= 0:
+            return
+        ttl = self.seconds_until_reset() + 3600
+        allowed, _used = await self._daily_script(
+            keys=[self._daily_key(upstream)], args=[limit, units, ttl]
+        )
+        if not int(allowed):
+            raise QuotaExceededError(upstream, self.seconds_until_reset())
+
+    async def mark_exhausted(self, upstream: str) -> None:
+        """
+        Mark the daily budget as used up.
+
+        Call this when the upstream itself reports quota exhaustion (e.g. a
+        YouTube 403 quotaExceeded), which happens if the key is shared.
+        """
+        limit = _daily_limit(upstream)
+        if limit <= 0:
+            return
+        await self._redis.set(
+            self._daily_key(upstream), limit, ex=self.seconds_until_reset() + 3600
+        )
+
+    async def acquire(self, upstream: str, cost_class: str) -> None:
+        """
+        Wait for a rate token and consume the daily cost of one call.
+
+        Every outbound call must go through this before hitting the network.
+
+        Raises:
+            QuotaExceededError: If the daily budget is exhausted
+            ValueError: If the cost class is unknown
+        """
+        units = cost_of(upstream, cost_class)
+        await self.consume(upstream, units)
+
+        rate = _requests_per_second(upstream)
+        capacity = max(1.0, rate)
+        key = self._bucket_key(upstream, cost_class)
+        while True:
+            allowed, _tokens, wait = await self._bucket_script(
+                keys=[key], args=[capacity, rate, 1]
+            )
+            if int(allowed):
+                return
+            await asyncio.sleep(float(wait))
+
+    async def snapshot(self) -> list[dict]:
+        """Return the current daily budget of every upstream."""
+        resets_at = next_reset()
+        upstreams = list(COST_CLASSES)
+        values = await self._redis.mget([self._daily_key(u) for u in upstreams])
+
+        result = []
+        for upstream, raw in zip(upstreams, values):
+            limit = _daily_limit(upstream)
+            used = int(raw or 0)
+            result.append({
+                "upstream": upstream,
+                "daily_limit": limit or None,
+                "daily_used": used,
+                "daily_remaining": max(0, limit - used) if limit else None,
+                "exhausted": bool(limit) and used >= limit,
+                "resets_at": resets_at,
+                "requests_per_second": _requests_per_second(upstream),
+            })
+        return result
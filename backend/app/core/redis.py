@@ -11,6 +11,9 @@ from arq.connections import RedisSettings, ArqRedis
 from app.core.config import settings
 
 
+# Heartbeat the ARQ workers write every health_check_interval (WorkerSettings)
+ARQ_HEALTH_CHECK_KEY = "arq:youtube:health"
+
 # Global Redis client instance (singleton)
 _redis_client: redis.Redis | None = None
 _redis_lock = asyncio.Lock()
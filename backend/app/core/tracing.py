@@ -0,0 +1,157 @@
+"""
+OpenTelemetry tracing shared by the API and worker processes.
+
+One trace follows a bulk upload end to end:
+
+    HTTP request (TracingMiddleware)
+      -> arq enqueue process_video_list (enqueue_video_list)
+      -> process_video_list in the worker, one span per video
+      -> progress events (ProgressSink pipelines)
+      -> WebSocket delivery in the API (websocket._forward)
+
+The W3C trace context crosses process boundaries as a plain dict: the
+`trace_context` keyword argument of the ARQ job and a "trace_context"
+field of the live progress PUBLISH, which the API's ProgressHub strips
+before forwarding (see inject_context/extract_context); stored events
+and replays never carry it. DB
+statements (app.core.database), Redis pipelines and upstream HTTP calls
+get their own client spans.
+
+Tracing is off unless settings.tracing_exporter is "console" or "file"
+(JSON lines in settings.tracing_file, one span per line). Without a
+configured provider all spans are no-ops and no context is injected.
+"""
+
+import logging
+from typing import Optional, TextIO
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("app")
+
+_provider: Optional[TracerProvider] = None
+_trace_file: Optional[TextIO] = None
+
+
+def setup_tracing(service_name: str, exporter: Optional[SpanExporter] = None) -> None:
+    """
+    Install the process's tracer provider (once).
+
+    Args:
+        service_name: e.g. "youtube-bookmarks-api"
+        exporter: Exporter to use instead of settings.tracing_exporter
+            (spans are then exported synchronously, e.g. an in-memory
+            exporter in tests). Added to the provider if there already is one.
+    """
+    global _provider, _trace_file
+    if _provider is not None:
+        if exporter is not None:
+            _provider.add_span_processor(SimpleSpanProcessor(exporter))
+        return
+
+    if exporter is not None:
+        processor = SimpleSpanProcessor(exporter)
+    elif settings.tracing_exporter == "console":
+        processor = BatchSpanProcessor(ConsoleSpanExporter())
+    elif settings.tracing_exporter == "file":
+        _trace_file = open(settings.tracing_file, "a")
+        processor = BatchSpanProcessor(
+            ConsoleSpanExporter(out=_trace_file, formatter=lambda span: span.to_json(indent=None) + "\n")
+        )
+    else:
+        return
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    _provider.add_span_processor(processor)
+    trace.set_tracer_provider(_provider)
+    logger.info(f"Tracing enabled for {service_name}")
+
+
+def shutdown_tracing() -> None:
+    """Export buffered spans and close the span file, if any (process shutdown)."""
+    global _trace_file
+    if _provider is None:
+        return
+    if _trace_file is None:
+        _provider.force_flush()
+        return
+    # Stops the exporter thread (after a final flush) before the file goes away
+    _provider.shutdown()
+    _trace_file.close()
+    _trace_file = None
+
+
+def inject_context() -> dict[str, str]:
+    """W3C trace context of the current span, empty if there is none."""
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[dict]) -> Optional[Context]:
+    """Context to parent spans on, from a dict made by inject_context()."""
+    return propagate.extract(carrier) if carrier else None
+
+
+def record_error(span: trace.Span, error: BaseException) -> None:
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+class TracingMiddleware:
+    """
+    One server span per HTTP request, named after its route template.
+
+    Continues a trace passed in a `traceparent` header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = propagate.extract(dict(Headers(scope=scope)))
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            record_exception=False,
+        ) as span:
+            span.set_attribute("http.method", scope["method"])
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            except Exception as e:
+                record_error(span, e)
+                raise
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -0,0 +1,154 @@
+"""
+Short-lived cache of active users for WebSocket authentication.
+
+Every WebSocket connect used to load the User from Postgres. After a
+deploy all clients reconnect at once, so the cache keeps the little the
+handshake needs (id, email, is_active) at two levels:
+
+- an in-process LRU, valid for `user_cache_local_ttl` seconds
+- a Redis hash shared by all API processes, valid for `user_cache_ttl`
+
+Only active users are cached; unknown or inactive users always fall
+through to the database.
+
+Invalidation: committing a change of `User.is_active` (or deleting a
+user) through the ORM drops the user from the local LRU and from Redis,
+see `_invalidate_after_commit`. Code that deactivates users with bulk
+UPDATEs must call `invalidate_user` itself. Other API processes drop their
+local copy after at most `user_cache_local_ttl` seconds.
+
+Key (expires after settings.user_cache_ttl):
+    user:{user_id}:auth     email, is_active
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# user_id -> (expires_at, email), most recently used last
+_local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+# Redis deletes scheduled from (sync) ORM events, kept alive until done
+_pending: set[asyncio.Task] = set()
+
+_INVALIDATE_KEY = "user_cache_invalidate"
+
+
+def user_cache_key(user_id) -> str:
+    return f"user:{user_id}:auth"
+
+
+def _cached_user(user_id: str, email: str) -> User:
+    # Transient instance: enough for the handshake, never added to a session
+    return User(id=UUID(user_id), email=email, is_active=True)
+
+
+def _remember_locally(user_id: str, email: str) -> None:
+    _local[user_id] = (time.monotonic() + settings.user_cache_local_ttl, email)
+    _local.move_to_end(user_id)
+    while len(_local) > settings.user_cache_size:
+        _local.popitem(last=False)
+
+
+async def get_cached_user(user_id: str) -> Optional[User]:
+    """Return the active user from the cache, or None on a miss."""
+    user_id = str(user_id)
+    entry = _local.get(user_id)
+    if entry is not None:
+        expires_at, email = entry
+        if expires_at > time.monotonic():
+            _local.move_to_end(user_id)
+            return _cached_user(user_id, email)
+        del _local[user_id]
+
+    try:
+        redis_client = await get_redis_client()
+        cached = await redis_client.hgetall(user_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"User cache lookup failed, using database: {e}")
+        return None
+    if not cached or cached.get("is_active") != "1":
+        return None
+
+    _remember_locally(user_id, cached["email"])
+    return _cached_user(user_id, cached["email"])
+
+
+async def cache_user(user: User) -> None:
+    """Cache an active user loaded from the database (best-effort)."""
+    if not user.is_active:
+        return
+    user_id = str(user.id)
+    _remember_locally(user_id, user.email)
+    try:
+        redis_client = await get_redis_client()
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hset(user_cache_key(user_id), mapping={"email": user.email, "is_active": "1"})
+        pipe.expire(user_cache_key(user_id), settings.user_cache_ttl)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to cache user {user_id}: {e}")
+
+
+async def invalidate_user(user_id) -> None:
+    """Drop a user from both cache levels, e.g. after deactivating them."""
+    _local.pop(str(user_id), None)
+    redis_client = await get_redis_client()
+    await redis_client.delete(user_cache_key(user_id))
+
+
+def clear_local_cache() -> None:
+    _local.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deactivations(session: Session, flush_context) -> None:
+    """Remember users whose active state changed or who were deleted."""
+    user_ids = session.info.setdefault(_INVALIDATE_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, User) and inspect(obj).attrs.is_active.history.has_changes():
+            user_ids.add(str(obj.id))
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            user_ids.add(str(obj.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_INVALIDATE_KEY, None)
+    if not user_ids:
+        return
+    for user_id in user_ids:
+        _local.pop(user_id, None)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # Sync usage (scripts); Redis entries expire after user_cache_ttl
+    task = loop.create_task(_delete_from_redis(user_ids))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_INVALIDATE_KEY, None)
+
+
+async def _delete_from_redis(user_ids: set[str]) -> None:
+    try:
+        redis_client = await get_redis_client()
+        await redis_client.delete(*(user_cache_key(user_id) for user_id in user_ids))
+    except Exception as e:
+        logger.error(f"Failed to invalidate cached users {sorted(user_ids)}: {e}")
@@ -1,16 +1,23 @@
 """
 Main FastAPI application module for Smart YouTube Bookmarks.
 
-This module sets up the FastAPI application with CORS middleware
-and provides the health check endpoint.
+This module sets up the FastAPI application with CORS and GZip middleware
+and provides the health check endpoint (liveness and readiness probes are
+in app.api.health). Prometheus metrics are served at
+GET /metrics.
 """
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app.api import lists, videos, processing, websocket
+from app.api import lists, videos, processing, websocket, quota, metrics, health
+from app.core.database import QueryTimingMiddleware, ReadYourWritesMiddleware
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.progress_hub import close_progress_hub, get_progress_hub
 from app.core.redis import close_redis_client
+from app.core.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
 
 
 @asynccontextmanager
@@ -19,12 +26,21 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
 
     Handles startup and shutdown events for the application.
-    Currently manages Redis connection lifecycle.
+    Manages the WebSocket progress hub, the event-loop lag monitor and the
+    Redis connection lifecycle.
     """
-    # Startup: nothing to do yet
+    setup_tracing("youtube-bookmarks-api")
+    # Startup: one Redis subscription for all WebSocket connections
+    await get_progress_hub()
+    # Report blocking code on the event loop
+    loop_monitor = LoopLagMonitor()
+    loop_monitor.start()
     yield
-    # Shutdown: close Redis connection
+    # Shutdown: stop the monitor and the hub, then close Redis connection
+    await loop_monitor.close()
+    await close_progress_hub()
     await close_redis_client()
+    shutdown_tracing()
 
 
 app = FastAPI(title="Smart YouTube Bookmarks", lifespan=lifespan)
@@ -35,12 +51,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Send clients that just wrote to the primary instead of the read replica
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request SQL statement count and time (Server-Timing header, metrics)
+app.add_middleware(QueryTimingMiddleware)
+
+# Latency per route template (GET /metrics)
+app.add_middleware(metrics.RequestMetricsMiddleware)
+
+# Large JSON responses (progress history, exports) compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Outermost: the request span covers all other middleware
+app.add_middleware(TracingMiddleware)
+
 # Register routers
 app.include_router(lists.router)
 app.include_router(videos.router)
 app.include_router(processing.router)
+app.include_router(quota.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
 app.include_router(websocket.router, prefix="/api", tags=["websocket"])
 
 
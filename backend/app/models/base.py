@@ -11,6 +11,9 @@ class Base(DeclarativeBase):
 
 class BaseModel(Base):
     __abstract__ = True
+    # Fetch server-generated values (created_at, updated_at) with
+    # INSERT/UPDATE ... RETURNING instead of a SELECT on next access
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -1,19 +1,33 @@
+from datetime import datetime
 from typing import Any
 from uuid import UUID
-from sqlalchemy import ForeignKey, Index
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, event, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import BaseModel
 
 class JobProgressEvent(BaseModel):
-    """Stores progress updates for video processing jobs"""
+    """
+    Stores progress updates for video processing jobs
+
+    Range-partitioned by month on created_at: job_progress_events_pYYYYMM
+    partitions are created ahead and dropped after the retention period by
+    the worker's maintenance cron jobs (app.workers.maintenance). Rows
+    outside all monthly partitions land in job_progress_events_default.
+    """
     __tablename__ = "job_progress_events"
 
     job_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
         ForeignKey("processing_jobs.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
+    )
+    # Part of the primary key because the partition key must be
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False
     )
     progress_data: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
 
@@ -22,7 +36,18 @@ class JobProgressEvent(BaseModel):
 
     __table_args__ = (
         Index("idx_job_progress_job_created", "job_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    # Events are still identified by id alone
+    __mapper_args__ = {"primary_key": ["id"], "eager_defaults": True}
 
     def __repr__(self) -> str:
         return f"<JobProgressEvent(id={self.id}, job_id={self.job_id}, progress={self.progress_data.get('progress')}%)>"
+
+
+# metadata.create_all (tests, scripts) creates no monthly partitions
+event.listen(
+    JobProgressEvent.__table__,
+    "after_create",
+    DDL("CREATE TABLE job_progress_events_default PARTITION OF job_progress_events DEFAULT")
+)
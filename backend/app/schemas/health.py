@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class DependencyCheck(BaseModel):
+    """Result of checking one dependency."""
+    status: Literal["ok", "warn", "fail"]  # only "fail" makes the API unready
+    latency_ms: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class ReadinessStatus(BaseModel):
+    """Response schema for GET /api/health/ready."""
+    ready: bool
+    checked_at: datetime  # results are cached for settings.health_cache_ttl
+    checks: dict[str, DependencyCheck]
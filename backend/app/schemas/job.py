@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
@@ -17,3 +19,21 @@ class JobStatus(BaseModel):
     processed_count: int
     failed_count: int
     status: str
+
+
+class JobProgress(BaseModel):
+    """Latest known progress of a job, from the Redis snapshot or the database."""
+    job_id: UUID
+    status: str
+    progress: int = 0
+    current_video: int = 0
+    total_videos: int
+    processed: int = 0
+    failed: int = 0
+    message: Optional[str] = None
+    eta_seconds: Optional[int] = None
+    last_error: Optional[str] = None
+    last_error_video_id: Optional[str] = None
+    event_id: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    source: Literal["redis", "database"]
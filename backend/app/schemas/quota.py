@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class UpstreamQuota(BaseModel):
+    """Daily budget of a single upstream API."""
+    upstream: str
+    daily_limit: Optional[int]  # None = no daily cap configured
+    daily_used: int
+    daily_remaining: Optional[int]
+    exhausted: bool
+    resets_at: datetime
+    requests_per_second: float
+
+
+class QuotaStatus(BaseModel):
+    """Response schema for GET /api/quota."""
+    upstreams: list[UpstreamQuota]
@@ -0,0 +1,130 @@
+"""
+Adaptive concurrency control for outbound calls from the worker.
+
+Each upstream (YouTube, Gemini) gets an AIMD limiter that bounds how many
+calls a worker process keeps in flight:
+
+- Additive increase: every successful call whose latency is within the
+  target grows the limit by 1/limit, i.e. by one slot per full window.
+- Multiplicative decrease: a 429/503 response or a timeout (the network
+  timeouts from TRANSIENT_ERRORS) cuts the limit by `backoff_factor`.
+
+Only calls started after the last decrease can trigger another one, so a
+burst of concurrent 429s shrinks the window once instead of collapsing it.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from app.core.metrics import UPSTREAM_CONCURRENCY_LIMIT, UPSTREAM_IN_FLIGHT, UPSTREAM_OVERLOADS
+
+logger = logging.getLogger(__name__)
+
+# Upstream responses that mean "slow down"
+OVERLOAD_STATUS_CODES = {429, 503}
+
+
+def is_overload(error: BaseException) -> bool:
+    """Return True if an outbound call failed because the upstream is saturated."""
+    if isinstance(error, httpx.PoolTimeout):
+        # Waited for a connection of our own pool; the upstream never saw it
+        return False
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in OVERLOAD_STATUS_CODES
+    return False
+
+
+class AdaptiveLimiter:
+    """
+    AIMD in-flight limiter for one upstream.
+
+    Usage:
+        async with limiter.slot():
+            response = await client.get(...)
+            response.raise_for_status()  # lets 429s reach the limiter
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        *,
+        initial: int,
+        maximum: int,
+        target_latency: float,
+        minimum: int = 1,
+        backoff_factor: float = 0.5
+    ):
+        self.upstream = upstream
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.backoff_factor = backoff_factor
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+        UPSTREAM_CONCURRENCY_LIMIT.labels(upstream).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free under the current limit."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        UPSTREAM_IN_FLIGHT.labels(self.upstream).inc()
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            # Wake all waiters: the limit may have grown by more than one slot
+            self._condition.notify_all()
+        UPSTREAM_IN_FLIGHT.labels(self.upstream).dec()
+
+    def on_success(self, latency: float) -> None:
+        """Grow the window additively if the call was fast enough."""
+        if latency > self.target_latency or self._limit >= self.maximum:
+            return
+        self._limit = min(self.maximum, self._limit + 1 / self._limit)
+        UPSTREAM_CONCURRENCY_LIMIT.labels(self.upstream).set(self.limit)
+
+    def on_overload(self, started_at: float) -> None:
+        """Shrink the window multiplicatively, once per congestion event."""
+        UPSTREAM_OVERLOADS.labels(self.upstream).inc()
+        if started_at < self._last_decrease:
+            return
+        previous = self.limit
+        self._limit = max(self.minimum, self._limit * self.backoff_factor)
+        self._last_decrease = time.monotonic()
+        UPSTREAM_CONCURRENCY_LIMIT.labels(self.upstream).set(self.limit)
+        logger.warning(f"{self.upstream} overloaded, concurrency limit {previous} -> {self.limit}")
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one in-flight slot for the duration of an outbound call."""
+        await self.acquire()
+        started_at = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_overload(e):
+                self.on_overload(started_at)
+            raise
+        else:
+            self.on_success(time.monotonic() - started_at)
+        finally:
+            await self.release()
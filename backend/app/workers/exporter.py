@@ -0,0 +1,45 @@
+"""
+Prometheus exporter of a worker process.
+
+Serves the worker's default registry (see app.core.metrics) on
+settings.worker_metrics_port and samples the ARQ queue depth, which no
+single job observes.
+"""
+
+import asyncio
+import logging
+
+from arq.constants import default_queue_name
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.core.metrics import ARQ_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+_started = False
+
+
+def start_exporter() -> None:
+    """Serve /metrics from a daemon thread (once per process)."""
+    global _started
+    if _started or not settings.worker_metrics_port:
+        return
+    try:
+        start_http_server(settings.worker_metrics_port)
+    except OSError as e:
+        # e.g. a second worker on the same host: give each its own port
+        logger.warning(f"Metrics exporter not started on port {settings.worker_metrics_port}: {e}")
+        return
+    _started = True
+    logger.info(f"Metrics exporter listening on port {settings.worker_metrics_port}")
+
+
+async def sample_queue_depth(redis, queue_name: str = default_queue_name) -> None:
+    """Update ARQ_QUEUE_DEPTH every worker_metrics_interval seconds until cancelled."""
+    while True:
+        try:
+            ARQ_QUEUE_DEPTH.set(await redis.zcard(queue_name))
+        except Exception as e:
+            logger.warning(f"Sampling the ARQ queue depth failed: {e}")
+        await asyncio.sleep(settings.worker_metrics_interval)
@@ -0,0 +1,223 @@
+"""
+Housekeeping cron jobs for job_progress_events.
+
+The table is range-partitioned by month on created_at (one
+job_progress_events_pYYYYMM partition per month, plus a DEFAULT partition
+as a safety net). Registered as ARQ cron jobs in WorkerSettings:
+
+- maintain_progress_partitions: creates the partitions of the current and
+  the next `progress_partitions_ahead` months, and drops partitions that
+  lie entirely before the last `progress_retention_months` months.
+  Dropping a partition is instant and leaves nothing to vacuum, unlike a
+  DELETE of the same rows.
+- compact_progress_events: replaces the event history of jobs that
+  finished more than `progress_compact_after` seconds ago with a single
+  summary row (final event, event and error counts, the last errors).
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.job import ProcessingJob
+from app.models.job_progress import JobProgressEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "job_progress_events"
+DEFAULT_PARTITION = "job_progress_events_default"
+_PARTITION_NAME = re.compile(r"^job_progress_events_p(\d{4})(\d{2})$")
+
+# Job statuses after which no more progress events are written
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Errors kept verbatim in a compacted job's summary row
+MAX_SUMMARY_ERRORS = 100
+
+# pg_advisory_xact_lock key serializing partition maintenance across workers
+PARTITION_MAINTENANCE_LOCK = 7_340_040
+
+
+def _month_start(year: int, month: int) -> datetime:
+    # Normalizes month overflow/underflow (e.g. month 13 -> January next year)
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+async def ensure_partition(conn: AsyncConnection, month: datetime) -> bool:
+    """
+    Create the partition of the month starting at `month`, if missing.
+
+    Rows of that month that landed in the DEFAULT partition are moved into
+    the new partition before it is attached. Returns True if created.
+    """
+    name = partition_name(month)
+    exists = await conn.scalar(text("SELECT to_regclass(:name)"), {"name": name})
+    if exists is not None:
+        return False
+
+    start = month.isoformat()
+    end = _month_start(month.year, month.month + 1).isoformat()
+    await conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await conn.execute(text(
+        f"WITH moved AS ("
+        f"  DELETE FROM {DEFAULT_PARTITION}"
+        f"  WHERE created_at >= :start AND created_at < :end RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ), {"start": month, "end": _month_start(month.year, month.month + 1)})
+    await conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+    ))
+    logger.info(f"Created partition {name}")
+    return True
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+    ), {"parent": PARENT_TABLE})
+    return list(result.scalars())
+
+
+async def drop_expired_partitions(conn: AsyncConnection, now: datetime, retention_months: int) -> list[str]:
+    """Drop monthly partitions that end before the retention window."""
+    cutoff = _month_start(now.year, now.month - retention_months)
+    dropped = []
+    for name in await list_partitions(conn):
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            continue  # DEFAULT partition
+        partition_end = _month_start(int(match.group(1)), int(match.group(2)) + 1)
+        if partition_end <= cutoff:
+            await conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+            logger.info(f"Dropped expired partition {name}")
+    return dropped
+
+
+async def maintain_progress_partitions(
+    ctx: dict,
+    db_engine: AsyncEngine = engine,
+    now: Optional[datetime] = None
+) -> dict:
+    """
+    ARQ cron job: create upcoming partitions and drop expired ones.
+
+    Workers starting together all run it (run_at_startup); the advisory
+    lock lets one do the work while the others wait and then find the
+    partitions in place.
+    """
+    now = now or datetime.now(timezone.utc)
+    created = []
+    async with db_engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_MAINTENANCE_LOCK})
+        for ahead in range(settings.progress_partitions_ahead + 1):
+            month = _month_start(now.year, now.month + ahead)
+            if await ensure_partition(conn, month):
+                created.append(partition_name(month))
+        dropped = await drop_expired_partitions(conn, now, settings.progress_retention_months)
+    return {"created": created, "dropped": dropped}
+
+
+def summarize_events(events: list[dict]) -> dict:
+    """Collapse a finished job's events into one summary event."""
+    errors = [
+        {"video_id": event.get("video_id"), "error": event["error"]}
+        for event in events
+        if event.get("error")
+    ]
+    summary = {
+        **events[-1],
+        "compacted": True,
+        "event_count": len(events),
+        "error_count": len(errors),
+        "errors": errors[-MAX_SUMMARY_ERRORS:],
+    }
+    if errors:
+        summary["last_error"] = errors[-1]["error"]
+        summary["last_error_video_id"] = errors[-1]["video_id"]
+    return summary
+
+
+async def compact_job_events(session: AsyncSession, job_id) -> int:
+    """Replace the events of one job with a summary row; returns rows removed."""
+    result = await session.execute(
+        select(JobProgressEvent.created_at, JobProgressEvent.progress_data)
+        .where(JobProgressEvent.job_id == job_id)
+        .order_by(JobProgressEvent.created_at, JobProgressEvent.id)
+    )
+    rows = result.all()
+    if not rows:
+        return 0
+
+    last_created_at = rows[-1].created_at
+    # Only delete what was summarized, should a late event arrive meanwhile
+    await session.execute(
+        delete(JobProgressEvent).where(
+            JobProgressEvent.job_id == job_id,
+            JobProgressEvent.created_at <= last_created_at
+        )
+    )
+    await session.execute(
+        insert(JobProgressEvent).values(
+            job_id=job_id,
+            created_at=last_created_at,
+            progress_data=summarize_events([row.progress_data for row in rows])
+        )
+    )
+    return len(rows)
+
+
+async def compact_progress_events(
+    ctx: dict,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    now: Optional[datetime] = None
+) -> dict:
+    """ARQ cron job: compact the histories of jobs that finished a while ago."""
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=settings.progress_compact_after)
+    uncompacted = select(JobProgressEvent.id).where(
+        JobProgressEvent.job_id == ProcessingJob.id,
+        ~JobProgressEvent.progress_data.has_key("compacted")
+    ).exists()
+
+    async with session_factory() as session:
+        result = await session.execute(
+            select(ProcessingJob.id)
+            .where(
+                ProcessingJob.status.in_(FINISHED_STATUSES),
+                ProcessingJob.updated_at < cutoff,
+                uncompacted
+            )
+            .limit(settings.progress_compact_batch)
+        )
+        job_ids = list(result.scalars())
+
+    compacted = 0
+    removed = 0
+    for job_id in job_ids:
+        # One transaction per job keeps locks short
+        async with session_factory() as session:
+            try:
+                removed += await compact_job_events(session, job_id)
+                await session.commit()
+                compacted += 1
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Failed to compact progress events of job {job_id}: {e}")
+
+    if compacted:
+        logger.info(f"Compacted {removed} progress events of {compacted} finished jobs")
+    return {"jobs": compacted, "events": removed}
@@ -0,0 +1,231 @@
+"""
+Batched delivery of progress events from the worker.
+
+`publish_progress` used to open a session, insert one row, commit and
+PUBLISH for every event. With ten concurrent jobs that is a connection
+checkout and a transaction per event. `ProgressSink` is shared by all jobs
+of a worker process and buffers events instead. Each flush:
+
+- appends all events to the users' progress streams in one Redis pipeline
+  (see app.core.progress_stream), which assigns their event ids
+- sends all PUBLISHes, including the event ids, and updates each job's
+  latest-state snapshot (app.core.progress_snapshot) in a second pipeline
+- writes all rows with one multi-row INSERT in one transaction
+
+The sink is started in the worker's on_startup hook and flushes every
+`flush_interval` seconds, when a job finishes and on shutdown. A sink that
+was never started (tests, scripts) writes every event through immediately.
+
+Delivery stays best-effort: events that don't fit the backlog or whose
+flush fails are dropped and counted in PROGRESS_EVENTS_DROPPED. A full
+backlog only drops plain progress updates (the same policy as the hub's
+ConnectionQueue); error and final events are always kept.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import redis.asyncio as redis
+from opentelemetry import trace
+from opentelemetry.trace import Link, SpanKind
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import PROGRESS_SINK_BACKLOG, PROGRESS_EVENTS_DROPPED, REDIS_PUBLISH_DURATION
+from app.core.progress_hub import is_coalescible
+from app.core.progress_snapshot import snapshot_fields, snapshot_key
+from app.core.progress_stream import progress_channel, progress_stream, with_event_id
+from app.core.tracing import extract_context, tracer
+from app.models.job_progress import JobProgressEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _trace_links(batch: list) -> list[Link]:
+    """One link per distinct trace the batch's events were submitted in."""
+    links = {}
+    for *_event, trace_context in batch:
+        context = extract_context(trace_context)
+        if context is None:
+            continue
+        span_context = trace.get_current_span(context).get_span_context()
+        if span_context.is_valid:
+            links.setdefault(span_context.span_id, Link(span_context))
+    return list(links.values())
+
+
+class ProgressSink:
+    """
+    Per-worker buffer for progress events.
+
+    Usage:
+        sink = ProgressSink(redis_client, AsyncSessionLocal)
+        sink.start()
+        sink.submit(user_id, job_id, progress_data)
+        await sink.flush()  # e.g. when a job finishes
+        await sink.close()
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        flush_interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        max_backlog: Optional[int] = None
+    ):
+        self._redis = redis_client
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval or settings.progress_flush_interval
+        self.max_batch = max_batch or settings.progress_flush_max_batch
+        self.max_backlog = max_backlog or settings.progress_max_backlog
+        self._events: deque[tuple[str, str, dict, datetime, Optional[dict]]] = deque()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def backlog(self) -> int:
+        """Number of events waiting for the next flush."""
+        return len(self._events)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def submit(self, user_id: str, job_id: str, progress_data: dict, trace_context: Optional[dict] = None) -> None:
+        """
+        Buffer one event (never blocks, never raises).
+
+        `trace_context` (see app.core.tracing.inject_context) only travels
+        with the live PUBLISH, for the API's delivery span; it is not part
+        of the event stored in the stream, snapshot or database.
+        """
+        if len(self._events) >= self.max_backlog:
+            # Oldest plain updates are the least useful to a client catching up
+            oldest = next((event for event in self._events if is_coalescible(event[2])), None)
+            if oldest is not None:
+                self._events.remove(oldest)
+                PROGRESS_EVENTS_DROPPED.labels("backlog_full").inc()
+            elif is_coalescible(progress_data):
+                PROGRESS_EVENTS_DROPPED.labels("backlog_full").inc()
+                return
+        self._events.append((user_id, job_id, progress_data, datetime.now(timezone.utc), trace_context))
+        PROGRESS_SINK_BACKLOG.set(len(self._events))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # close() cancels this task: let a flush in progress finish
+            # (close() waits for it on the lock) instead of losing its batch
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Deliver all buffered events in batches of at most max_batch."""
+        async with self._lock:
+            while self._events:
+                batch = [self._events.popleft() for _ in range(min(self.max_batch, len(self._events)))]
+                PROGRESS_SINK_BACKLOG.set(len(self._events))
+                # A batch mixes events of several jobs: link their traces
+                with tracer.start_as_current_span(
+                    "progress_sink flush",
+                    links=_trace_links(batch),
+                    attributes={"progress.events": len(batch)},
+                ):
+                    event_ids = await self._append_to_streams(batch)
+                    batch = [
+                        (user_id, job_id, with_event_id(event_id, progress_data), created_at, trace_context)
+                        for (user_id, job_id, progress_data, created_at, trace_context), event_id in zip(batch, event_ids)
+                    ]
+                    await self._publish(batch)
+                    await self._persist(batch)
+
+    async def _append_to_streams(self, batch: list) -> list[Optional[str]]:
+        """XADD every event to its user's capped stream; returns the event ids."""
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            streams = set()
+            for user_id, _job_id, progress_data, _created_at, _trace_context in batch:
+                stream = progress_stream(user_id)
+                streams.add(stream)
+                pipe.xadd(
+                    stream,
+                    {"data": json.dumps(progress_data)},
+                    maxlen=settings.progress_stream_maxlen,
+                    approximate=True
+                )
+            for stream in streams:
+                pipe.expire(stream, settings.progress_stream_ttl)
+            with tracer.start_as_current_span("redis XADD pipeline", kind=SpanKind.CLIENT):
+                results = await pipe.execute()
+            return [
+                event_id.decode() if isinstance(event_id, bytes) else event_id
+                for event_id in results[:len(batch)]
+            ]
+        except Exception as e:
+            # Live delivery still works, only replay misses these events
+            PROGRESS_EVENTS_DROPPED.labels("stream_error").inc(len(batch))
+            logger.warning(f"Redis XADD of {len(batch)} events failed (non-fatal): {e}", exc_info=True)
+            return [None] * len(batch)
+
+    async def _publish(self, batch: list) -> None:
+        # One HSET per job: merging in order keeps the newest value per field
+        snapshots: dict[str, dict[str, str]] = {}
+        for _user_id, job_id, progress_data, created_at, _trace_context in batch:
+            snapshots.setdefault(str(job_id), {}).update(snapshot_fields(progress_data, created_at))
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for user_id, _job_id, progress_data, _created_at, trace_context in batch:
+                if trace_context:
+                    # Stripped again by the API's ProgressHub before clients see it
+                    progress_data = {**progress_data, "trace_context": trace_context}
+                pipe.publish(progress_channel(user_id), json.dumps(progress_data))
+            for job_id, fields in snapshots.items():
+                pipe.hset(snapshot_key(job_id), mapping=fields)
+                pipe.expire(snapshot_key(job_id), settings.progress_snapshot_ttl)
+            with REDIS_PUBLISH_DURATION.time(), tracer.start_as_current_span("redis PUBLISH pipeline", kind=SpanKind.CLIENT):
+                await pipe.execute()
+        except Exception as e:
+            PROGRESS_EVENTS_DROPPED.labels("redis_error").inc(len(batch))
+            logger.warning(f"Redis publish of {len(batch)} events failed (non-fatal): {e}", exc_info=True)
+
+    async def _persist(self, batch: list) -> None:
+        # created_at is the submit time: rows of one INSERT would otherwise
+        # share now() and lose their order in the progress history
+        rows = [
+            {"job_id": job_id, "progress_data": progress_data, "created_at": created_at, "updated_at": created_at}
+            for _user_id, job_id, progress_data, created_at, _trace_context in batch
+        ]
+        try:
+            async with self._session_factory() as session:
+                try:
+                    await session.execute(insert(JobProgressEvent), rows)
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+        except Exception as e:
+            PROGRESS_EVENTS_DROPPED.labels("db_error").inc(len(batch))
+            logger.warning(f"DB persist of {len(batch)} events failed (non-fatal): {e}", exc_info=True)
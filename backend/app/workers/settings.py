@@ -1,7 +1,63 @@
+import asyncio
+import logging
+
+from arq import cron
 from arq.connections import RedisSettings
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal, QueryStats, query_stats, record_query_stats
+from app.core.quota import QuotaTracker
+from app.core.redis import ARQ_HEALTH_CHECK_KEY
+from app.core.tracing import setup_tracing, shutdown_tracing
+from .exporter import sample_queue_depth, start_exporter
+from .maintenance import compact_progress_events, maintain_progress_partitions
+from .progress_sink import ProgressSink
+from .upstream import create_limiters, create_http_clients, close_http_clients
 from .video_processor import process_video, process_video_list
 
+logger = logging.getLogger(__name__)
+
+
+async def startup(ctx: dict) -> None:
+    """Create per-worker resources shared by all jobs."""
+    if settings.db_profile != "worker":
+        logger.warning(f"Worker runs with the '{settings.db_profile}' database profile, set DB_PROFILE=worker")
+    setup_tracing("youtube-bookmarks-worker")
+    ctx["quota"] = QuotaTracker(ctx["redis"])
+    ctx["limiters"] = create_limiters()
+    ctx["http_clients"] = create_http_clients()
+    ctx["progress_sink"] = ProgressSink(ctx["redis"], AsyncSessionLocal)
+    ctx["progress_sink"].start()
+    start_exporter()
+    ctx["queue_depth_sampler"] = asyncio.create_task(sample_queue_depth(ctx["redis"]))
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release per-worker resources."""
+    sampler = ctx.pop("queue_depth_sampler", None)
+    if sampler:
+        sampler.cancel()
+    sink = ctx.pop("progress_sink", None)
+    if sink:
+        await sink.close()
+    clients = ctx.pop("http_clients", None)
+    if clients:
+        await close_http_clients(clients)
+    ctx.pop("quota", None)
+    ctx.pop("limiters", None)
+    shutdown_tracing()
+
+
+async def on_job_start(ctx: dict) -> None:
+    """Collect the SQL statements of the job (run in the same task as on_job_end)."""
+    ctx["query_stats_token"] = query_stats.set(QueryStats())
+
+
+async def on_job_end(ctx: dict) -> None:
+    stats = query_stats.get()
+    query_stats.reset(ctx.pop("query_stats_token"))
+    record_query_stats("arq_job", stats)
+    logger.debug(f"Job {ctx['job_id']} ran {stats.count} queries in {stats.duration * 1000:.1f} ms")
+
 
 class WorkerSettings:
     """ARQ Worker configuration with 2025 best practices."""
@@ -21,6 +77,18 @@ class WorkerSettings:
     # Task registration
     functions = [process_video, process_video_list]
 
+    # Housekeeping of job_progress_events (ARQ runs each slot once across workers)
+    cron_jobs = [
+        cron(maintain_progress_partitions, hour={3}, minute={0}, run_at_startup=True),
+        cron(compact_progress_events, minute={10, 40}),
+    ]
+
+    # Lifecycle hooks
+    on_startup = startup
+    on_shutdown = shutdown
+    on_job_start = on_job_start
+    on_job_end = on_job_end
+
     # Worker performance
     max_jobs = 10  # Process up to 10 videos in parallel
     job_timeout = 600  # 10 minutes (increased from plan's 5min for long videos)
@@ -33,7 +101,7 @@ class WorkerSettings:
 
     # Health monitoring
     health_check_interval = 60  # Check every minute (not default 1 hour)
-    health_check_key = "arq:youtube:health"
+    health_check_key = ARQ_HEALTH_CHECK_KEY  # read by GET /api/health/ready
 
     # Graceful shutdown
     allow_abort_jobs = True
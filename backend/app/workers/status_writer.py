@@ -0,0 +1,155 @@
+"""
+Write-behind persistence of per-video status and job counters.
+
+Updating one video row and the job row per processed video would double
+the worker's write load for no benefit to readers, who only poll the job.
+`JobStatusWriter` buffers the outcomes in memory and writes them in one
+transaction every `flush_every` videos or `flush_interval` seconds:
+
+    UPDATE videos SET processing_status = data.status, error_message = data.error_message
+    FROM (VALUES (:id, :status, :error), ...) AS data (id, status, error_message)
+    WHERE videos.id = data.id
+
+    UPDATE processing_jobs
+    SET processed_count = processed_count + :processed, failed_count = failed_count + :failed
+    WHERE id = :job_id
+
+The caller must flush before the job ends (completion, pause, cancel).
+If a flush fails the buffer is kept and retried with the next flush.
+A job status passed to flush() only replaces the statuses listed in
+STATUS_TRANSITIONS: a job that processed every video is "completed" even
+if a pause raced the last video, a quota pause never overwrites a cancel,
+and a cancel from the API always wins.
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import String, Uuid, case, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.job import ProcessingJob
+from app.models.video import Video
+
+logger = logging.getLogger(__name__)
+
+# Job status written by the worker -> current statuses it may replace
+STATUS_TRANSITIONS = {
+    "completed": ("running", "paused"),
+    "paused": ("running",),
+    "running": ("paused",),
+    "cancelled": ("running", "paused"),
+}
+
+
+class JobStatusWriter:
+    """
+    Buffered status writer for one processing job.
+
+    Usage:
+        writer = JobStatusWriter(AsyncSessionLocal, job_id)
+        writer.record(video_id, "completed")
+        await writer.maybe_flush()
+        ...
+        await writer.flush(job_status="completed")
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        job_id: str,
+        *,
+        flush_every: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self._session_factory = session_factory
+        self.job_id = job_id
+        self.flush_every = flush_every or settings.worker_status_flush_every
+        self.flush_interval = flush_interval or settings.worker_status_flush_interval
+        self._videos: dict[str, tuple[str, Optional[str]]] = {}
+        self._processed = 0
+        self._failed = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered video outcomes."""
+        return len(self._videos)
+
+    def record(self, video_id: str, status: str, error: Optional[str] = None) -> None:
+        """Buffer the outcome of one video ("completed" or "failed")."""
+        self._videos[str(video_id)] = (status, error)
+        if status == "failed":
+            self._failed += 1
+        else:
+            self._processed += 1
+
+    async def maybe_flush(self) -> None:
+        """Flush if the batch is full or the last flush is too old."""
+        if (
+            self.pending >= self.flush_every
+            or (self.pending and time.monotonic() - self._last_flush >= self.flush_interval)
+        ):
+            await self.flush()
+
+    async def flush(self, job_status: Optional[str] = None) -> bool:
+        """
+        Write buffered outcomes (and optionally the job status, see
+        STATUS_TRANSITIONS).
+
+        Best-effort like progress events: failures are logged, the buffer is
+        kept for the next attempt and False is returned.
+        """
+        if not self._videos and not self._processed and not self._failed and job_status is None:
+            return True
+
+        try:
+            async with self._session_factory() as session:
+                try:
+                    if self._videos:
+                        data = values(
+                            column("id", Uuid),
+                            column("status", String),
+                            column("error_message", String),
+                            name="data"
+                        ).data([
+                            (UUID(video_id), status, error)
+                            for video_id, (status, error) in self._videos.items()
+                        ])
+                        await session.execute(
+                            update(Video)
+                            .where(Video.id == data.c.id)
+                            .values(processing_status=data.c.status, error_message=data.c.error_message)
+                        )
+
+                    job_values = {
+                        "processed_count": ProcessingJob.processed_count + self._processed,
+                        "failed_count": ProcessingJob.failed_count + self._failed,
+                    }
+                    if job_status is not None:
+                        job_values["status"] = case(
+                            (ProcessingJob.status.in_(STATUS_TRANSITIONS[job_status]), job_status),
+                            else_=ProcessingJob.status
+                        )
+                    await session.execute(
+                        update(ProcessingJob)
+                        .where(ProcessingJob.id == self.job_id)
+                        .values(**job_values)
+                    )
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+        except Exception as e:
+            logger.warning(f"Status flush for job {self.job_id} failed, will retry: {e}")
+            return False
+
+        logger.debug(f"Flushed {len(self._videos)} video statuses for job {self.job_id}")
+        self._videos.clear()
+        self._processed = 0
+        self._failed = 0
+        self._last_flush = time.monotonic()
+        return True
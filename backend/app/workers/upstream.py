@@ -0,0 +1,123 @@
+"""
+Outbound call layer for the worker.
+
+Every call to YouTube or Gemini goes through `call_upstream`, which first
+consults the shared QuotaTracker (rate buckets and daily budget), then
+holds a slot of the upstream's adaptive concurrency limiter, and finally
+runs the request on that upstream's pooled HTTP/2 client.
+
+Clients and limiters are created once per worker process in the ARQ
+`on_startup` hook and live in `ctx`, so connections (and their TLS
+sessions) are reused across jobs instead of re-established per call.
+"""
+
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind
+
+from app.core.config import settings
+from app.core.tracing import tracer
+from .concurrency import AdaptiveLimiter
+
+T = TypeVar("T")
+
+UPSTREAMS = ("youtube", "gemini")
+
+
+def create_limiters() -> dict[str, AdaptiveLimiter]:
+    """Create one AIMD limiter per upstream for this worker process."""
+    target_latency = {
+        "youtube": settings.youtube_target_latency,
+        "gemini": settings.gemini_target_latency,
+    }
+    return {
+        upstream: AdaptiveLimiter(
+            upstream,
+            initial=settings.upstream_initial_concurrency,
+            maximum=settings.upstream_max_concurrency,
+            target_latency=target_latency[upstream],
+        )
+        for upstream in UPSTREAMS
+    }
+
+
+def create_http_clients() -> dict[str, httpx.AsyncClient]:
+    """
+    Create one pooled, HTTP/2-enabled client per upstream.
+
+    The pool is sized to the limiter's maximum so the AIMD window, not the
+    pool, decides how many calls are in flight.
+    """
+    base_url = {
+        "youtube": settings.youtube_api_base_url,
+        "gemini": settings.gemini_api_base_url,
+    }
+    read_timeout = {
+        "youtube": settings.youtube_timeout,
+        "gemini": settings.gemini_timeout,
+    }
+    return {
+        upstream: httpx.AsyncClient(
+            base_url=base_url[upstream],
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.upstream_max_concurrency,
+                max_keepalive_connections=settings.upstream_max_concurrency,
+                keepalive_expiry=settings.upstream_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(read_timeout[upstream], connect=settings.upstream_connect_timeout),
+            event_hooks={"request": [_inject_trace_context]},
+        )
+        for upstream in UPSTREAMS
+    }
+
+
+async def _inject_trace_context(request: httpx.Request) -> None:
+    """Pass the current trace on to the upstream (traceparent header)."""
+    propagate.inject(request.headers)
+
+
+async def close_http_clients(clients: dict[str, httpx.AsyncClient]) -> None:
+    """Close all pooled clients (worker shutdown)."""
+    for client in clients.values():
+        await client.aclose()
+
+
+async def call_upstream(
+    ctx: dict,
+    upstream: str,
+    cost_class: str,
+    request: Callable[[httpx.AsyncClient], Awaitable[T]]
+) -> T:
+    """
+    Run an outbound call under quota and concurrency control.
+
+    Args:
+        ctx: ARQ context (holds "quota", "limiters" and "http_clients")
+        upstream: "youtube" or "gemini"
+        cost_class: Cost class from app.core.quota.COST_CLASSES
+        request: Coroutine factory performing the call with the upstream's
+            pooled client. It should raise for 429/503 responses so the
+            limiter can back off.
+
+    Returns:
+        Whatever `request` returns
+
+    Raises:
+        QuotaExceededError: If the upstream's daily budget is exhausted
+    """
+    quota = ctx.get("quota")
+    if quota is not None:
+        await quota.acquire(upstream, cost_class)
+
+    limiter: AdaptiveLimiter = ctx["limiters"][upstream]
+    client: httpx.AsyncClient = ctx["http_clients"][upstream]
+    async with limiter.slot():
+        with tracer.start_as_current_span(
+            f"{upstream} {cost_class}",
+            kind=SpanKind.CLIENT,
+            attributes={"upstream": upstream, "cost_class": cost_class},
+        ):
+            return await request(client)
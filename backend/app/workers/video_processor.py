@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 from arq import Retry
 from arq.worker import func as arq_func
@@ -5,12 +6,25 @@ import httpx
 import asyncpg
 import logging
 import time
-import json
+from opentelemetry.trace import SpanKind
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
-from app.models.job_progress import JobProgressEvent
 from app.models.job import ProcessingJob
 from app.core.database import AsyncSessionLocal
+from app.core.metrics import VIDEO_PROCESSING_DURATION, VIDEO_RETRIES
+from app.core.tracing import extract_context, inject_context, tracer
+from app.core.quota import QuotaExceededError, cost_of
+from app.core.job_control import (
+    CANCEL,
+    PAUSE,
+    clear_control,
+    enqueue_video_list,
+    get_control_signal,
+    save_checkpoint,
+    take_checkpoint,
+)
+from app.workers.progress_sink import ProgressSink
+from app.workers.status_writer import JobStatusWriter
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +42,12 @@ TRANSIENT_ERRORS = (
     asyncpg.exceptions.CannotConnectNowError,
 )
 
+# Upstream calls made for every video (see app.core.quota.COST_CLASSES)
+VIDEO_UPSTREAM_CALLS = (
+    ("youtube", "videos.list"),
+    ("gemini", "generate_content"),
+)
+
 
 async def process_video(
     ctx: dict,
@@ -70,12 +90,17 @@ async def process_video(
         if job_try < max_tries:
             defer_seconds = min(2 ** job_try, 300)  # Cap at 5 minutes
             logger.warning(f"Transient error processing video {video_id}, retrying in {defer_seconds}s: {e}")
+            VIDEO_RETRIES.labels(type(e).__name__).inc()
             raise Retry(defer=defer_seconds) from e
 
         # Final attempt failed
         logger.error(f"Failed to process video {video_id} after {max_tries} attempts: {e}")
         raise
 
+    except QuotaExceededError:
+        # Not a video failure: the caller pauses until the quota resets
+        raise
+
     except Exception as e:
         # Non-retryable errors: fail immediately
         logger.error(f"Fatal error processing video {video_id}: {e}")
@@ -86,10 +111,20 @@ async def process_video(
 process_video.max_tries = 5
 
 
+def _progress_sink(ctx: dict) -> ProgressSink:
+    """Return the worker's shared sink, or a write-through one for this context."""
+    sink = ctx.get("progress_sink")
+    if sink is None:
+        sink = ctx["progress_sink"] = ProgressSink(ctx["redis"], AsyncSessionLocal)
+    return sink
+
+
 async def publish_progress(ctx: dict, progress_data: dict) -> None:
     """
     Dual-write pattern: Publish to Redis (best-effort) and PostgreSQL (best-effort).
     Both are non-critical. Clients fall back to GET /api/jobs/{job_id}/progress-history.
+
+    Events go through the worker's ProgressSink, which batches both writes.
     """
     job_id = ctx.get("job_id")
     user_id = ctx.get("job_user_id")
@@ -101,42 +136,150 @@ async def publish_progress(ctx: dict, progress_data: dict) -> None:
     # Add job_id to progress_data
     progress_data["job_id"] = job_id
 
-    # 1. Redis Pub/Sub (best-effort)
-    try:
-        redis = ctx["redis"]
-        channel = f"progress:user:{user_id}"
-        await redis.publish(channel, json.dumps(progress_data))
-        logger.info(f"Published progress to {channel}: {progress_data.get('progress')}%")
-    except Exception as e:
-        logger.warning(f"Redis publish failed (non-fatal): {e}", exc_info=True)
-        # Don't raise - best-effort
+    sink = _progress_sink(ctx)
+    # The trace context lets the API continue the job's trace when it delivers the event
+    sink.submit(user_id, job_id, progress_data, inject_context() or None)
+    if not sink.running:
+        await sink.flush()
+
+
+async def flush_progress(ctx: dict) -> None:
+    """Deliver buffered events now, e.g. when a job finishes."""
+    await _progress_sink(ctx).flush()
+
+
+async def _publish_stopped(ctx: dict, job_id: str, status: str, checkpoint: dict, message: str) -> dict:
+    """Publish the event for a job that stops early and build its result."""
+    position = checkpoint["position"]
+    total = checkpoint["total_videos"]
+    await publish_progress(ctx, {
+        "status": status,
+        "progress": int((position / total) * 100),
+        "current_video": position,
+        "total_videos": total,
+        "message": message,
+        "processed": checkpoint["processed"],
+        "failed": checkpoint["failed"]
+    })
+    await flush_progress(ctx)
+
+    return {
+        "job_id": job_id,
+        "processed": checkpoint["processed"],
+        "failed": checkpoint["failed"],
+        status: True
+    }
+
+
+async def _defer_until_quota_reset(
+    ctx: dict,
+    job_id: str,
+    list_id: str,
+    remaining: list[str],
+    checkpoint: dict,
+    error: QuotaExceededError
+) -> dict:
+    """
+    Pause a job whose upstream quota ran out instead of failing its videos.
+
+    Re-enqueues only the unprocessed remainder, deferred until the quota
+    resets, and tells the client the job is paused. The caller persists the
+    paused status; the continuation sets it back to running.
+    """
+    logger.warning(f"Job {job_id} paused with {len(remaining)} videos left: {error}")
 
-    # 2. PostgreSQL (best-effort)
+    await enqueue_video_list(
+        ctx["redis"], job_id, list_id, remaining,
+        checkpoint=checkpoint,
+        defer_by=error.retry_after
+    )
+
+    return await _publish_stopped(
+        ctx, job_id, "paused", checkpoint,
+        f"Daily {error.upstream} quota exhausted, resuming in {error.retry_after // 60} minutes"
+    )
+
+
+async def _check_control(
+    ctx: dict,
+    job_id: str,
+    list_id: str,
+    remaining: list[str],
+    checkpoint: dict
+) -> Optional[dict]:
+    """
+    Honor a pause/cancel request before the next video.
+
+    Returns the job result if the job must stop, None to keep going.
+    See app.core.job_control for the pause/resume handshake.
+    """
+    redis_client = ctx["redis"]
     try:
-        async with AsyncSessionLocal() as session:
-            try:
-                event = JobProgressEvent(
-                    job_id=job_id,
-                    progress_data=progress_data
-                )
-                session.add(event)
-                await session.commit()
-                logger.info(f"Persisted progress to DB: {progress_data.get('progress')}%")
-            except Exception:
-                await session.rollback()
-                raise
+        signal = await get_control_signal(redis_client, job_id)
     except Exception as e:
-        logger.warning(f"DB persist failed (non-fatal): {e}", exc_info=True)
-        # Don't raise - best-effort
+        # Control is best-effort: an unreachable Redis must not fail the job
+        logger.warning(f"Failed to read control flag for job {job_id}: {e}")
+        return None
+
+    if signal == CANCEL:
+        logger.info(f"Job {job_id} cancelled with {len(remaining)} videos left")
+        return await _publish_stopped(ctx, job_id, "cancelled", checkpoint, "Cancelled")
+
+    if signal == PAUSE:
+        await save_checkpoint(redis_client, job_id, list_id, remaining, checkpoint)
+        if await get_control_signal(redis_client, job_id) != PAUSE:
+            # Resumed while checkpointing: whoever takes the checkpoint continues
+            if await take_checkpoint(redis_client, job_id) is not None:
+                return None
+            return {
+                "job_id": job_id,
+                "processed": checkpoint["processed"],
+                "failed": checkpoint["failed"],
+                "handed_off": True
+            }
+        logger.info(f"Job {job_id} paused with {len(remaining)} videos left")
+        return await _publish_stopped(ctx, job_id, "paused", checkpoint, "Paused")
+
+    return None
 
 
 async def process_video_list(
     ctx: dict,
     job_id: str,
     list_id: str,
-    video_ids: list[str]
+    video_ids: list[str],
+    checkpoint: Optional[dict] = None,
+    trace_context: Optional[dict] = None
+) -> dict:
+    """
+    Process multiple videos with throttled progress updates.
+
+    When a job is continued (after a quota pause or a resume), `video_ids`
+    holds only the unprocessed remainder and `checkpoint` carries the earlier
+    run's state: {"position": int, "total_videos": int, "processed": int, "failed": int}.
+
+    Pause and cancel requests are checked before every video. Video statuses
+    and job counters are persisted in batches by JobStatusWriter.
+
+    `trace_context` (set by enqueue_video_list) continues the trace of the
+    request that enqueued the job.
+    """
+    with tracer.start_as_current_span(
+        "process_video_list",
+        context=extract_context(trace_context),
+        kind=SpanKind.CONSUMER,
+        attributes={"job.id": job_id, "job.videos": len(video_ids)},
+    ):
+        return await _process_video_list(ctx, job_id, list_id, video_ids, checkpoint)
+
+
+async def _process_video_list(
+    ctx: dict,
+    job_id: str,
+    list_id: str,
+    video_ids: list[str],
+    checkpoint: Optional[dict]
 ) -> dict:
-    """Process multiple videos with throttled progress updates"""
 
     # OPTIMIZATION: Lookup user_id ONCE at start, cache in context
     async with AsyncSessionLocal() as session:
@@ -155,9 +298,18 @@ async def process_video_list(
         ctx["job_user_id"] = str(job.list.user_id)
         ctx["job_id"] = str(job_id)
 
-    total = len(video_ids)
-    processed = 0
-    failed = 0
+    checkpoint = checkpoint or {}
+    offset = checkpoint.get("position", 0)
+    total = checkpoint.get("total_videos", len(video_ids))
+    processed = checkpoint.get("processed", 0)
+    failed = checkpoint.get("failed", 0)
+    quota = ctx.get("quota")
+    status_writer = JobStatusWriter(AsyncSessionLocal, job_id)
+    started_at = time.monotonic()
+
+    if checkpoint:
+        # Continuation of a pause: the job is running again
+        await status_writer.flush(job_status="running")
 
     # Throttling configuration
     THROTTLE_INTERVAL = 2.0  # seconds
@@ -165,28 +317,59 @@ async def process_video_list(
     last_progress_time = 0.0
     last_progress_percentage = 0
 
-    # Initial event (always publish)
+    # Initial event (always publish); an empty list goes straight to completed
+    initial_percentage = int((offset / total) * 100) if total else 0
     await publish_progress(ctx, {
         "status": "pending",
-        "progress": 0,
-        "current_video": 0,
+        "progress": initial_percentage,
+        "current_video": offset,
         "total_videos": total,
-        "message": "Starting processing..."
+        "message": "Starting processing..." if offset == 0 else "Resuming processing..."
     })
     last_progress_time = time.monotonic()
+    last_progress_percentage = initial_percentage
+
+    for idx, video_id in enumerate(video_ids, start=offset + 1):
+        state = {"position": idx - 1, "total_videos": total, "processed": processed, "failed": failed}
+        stopped = await _check_control(ctx, job_id, list_id, video_ids[idx - offset - 1:], state)
+        if stopped is not None:
+            # The API already wrote the status, unless this run set it back to running
+            stop_status = next((s for s in ("paused", "cancelled") if stopped.get(s)), None)
+            await status_writer.flush(job_status=stop_status)
+            return stopped
 
-    for idx, video_id in enumerate(video_ids, start=1):
         is_error = False
         error_msg = None
+        video_started = time.monotonic()
         try:
+            # Cheap pre-flight so an exhausted budget pauses before any work;
+            # call_upstream consumes the budget when the calls are made
+            if quota is not None:
+                for upstream, cost_class in VIDEO_UPSTREAM_CALLS:
+                    if not await quota.has_quota(upstream, cost_of(upstream, cost_class)):
+                        raise QuotaExceededError(upstream, quota.seconds_until_reset())
+
             # Process single video (existing function)
-            result = await process_video(ctx, video_id, list_id, {})
+            with tracer.start_as_current_span("process_video", attributes={"video.id": str(video_id)}):
+                result = await process_video(ctx, video_id, list_id, {})
+            VIDEO_PROCESSING_DURATION.labels("completed").observe(time.monotonic() - video_started)
             processed += 1
+            status_writer.record(video_id, "completed")
+        except QuotaExceededError as e:
+            # Pause rather than fail: continue with the remainder after the reset
+            await status_writer.flush(job_status="paused")
+            return await _defer_until_quota_reset(
+                ctx, job_id, list_id, video_ids[idx - offset - 1:], state, e
+            )
         except Exception as e:
+            VIDEO_PROCESSING_DURATION.labels("failed").observe(time.monotonic() - video_started)
             failed += 1
             is_error = True
             error_msg = str(e)
             logger.error(f"Failed to process video {video_id}: {e}")
+            status_writer.record(video_id, "failed", error_msg)
+
+        await status_writer.maybe_flush()
 
         current_percentage = int((idx / total) * 100)
         current_time = time.monotonic()
@@ -206,7 +389,11 @@ async def process_video_list(
                 "current_video": idx,
                 "total_videos": total,
                 "message": f"Processing video {idx}/{total}",
-                "video_id": str(video_id)
+                "video_id": str(video_id),
+                "processed": processed,
+                "failed": failed,
+                # Rate of this run only: a resumed job's earlier runs don't count
+                "eta_seconds": int((current_time - started_at) / (idx - offset) * (total - idx))
             }
             if is_error:
                 progress_update["error"] = error_msg
@@ -217,13 +404,25 @@ async def process_video_list(
 
     # Final event (always publish)
     final_status = "completed" if failed == 0 else "completed_with_errors"
+    # processing_jobs.status is VARCHAR(20); failures are visible in failed_count.
+    # Also replaces a pause that arrived after the last control check
+    await status_writer.flush(job_status="completed")
+    try:
+        # Nothing left to pause: a late flag must not outlive the job
+        await clear_control(ctx["redis"], job_id)
+    except Exception as e:
+        logger.warning(f"Failed to clear control flag of job {job_id}: {e}")
     await publish_progress(ctx, {
         "status": final_status,
         "progress": 100,
         "current_video": total,
         "total_videos": total,
-        "message": f"Completed: {processed} succeeded, {failed} failed"
+        "message": f"Completed: {processed} succeeded, {failed} failed",
+        "processed": processed,
+        "failed": failed,
+        "eta_seconds": 0
     })
+    await flush_progress(ctx)
 
     return {
         "job_id": job_id,
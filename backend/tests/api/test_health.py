@@ -0,0 +1,73 @@
+import pytest
+
+from app.api import health
+from app.core.config import settings
+from app.core.database import create_engine
+from app.core.redis import ARQ_HEALTH_CHECK_KEY, get_redis_client
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def health_engine(monkeypatch):
+    """Readiness checks against the test database, uncached."""
+    engine = create_engine("api", TEST_DATABASE_URL)
+    monkeypatch.setattr(health, "engine", engine)
+    monkeypatch.setattr(health, "_readiness", None)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_liveness(client):
+    response = await client.get("/api/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_checks_dependencies_and_is_cached(client, health_engine):
+    redis = await get_redis_client()
+    await redis.set(ARQ_HEALTH_CHECK_KEY, "Oct-18 12:00:00 j_complete=1 j_failed=0 j_retried=0 j_ongoing=0 queued=0")
+
+    response = await client.get("/api/health/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert {name: check["status"] for name, check in data["checks"].items()} == {
+        "database": "ok", "redis": "ok", "db_pool": "ok", "workers": "ok"
+    }
+    assert data["checks"]["database"]["latency_ms"] >= 0
+    assert data["checks"]["workers"]["detail"].startswith("Oct-18")
+
+    # Probes within health_cache_ttl reuse the result
+    assert (await client.get("/api/health/ready")).json()["checked_at"] == data["checked_at"]
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_on_saturated_pool(client, health_engine, monkeypatch):
+    monkeypatch.setattr(settings, "health_pool_saturation", 0)
+    redis = await get_redis_client()
+    await redis.delete(ARQ_HEALTH_CHECK_KEY)
+
+    response = await client.get("/api/health/ready")
+
+    assert response.status_code == 503
+    checks = response.json()["checks"]
+    assert checks["db_pool"]["status"] == "fail"
+    # No worker heartbeat is a warning, not a reason to stop routing here
+    assert checks["workers"] == {"status": "warn", "latency_ms": None, "detail": "No worker heartbeat"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_when_database_is_unreachable(client, monkeypatch):
+    engine = create_engine("api", TEST_DATABASE_URL.rsplit("/", 1)[0] + "/no_such_database")
+    monkeypatch.setattr(health, "engine", engine)
+    monkeypatch.setattr(health, "_readiness", None)
+    try:
+        response = await client.get("/api/health/ready")
+    finally:
+        await engine.dispose()
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["status"] == "fail"
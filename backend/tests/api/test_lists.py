@@ -19,3 +19,40 @@ async def test_create_list(client):
     assert data["name"] == "Test List"
     assert data["description"] == "A test"
     assert "id" in data
+
+
+@pytest.mark.asyncio
+async def test_create_list_reads_server_defaults_from_insert(client, test_user, sql_statements):
+    # One INSERT ... RETURNING, no refresh SELECT
+    with sql_statements.expect(1):
+        response = await client.post(
+            "/api/lists",
+            json={"name": "Defaults", "user_id": str(test_user.id)}
+        )
+
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    insert = sql_statements.statements[-1]
+    assert insert.startswith("INSERT INTO bookmarks_lists") and "RETURNING" in insert
+
+
+@pytest.mark.asyncio
+async def test_get_lists_query_budget(client, test_db, test_user, sql_statements):
+    from app.models import BookmarkList, Video
+
+    for i in range(3):
+        bookmark_list = BookmarkList(name=f"Budget {i}", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.flush()
+        test_db.add(Video(list_id=bookmark_list.id, youtube_id=f"{i:011d}", processing_status="pending"))
+    await test_db.commit()
+
+    # Lists with their video counts in one query
+    with sql_statements.expect(1):
+        response = await client.get("/api/lists")
+    assert response.status_code == 200
+
+    with sql_statements.expect(1):
+        response = await client.get(f"/api/lists/{bookmark_list.id}")
+    assert response.status_code == 200
+    assert response.json()["video_count"] == 1
@@ -0,0 +1,20 @@
+import pytest
+from prometheus_client import REGISTRY
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_latency_by_route_template(client, test_list):
+    labels = {"method": "GET", "route": "/api/lists/{list_id}", "status": "200"}
+    before = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+
+    response = await client.get(f"/api/lists/{test_list.id}")
+    assert response.status_code == 200
+
+    assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) == before + 1
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/lists/{list_id}",status="200"}' in response.text
+    assert str(test_list.id) not in response.text
+    assert "db_pool_checkout_wait_seconds" in response.text
@@ -169,6 +169,210 @@ async def test_pause_completed_job(client, test_db):
     assert "Cannot pause job with status 'completed'" in response.json()["detail"]
 
 
+async def _start_job(client) -> str:
+    list_response = await client.post("/api/lists", json={"name": "Test List"})
+    list_id = list_response.json()["id"]
+    await client.post(
+        f"/api/lists/{list_id}/videos",
+        json={"url": "https://youtube.com/watch?v=dQw4w9WgXcQ"}
+    )
+    job_response = await client.post(f"/api/lists/{list_id}/process")
+    return job_response.json()["job_id"]
+
+
+@pytest.mark.asyncio
+async def test_pause_job_sets_control_flag(client):
+    from app.core.job_control import get_control_signal
+    from app.core.redis import get_arq_pool
+
+    job_id = await _start_job(client)
+
+    response = await client.post(f"/api/jobs/{job_id}/pause")
+    assert response.status_code == 204
+
+    assert await get_control_signal(await get_arq_pool(), job_id) == "pause"
+
+
+@pytest.mark.asyncio
+async def test_resume_job_enqueues_checkpoint(client, monkeypatch):
+    from unittest.mock import AsyncMock
+    from app.core.job_control import get_control_signal, save_checkpoint, take_checkpoint
+    from app.core.redis import get_arq_pool
+
+    job_id = await _start_job(client)
+    await client.post(f"/api/jobs/{job_id}/pause")
+
+    # What the worker leaves behind when it stops
+    arq_pool = await get_arq_pool()
+    checkpoint = {"position": 1, "total_videos": 3, "processed": 1, "failed": 0}
+    await save_checkpoint(arq_pool, job_id, "list-1", ["v2", "v3"], checkpoint)
+
+    enqueue = AsyncMock()
+    monkeypatch.setattr("app.api.processing.enqueue_video_list", enqueue)
+
+    response = await client.post(f"/api/jobs/{job_id}/resume")
+    assert response.status_code == 204
+
+    enqueue.assert_awaited_once_with(arq_pool, job_id, "list-1", ["v2", "v3"], checkpoint=checkpoint)
+    assert await get_control_signal(arq_pool, job_id) is None
+    assert await take_checkpoint(arq_pool, job_id) is None
+
+    status_response = await client.get(f"/api/jobs/{job_id}")
+    assert status_response.json()["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_resume_job_with_queued_run(client):
+    from app.core.job_control import enqueue_video_list
+    from app.core.redis import get_arq_pool
+
+    job_id = await _start_job(client)
+    await enqueue_video_list(await get_arq_pool(), job_id, "list-1", ["v1"])
+    await client.post(f"/api/jobs/{job_id}/pause")
+
+    # No checkpoint: the queued run picks up the cleared flag
+    response = await client.post(f"/api/jobs/{job_id}/resume")
+    assert response.status_code == 204
+
+    status_response = await client.get(f"/api/jobs/{job_id}")
+    assert status_response.json()["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_resume_job_without_checkpoint_or_run(client, test_db, test_list):
+    from app.models import ProcessingJob
+
+    # E.g. paused after the worker's last control check, run already finished
+    job = ProcessingJob(list_id=test_list.id, total_videos=1, status="paused")
+    test_db.add(job)
+    await test_db.commit()
+
+    response = await client.post(f"/api/jobs/{job.id}/resume")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Nothing to resume: job status is 'paused'"
+
+    status_response = await client.get(f"/api/jobs/{job.id}")
+    assert status_response.json()["status"] == "paused"
+
+
+@pytest.mark.asyncio
+async def test_resume_running_job(client):
+    job_id = await _start_job(client)
+
+    response = await client.post(f"/api/jobs/{job_id}/resume")
+    assert response.status_code == 400
+    assert "Cannot resume job with status 'running'" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_job(client):
+    from app.core.job_control import get_control_signal
+    from app.core.redis import get_arq_pool
+
+    job_id = await _start_job(client)
+    await client.post(f"/api/jobs/{job_id}/pause")
+
+    response = await client.post(f"/api/jobs/{job_id}/cancel")
+    assert response.status_code == 204
+
+    assert await get_control_signal(await get_arq_pool(), job_id) == "cancel"
+
+    status_response = await client.get(f"/api/jobs/{job_id}")
+    assert status_response.json()["status"] == "cancelled"
+
+    # Cancelled jobs can't be cancelled or resumed again
+    response = await client.post(f"/api/jobs/{job_id}/cancel")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_aborts_queued_run(client):
+    from arq.constants import abort_jobs_ss
+    from app.core.job_control import enqueue_video_list, get_arq_job_id
+    from app.core.redis import get_arq_pool
+
+    job_id = await _start_job(client)
+    arq_pool = await get_arq_pool()
+    await enqueue_video_list(arq_pool, job_id, "list-1", ["v1"])
+
+    response = await client.post(f"/api/jobs/{job_id}/cancel")
+    assert response.status_code == 204
+
+    # ARQ drops the run when a worker picks it up
+    assert await arq_pool.zscore(abort_jobs_ss, await get_arq_job_id(arq_pool, job_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_job_progress_from_snapshot(client, test_db, test_list):
+    from app.models import ProcessingJob
+    from app.core.progress_snapshot import snapshot_fields, snapshot_key
+    from app.core.redis import get_redis_client
+
+    job = ProcessingJob(list_id=test_list.id, total_videos=10, status="running")
+    test_db.add(job)
+    await test_db.commit()
+
+    redis = await get_redis_client()
+    now = datetime.now(timezone.utc)
+    await redis.hset(snapshot_key(job.id), mapping=snapshot_fields({
+        "status": "processing", "progress": 40, "current_video": 4, "total_videos": 10,
+        "processed": 3, "failed": 1, "eta_seconds": 12, "event_id": "5-0",
+        "error": "Video unavailable", "video_id": "abc"
+    }, now))
+    try:
+        response = await client.get(f"/api/jobs/{job.id}/progress")
+    finally:
+        await redis.delete(snapshot_key(job.id))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["source"] == "redis"
+    assert data["progress"] == 40
+    assert (data["processed"], data["failed"]) == (3, 1)
+    assert data["eta_seconds"] == 12
+    assert data["last_error"] == "Video unavailable"
+    assert data["last_error_video_id"] == "abc"
+
+
+@pytest.mark.asyncio
+async def test_get_job_progress_falls_back_to_database(client, test_db, test_list):
+    from app.models import ProcessingJob
+    from app.models.job_progress import JobProgressEvent
+
+    job = ProcessingJob(
+        list_id=test_list.id, total_videos=10, status="running", processed_count=5, failed_count=1
+    )
+    test_db.add(job)
+    await test_db.flush()
+
+    start = datetime.now(timezone.utc)
+    test_db.add_all([
+        JobProgressEvent(job_id=job.id, created_at=start, progress_data={
+            "status": "processing", "progress": 50, "current_video": 5, "error": "Private video"
+        }),
+        JobProgressEvent(job_id=job.id, created_at=start + timedelta(seconds=1), progress_data={
+            "status": "processing", "progress": 60, "current_video": 6, "message": "Processing video 6/10"
+        }),
+    ])
+    await test_db.commit()
+
+    response = await client.get(f"/api/jobs/{job.id}/progress")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["source"] == "database"
+    assert data["progress"] == 60
+    assert data["current_video"] == 6
+    assert (data["processed"], data["failed"]) == (5, 1)
+    assert data["last_error"] == "Private video"
+
+
+@pytest.mark.asyncio
+async def test_get_job_progress_not_found(client):
+    response = await client.get(f"/api/jobs/{uuid4()}/progress")
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_get_progress_history(client, test_db, test_user, test_list):
     """Test retrieving progress history for a job"""
@@ -187,6 +391,7 @@ async def test_get_progress_history(client, test_db, test_user, test_list):
     await test_db.refresh(job)
 
     # Create progress events
+    now = datetime.now(timezone.utc)
     for i in range(3):
         event = JobProgressEvent(
             job_id=job.id,
@@ -197,7 +402,9 @@ async def test_get_progress_history(client, test_db, test_user, test_list):
                 "current_video": i + 1,
                 "total_videos": 10,
                 "message": f"Processing video {i+1}/10"
-            }
+            },
+            # Distinct timestamps, as written by the worker's progress sink
+            created_at=now + timedelta(seconds=i)
         )
         test_db.add(event)
     await test_db.commit()
@@ -296,6 +503,7 @@ async def test_get_progress_history_pagination(client, test_db, test_user, test_
     await test_db.refresh(job)
 
     # Create 10 progress events
+    now = datetime.now(timezone.utc)
     for i in range(10):
         event = JobProgressEvent(
             job_id=job.id,
@@ -306,7 +514,9 @@ async def test_get_progress_history_pagination(client, test_db, test_user, test_
                 "current_video": i + 1,
                 "total_videos": 10,
                 "message": f"Processing video {i+1}/10"
-            }
+            },
+            # Distinct timestamps, as written by the worker's progress sink
+            created_at=now + timedelta(seconds=i)
         )
         test_db.add(event)
     await test_db.commit()
@@ -330,6 +540,125 @@ async def test_get_progress_history_pagination(client, test_db, test_user, test_
     assert data[2]["progress_data"]["progress"] == 70
 
 
+@pytest.mark.asyncio
+async def test_get_progress_history_cursor_pagination(client, test_db, test_user, test_list):
+    """Test keyset pagination: no duplicates or gaps, even for equal timestamps"""
+    from app.models import ProcessingJob
+    from app.models.job_progress import JobProgressEvent
+
+    job = ProcessingJob(list_id=test_list.id, total_videos=10, status="running")
+    test_db.add(job)
+    await test_db.flush()
+
+    # Events flushed by one batch INSERT may share created_at
+    now = datetime.now(timezone.utc)
+    for i in range(5):
+        test_db.add(JobProgressEvent(
+            job_id=job.id,
+            progress_data={"job_id": str(job.id), "status": "processing", "progress": i},
+            created_at=now if i < 3 else now + timedelta(seconds=i)
+        ))
+    await test_db.commit()
+
+    seen = []
+    params = {"user_id": str(test_user.id), "limit": 2}
+    for _ in range(3):
+        response = await client.get(f"/api/jobs/{job.id}/progress-history", params=params)
+        assert response.status_code == 200
+        seen.extend(event["id"] for event in response.json())
+        params["cursor"] = response.headers.get("X-Next-Cursor")
+
+    assert len(seen) == len(set(seen)) == 5
+    # The last page is not full, so there is no next cursor
+    assert params["cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_progress_history_invalid_cursor(client, test_user):
+    """Test that a malformed cursor is rejected"""
+    response = await client.get(
+        f"/api/jobs/{uuid4()}/progress-history",
+        params={"user_id": str(test_user.id), "cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_progress_history_large_page_is_gzipped(client, test_db, test_user, test_list):
+    """Test that large history pages are compressed"""
+    from app.models import ProcessingJob
+    from app.models.job_progress import JobProgressEvent
+
+    job = ProcessingJob(list_id=test_list.id, total_videos=500, status="running")
+    test_db.add(job)
+    await test_db.flush()
+    test_db.add_all([
+        JobProgressEvent(job_id=job.id, progress_data={"job_id": str(job.id), "progress": i})
+        for i in range(500)
+    ])
+    await test_db.commit()
+
+    response = await client.get(
+        f"/api/jobs/{job.id}/progress-history",
+        params={"user_id": str(test_user.id), "limit": 1000},
+        headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 500
+
+
+@pytest.mark.asyncio
+async def test_get_progress_history_is_one_query(client, test_db, sql_statements, test_user, test_list):
+    """Test that ownership is checked within the events query"""
+    from app.models import ProcessingJob
+    from app.models.job_progress import JobProgressEvent
+
+    job = ProcessingJob(list_id=test_list.id, total_videos=1, status="running")
+    test_db.add(job)
+    await test_db.flush()
+    test_db.add(JobProgressEvent(job_id=job.id, progress_data={"job_id": str(job.id), "progress": 0}))
+    await test_db.commit()
+
+    with sql_statements.expect(1):
+        response = await client.get(
+            f"/api/jobs/{job.id}/progress-history",
+            params={"user_id": str(test_user.id)}
+        )
+    assert response.status_code == 200
+
+    # Caught up: the (now cached) owner spares the ownership lookup
+    with sql_statements.expect(1):
+        response = await client.get(
+            f"/api/jobs/{job.id}/progress-history",
+            params={"user_id": str(test_user.id), "since": datetime.now(timezone.utc).isoformat()}
+        )
+    assert response.status_code == 200
+    assert response.json() == []
+
+    # Someone else is rejected without a query
+    with sql_statements.expect(0):
+        response = await client.get(
+            f"/api/jobs/{job.id}/progress-history",
+            params={"user_id": str(uuid4())}
+        )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_get_progress_history_unknown_job(client, test_user):
+    """Test that history of a nonexistent job is a 404"""
+    response = await client.get(
+        f"/api/jobs/{uuid4()}/progress-history",
+        params={"user_id": str(test_user.id)}
+    )
+
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_get_progress_history_unauthorized(client, test_db, test_user, test_list):
     """Test authorization: user cannot access other user's jobs"""
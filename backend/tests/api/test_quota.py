@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_get_quota_status(client):
+    response = await client.get("/api/quota")
+
+    assert response.status_code == 200
+    upstreams = {entry["upstream"]: entry for entry in response.json()["upstreams"]}
+    assert set(upstreams) == {"youtube", "gemini"}
+    youtube = upstreams["youtube"]
+    assert youtube["daily_limit"] == 10000
+    assert youtube["daily_used"] + youtube["daily_remaining"] == 10000
+    assert "resets_at" in youtube
@@ -303,6 +303,35 @@ https://youtu.be/jNQXAC9IVRw"""
     assert "invalid.com" in data["failures"][0]["url"]
 
 
+@pytest.mark.asyncio
+async def test_bulk_upload_csv_rejects_duplicates_in_batch(client, test_list, monkeypatch):
+    """Test bulk upload reports every repeat of a video after the first."""
+    from unittest.mock import AsyncMock
+
+    async def mock_get_arq_pool():
+        return AsyncMock()
+
+    monkeypatch.setattr("app.api.videos.get_arq_pool", mock_get_arq_pool)
+
+    # 2000 distinct videos, each listed twice (watch URL, then short URL)
+    rows = [f"https://www.youtube.com/watch?v={i:011d}" for i in range(2000)]
+    rows += [f"https://youtu.be/{i:011d}" for i in range(2000)]
+    csv_file = io.BytesIO(("url\n" + "\n".join(rows)).encode('utf-8'))
+
+    response = await client.post(
+        f"/api/lists/{test_list.id}/videos/bulk",
+        files={"file": ("videos.csv", csv_file, "text/csv")}
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created_count"] == 2000
+    assert data["failed_count"] == 2000
+    # Rows are numbered like the spreadsheet: the header is row 1
+    assert [failure["row"] for failure in data["failures"]] == list(range(2002, 4002))
+    assert all("Duplicate" in failure["error"] for failure in data["failures"])
+
+
 @pytest.mark.asyncio
 async def test_bulk_upload_csv_list_not_found(client):
     """Test bulk upload returns 404 when list doesn't exist."""
@@ -377,3 +406,70 @@ async def test_export_videos_csv_list_not_found(client):
     response = await client.get(f"/api/lists/{fake_list_id}/export/csv")
 
     assert response.status_code == 404
+
+
+# Query budgets: an N+1 or an extra existence check fails here first
+
+def _csv(count: int, offset: int = 0) -> bytes:
+    rows = [f"https://www.youtube.com/watch?v={i + offset:011d}" for i in range(count)]
+    return ("url\n" + "\n".join(rows)).encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_add_video_query_budget(client, test_list, sql_statements):
+    # List lookup, INSERT ... RETURNING
+    with sql_statements.expect(2):
+        response = await client.post(
+            f"/api/lists/{test_list.id}/videos",
+            json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}
+        )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("videos", [1, 50])
+async def test_get_videos_query_budget(client, test_db, test_list, sql_statements, videos):
+    test_db.add_all(
+        Video(list_id=test_list.id, youtube_id=f"{i:011d}", processing_status="pending")
+        for i in range(videos)
+    )
+    await test_db.commit()
+
+    # List lookup, videos: independent of the number of videos
+    with sql_statements.expect(2):
+        response = await client.get(f"/api/lists/{test_list.id}/videos")
+    assert response.status_code == 200
+    assert len(response.json()) == videos
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rows", [10, 500])
+async def test_bulk_upload_query_budget(client, test_list, sql_statements, monkeypatch, rows):
+    from unittest.mock import AsyncMock
+
+    async def mock_get_arq_pool():
+        return AsyncMock()
+
+    monkeypatch.setattr("app.api.videos.get_arq_pool", mock_get_arq_pool)
+
+    # List lookup, videos INSERT, job INSERT, pending video ids
+    with sql_statements.expect(4):
+        response = await client.post(
+            f"/api/lists/{test_list.id}/videos/bulk",
+            files={"file": ("videos.csv", io.BytesIO(_csv(rows)), "text/csv")}
+        )
+    assert response.status_code == 201
+    assert response.json()["created_count"] == rows
+
+
+@pytest.mark.asyncio
+async def test_export_videos_csv_query_budget(client, test_db, test_list, sql_statements):
+    test_db.add_all(
+        Video(list_id=test_list.id, youtube_id=f"{i:011d}", processing_status="pending")
+        for i in range(20)
+    )
+    await test_db.commit()
+
+    with sql_statements.expect(2):
+        response = await client.get(f"/api/lists/{test_list.id}/export/csv")
+    assert response.status_code == 200
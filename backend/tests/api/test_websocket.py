@@ -39,3 +39,76 @@ async def test_websocket_accepts_valid_token():
     # 3. Test fixture for authenticated user
     # Will implement in a follow-up task
     pytest.skip("Requires full user authentication system - implement after basic endpoint is working")
+
+
+@pytest.mark.asyncio
+async def test_replay_sends_missed_events():
+    """Test that a reconnect replays stream events newer than last_event_id"""
+    import json
+    from unittest.mock import AsyncMock
+    from uuid import uuid4
+    import redis.asyncio as redis
+    from app.api.websocket import _replay, _is_newer
+    from app.core.config import settings
+    from app.core.progress_stream import progress_stream
+
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    user_id = uuid4()
+    stream = progress_stream(user_id)
+    try:
+        seen = await client.xadd(stream, {"data": json.dumps({"progress": 10})})
+        missed = await client.xadd(stream, {"data": json.dumps({"progress": 20})})
+
+        websocket = AsyncMock()
+        replayed_up_to = await _replay(websocket, client, user_id, seen)
+
+        websocket.send_json.assert_awaited_once_with({"event_id": missed, "progress": 20})
+        # Live copies of replayed events are skipped
+        assert not _is_newer(missed, replayed_up_to)
+    finally:
+        await client.delete(stream)
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_with_invalid_event_id():
+    """Test that an unusable last_event_id tells the client to use the history API"""
+    from unittest.mock import AsyncMock
+    from app.api.websocket import _replay
+
+    websocket = AsyncMock()
+    assert await _replay(websocket, AsyncMock(), "user", "garbage") is None
+    websocket.send_json.assert_awaited_once_with({"type": "replay_incomplete"})
+
+
+def test_websocket_forwards_progress_from_hub(monkeypatch):
+    """Test that messages published for a user reach their socket through the hub"""
+    import json
+    import time
+    from types import SimpleNamespace
+    from uuid import uuid4
+    import redis
+    from app.core import progress_hub
+    from app.core.config import settings
+    from app.core.progress_stream import progress_channel
+
+    user = SimpleNamespace(id=uuid4())
+
+    async def fake_auth(websocket, token):
+        return user
+
+    monkeypatch.setattr("app.api.websocket.get_current_ws_user", fake_auth)
+    publisher = redis.from_url(settings.redis_url)
+
+    try:
+        with TestClient(app) as client:
+            with client.websocket_connect("/api/ws/progress?token=valid") as ws:
+                # Wait until the endpoint has registered with the hub
+                deadline = time.monotonic() + 2
+                while progress_hub._hub.connection_count == 0 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                publisher.publish(progress_channel(user.id), json.dumps({"job_id": "j1", "progress": 5}))
+                assert ws.receive_json() == {"job_id": "j1", "progress": 5}
+    finally:
+        publisher.close()
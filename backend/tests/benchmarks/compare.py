@@ -0,0 +1,67 @@
+"""
+Compare two benchmark result files (see conftest.BenchmarkResults).
+
+    python -m tests.benchmarks.compare benchmark-results/OLD.json benchmark-results/NEW.json [--threshold 10]
+
+Metrics ending in _per_second are better when higher; _ms, _s and _kib
+when lower. Other values (sizes, counts) are shown but not judged. Exits
+with status 1 if any metric got worse by more than --threshold percent.
+"""
+
+import argparse
+import json
+import sys
+
+HIGHER_IS_BETTER = ("_per_second",)
+LOWER_IS_BETTER = ("_ms", "_s", "_kib")
+
+
+def change(metric: str, old: float, new: float) -> float | None:
+    """Relative improvement in percent (negative = regression), None if not judged."""
+    if not old:
+        return None
+    if metric.endswith(HIGHER_IS_BETTER):
+        return (new - old) / old * 100
+    if metric.endswith(LOWER_IS_BETTER):
+        return (old - new) / old * 100
+    return None
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Print a table of both runs; returns the regressed "benchmark.metric" names."""
+    regressions = []
+    print(f"old: {old['meta']['commit'][:12]}  new: {new['meta']['commit'][:12]}")
+    for name in sorted(old["results"].keys() | new["results"].keys()):
+        print(f"\n{name}")
+        old_metrics = old["results"].get(name, {})
+        new_metrics = new["results"].get(name, {})
+        for metric in sorted(old_metrics.keys() | new_metrics.keys()):
+            before, after = old_metrics.get(metric), new_metrics.get(metric)
+            delta = change(metric, before, after) if before is not None and after is not None else None
+            verdict = ""
+            if delta is not None:
+                verdict = f"{delta:+.1f}%"
+                if delta < -threshold:
+                    verdict += "  REGRESSION"
+                    regressions.append(f"{name}.{metric}")
+            print(f"  {metric:<32} {before!s:>14} {after!s:>14}  {verdict}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as old_file, open(args.new) as new_file:
+        regressions = compare(json.load(old_file), json.load(new_file), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
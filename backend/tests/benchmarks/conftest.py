@@ -0,0 +1,192 @@
+"""
+Shared fixtures for performance benchmarks.
+
+Benchmarks are slow and timing-sensitive, so they are skipped unless
+RUN_BENCHMARKS=1 is set:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+
+Every run writes its measurements (bench_results.record) together with
+the commit and BENCH_* parameters to
+$BENCH_RESULTS_DIR/<timestamp>-<commit>.json (default benchmark-results/).
+Compare two runs with:
+
+    python -m tests.benchmarks.compare OLD.json NEW.json
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+from pathlib import Path
+
+import pytest
+import uvicorn
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from tests.benchmarks.fake_upstreams import from_environment, gemini_app, youtube_app
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with RUN_BENCHMARKS=1")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def tls_cert(tmp_path_factory):
+    """Self-signed certificate for localhost, so stubs pay a real TLS handshake."""
+    directory = tmp_path_factory.mktemp("tls")
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = directory / "cert.pem"
+    key_file = directory / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return str(cert_file), str(key_file)
+
+
+async def serve(app, port: int, tls_cert=None):
+    """Run an ASGI app with uvicorn in the current loop; returns (server, task)."""
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        ssl_certfile=tls_cert[0] if tls_cert else None,
+        ssl_keyfile=tls_cert[1] if tls_cert else None,
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+@pytest.fixture
+async def stub_server(tls_cert):
+    """Minimal HTTPS JSON endpoint standing in for an upstream API."""
+    async def videos(request):
+        return JSONResponse({"kind": "youtube#videoListResponse", "items": []})
+
+    app = Starlette(routes=[Route("/videos", videos)])
+    port = free_port()
+    server, task = await serve(app, port, tls_cert)
+    yield f"https://localhost:{port}"
+    server.should_exit = True
+    await task
+
+
+class BenchmarkResults:
+    """Measurements of one benchmark run, by benchmark name."""
+
+    def __init__(self):
+        self.results: dict[str, dict] = {}
+
+    def record(self, name: str, **metrics) -> None:
+        self.results[name] = {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in metrics.items()
+        }
+        print(f"\n{name}: " + ", ".join(f"{key}={value}" for key, value in self.results[name].items()))
+
+    def write(self, directory: Path) -> Path:
+        commit = _git("rev-parse", "HEAD") or "unknown"
+        started = datetime.datetime.now(datetime.timezone.utc)
+        document = {
+            "meta": {
+                "commit": commit,
+                "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+                "created_at": started.isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "parameters": {key: value for key, value in sorted(os.environ.items()) if key.startswith("BENCH_")},
+            },
+            "results": self.results,
+        }
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{started:%Y%m%d-%H%M%S}-{commit[:12]}.json"
+        path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        return path
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def latency_summary(samples: list[float]) -> dict[str, float]:
+    """Median/p95/max in milliseconds of durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[round(0.95 * (len(ordered) - 1))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+@pytest.fixture(scope="session")
+def bench_results():
+    """Collects measurements; written to BENCH_RESULTS_DIR when the session ends."""
+    results = BenchmarkResults()
+    yield results
+    if results.results:
+        path = results.write(Path(os.environ.get("BENCH_RESULTS_DIR", "benchmark-results")))
+        print(f"\nBenchmark results written to {path}")
+
+
+@pytest.fixture
+async def fake_upstreams(monkeypatch):
+    """
+    Fake YouTube and Gemini servers (see fake_upstreams.py); the worker's
+    upstream clients are pointed at them. Yields (youtube, gemini).
+    """
+    from app.core.config import settings
+
+    youtube, gemini = from_environment()
+    servers = []
+    for name, app in (("youtube", youtube_app(youtube)), ("gemini", gemini_app(gemini))):
+        port = free_port()
+        servers.append(await serve(app, port))
+        monkeypatch.setattr(settings, f"{name}_api_base_url", f"http://127.0.0.1:{port}")
+    yield youtube, gemini
+    for server, task in servers:
+        server.should_exit = True
+        await task
@@ -0,0 +1,104 @@
+"""
+Local stand-ins for the YouTube Data API and Gemini.
+
+Both answer with realistic payloads after a configurable latency (mean,
+uniformly jittered by +-50%) and fail a configurable share of requests
+the way the real services signal overload (YouTube 503, Gemini 429).
+Randomness is seeded so runs are comparable.
+
+    BENCH_YOUTUBE_LATENCY_MS   default 50
+    BENCH_GEMINI_LATENCY_MS    default 200
+    BENCH_UPSTREAM_ERROR_RATE  default 0.01 (0..1, both upstreams)
+"""
+
+import asyncio
+import json
+import os
+import random
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+GEMINI_MODEL = "gemini-1.5-flash"
+
+
+class FakeUpstream:
+    """Latency and error injection shared by the fake endpoints."""
+
+    def __init__(self, latency_ms: float, error_rate: float, error_status: int, seed: int):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+
+    async def delay(self) -> JSONResponse | None:
+        """Sleep like the real service; returns an error response to send instead, if any."""
+        self.requests += 1
+        await asyncio.sleep(self.latency * self._random.uniform(0.5, 1.5))
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return JSONResponse({"error": {"code": self.error_status}}, status_code=self.error_status)
+        return None
+
+
+def youtube_app(upstream: FakeUpstream) -> Starlette:
+    """GET /videos?part=snippet,contentDetails&id=... (videos.list)."""
+
+    async def videos(request: Request):
+        error = await upstream.delay()
+        if error is not None:
+            return error
+        ids = [video_id for video_id in request.query_params.get("id", "").split(",") if video_id]
+        return JSONResponse({
+            "kind": "youtube#videoListResponse",
+            "items": [
+                {
+                    "kind": "youtube#video",
+                    "id": video_id,
+                    "snippet": {
+                        "title": f"Video {video_id}",
+                        "description": "Lorem ipsum " * 40,
+                        "channelTitle": "Benchmark Channel",
+                        "publishedAt": "2024-01-01T00:00:00Z",
+                        "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                    },
+                    "contentDetails": {"duration": "PT12M34S"},
+                }
+                for video_id in ids
+            ],
+            "pageInfo": {"totalResults": len(ids), "resultsPerPage": len(ids)},
+        })
+
+    return Starlette(routes=[Route("/videos", videos)])
+
+
+def gemini_app(upstream: FakeUpstream) -> Starlette:
+    """POST /models/{model}:generateContent."""
+
+    async def generate_content(request: Request):
+        await request.body()
+        error = await upstream.delay()
+        if error is not None:
+            return error
+        extracted = {"summary": "A video about benchmarks.", "topics": ["performance", "testing"], "rating": 4}
+        return JSONResponse({
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": json.dumps(extracted)}]},
+                "finishReason": "STOP",
+            }],
+            "usageMetadata": {"promptTokenCount": 1200, "candidatesTokenCount": 80},
+        })
+
+    return Starlette(routes=[Route("/models/{model}:generateContent", generate_content, methods=["POST"])])
+
+
+def from_environment(seed: int = 0) -> tuple[FakeUpstream, FakeUpstream]:
+    """(youtube, gemini) configured from the BENCH_* variables."""
+    error_rate = float(os.environ.get("BENCH_UPSTREAM_ERROR_RATE", "0.01"))
+    youtube = FakeUpstream(float(os.environ.get("BENCH_YOUTUBE_LATENCY_MS", "50")), error_rate, 503, seed)
+    gemini = FakeUpstream(float(os.environ.get("BENCH_GEMINI_LATENCY_MS", "200")), error_rate, 429, seed + 1)
+    return youtube, gemini
@@ -0,0 +1,142 @@
+"""
+Benchmark: API endpoints at scale.
+
+Runs against the test database through the regular `client` fixture
+(in-process ASGI, no network) and records into bench_results:
+
+- bulk CSV ingest of BENCH_CSV_ROWS rows (comma-separated sizes)
+- list/video reads and CSV export of a list with BENCH_LIST_VIDEOS videos
+- progress-history paging over BENCH_PROGRESS_EVENTS events
+
+    RUN_BENCHMARKS=1 BENCH_CSV_ROWS=1000,10000,100000 pytest tests/benchmarks/test_api_throughput.py -s
+"""
+
+import io
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.job import ProcessingJob
+from app.models.job_progress import JobProgressEvent
+from app.models.list import BookmarkList
+from app.models.video import Video
+from tests.benchmarks.conftest import latency_summary
+
+CSV_ROWS = [int(rows) for rows in os.environ.get("BENCH_CSV_ROWS", "1000,10000,100000").split(",")]
+LIST_VIDEOS = int(os.environ.get("BENCH_LIST_VIDEOS", "5000"))
+PROGRESS_EVENTS = int(os.environ.get("BENCH_PROGRESS_EVENTS", "10000"))
+ROUNDS = 20
+
+
+def youtube_id(n: int) -> str:
+    return f"b{n:010d}"
+
+
+async def timed_requests(call, rounds: int = ROUNDS) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = await call()
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return samples
+
+
+@pytest.fixture
+async def large_list(test_db, test_user) -> BookmarkList:
+    """A list with LIST_VIDEOS videos, inserted in one statement."""
+    bookmark_list = BookmarkList(name="Benchmark List", user_id=test_user.id)
+    test_db.add(bookmark_list)
+    await test_db.commit()
+    await test_db.execute(insert(Video), [
+        {"list_id": bookmark_list.id, "youtube_id": youtube_id(n), "processing_status": "pending"}
+        for n in range(LIST_VIDEOS)
+    ])
+    await test_db.commit()
+    return bookmark_list
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rows", CSV_ROWS)
+async def test_bulk_csv_ingest(client, test_db, test_user, monkeypatch, bench_results, rows):
+    monkeypatch.setattr("app.api.videos.get_arq_pool", AsyncMock(return_value=AsyncMock()))
+    bookmark_list = BookmarkList(name=f"Bulk {rows}", user_id=test_user.id)
+    test_db.add(bookmark_list)
+    await test_db.commit()
+
+    csv_content = "url\n" + "\n".join(f"https://www.youtube.com/watch?v={youtube_id(n)}" for n in range(rows))
+
+    start = time.perf_counter()
+    response = await client.post(
+        f"/api/lists/{bookmark_list.id}/videos/bulk",
+        files={"file": ("videos.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+    )
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 201
+    assert response.json()["created_count"] == rows
+    bench_results.record(
+        f"bulk_csv_ingest[{rows}]",
+        rows=rows,
+        duration_s=elapsed,
+        rows_per_second=rows / elapsed,
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_endpoints(client, large_list, bench_results):
+    endpoints = {
+        "get_lists": "/api/lists",
+        "get_list": f"/api/lists/{large_list.id}",
+        "get_videos": f"/api/lists/{large_list.id}/videos",
+        "export_csv": f"/api/lists/{large_list.id}/export/csv",
+    }
+    for name, url in endpoints.items():
+        samples = await timed_requests(lambda: client.get(url))
+        bench_results.record(f"{name}[{LIST_VIDEOS}]", videos=LIST_VIDEOS, **latency_summary(samples))
+
+
+@pytest.mark.asyncio
+async def test_progress_history_paging(client, test_db, test_list, test_user, bench_results):
+    job = ProcessingJob(list_id=test_list.id, total_videos=PROGRESS_EVENTS, status="running")
+    test_db.add(job)
+    await test_db.commit()
+    started = datetime.now(timezone.utc) - timedelta(hours=1)
+    await test_db.execute(insert(JobProgressEvent), [
+        {
+            "job_id": job.id,
+            "created_at": started + timedelta(milliseconds=n),
+            "progress_data": {"progress": n * 100 // PROGRESS_EVENTS, "current_video": n},
+        }
+        for n in range(PROGRESS_EVENTS)
+    ])
+    await test_db.commit()
+
+    params = {"user_id": str(test_user.id), "limit": 1000}
+    pages, received = [], 0
+    total_start = time.perf_counter()
+    while True:
+        start = time.perf_counter()
+        response = await client.get(f"/api/jobs/{job.id}/progress-history", params=params)
+        pages.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        received += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    elapsed = time.perf_counter() - total_start
+
+    assert received == PROGRESS_EVENTS
+    bench_results.record(
+        f"progress_history_paging[{PROGRESS_EVENTS}]",
+        events=PROGRESS_EVENTS,
+        pages=len(pages),
+        duration_s=elapsed,
+        events_per_second=PROGRESS_EVENTS / elapsed,
+        **latency_summary(pages),
+    )
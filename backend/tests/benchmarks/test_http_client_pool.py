@@ -0,0 +1,57 @@
+"""
+Benchmark: pooled upstream client vs. a new client per call.
+
+A naive implementation opens a new connection (TCP + TLS handshake) for
+every outbound call. The worker instead keeps one pooled client per
+upstream, created in WorkerSettings.on_startup.
+"""
+
+import statistics
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.workers.upstream import create_http_clients, close_http_clients
+
+REQUESTS = 200
+
+
+async def timed(call) -> float:
+    start = time.perf_counter()
+    response = await call()
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reduces_per_request_latency(stub_server, tls_cert, monkeypatch, bench_results):
+    # Trust the stub's self-signed certificate
+    monkeypatch.setenv("SSL_CERT_FILE", tls_cert[0])
+    monkeypatch.setattr(settings, "youtube_api_base_url", stub_server)
+
+    # Naive: new client (and connection) per request
+    async def new_client_call():
+        async with httpx.AsyncClient(base_url=stub_server) as client:
+            return await client.get("/videos")
+
+    naive = [await timed(new_client_call) for _ in range(REQUESTS)]
+
+    # Pooled: the worker's shared client, connection reused
+    clients = create_http_clients()
+    try:
+        youtube = clients["youtube"]
+        pooled = [await timed(lambda: youtube.get("/videos")) for _ in range(REQUESTS)]
+    finally:
+        await close_http_clients(clients)
+
+    naive_median = statistics.median(naive) * 1000
+    pooled_median = statistics.median(pooled) * 1000
+    bench_results.record(
+        f"http_client_pool[{REQUESTS}]",
+        new_client_median_ms=naive_median,
+        pooled_median_ms=pooled_median,
+    )
+
+    assert pooled_median < naive_median
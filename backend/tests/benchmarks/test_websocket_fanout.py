@@ -0,0 +1,96 @@
+"""
+Benchmark: WebSocket fan-out through the in-process progress hub.
+
+Connects N local WebSocket clients (one user each) to the real app served
+by uvicorn, publishes progress events for every user and measures:
+
+- Redis connections opened per WebSocket (the hub needs none)
+- memory per connection (client and server side, same process)
+- publish-to-receive latency
+
+    RUN_BENCHMARKS=1 BENCH_WS_CLIENTS=1000 pytest tests/benchmarks/test_websocket_fanout.py -s
+"""
+
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+import websockets
+
+from app.core.config import settings
+from app.core.progress_stream import progress_channel
+from app.main import app
+from tests.benchmarks.conftest import free_port, latency_summary, serve
+
+CLIENTS = int(os.environ.get("BENCH_WS_CLIENTS", "200"))
+ROUNDS = 10
+
+
+async def redis_connections(client: redis.Redis) -> int:
+    # Raw CLIENT LIST (one line per connection) rather than the parsed reply
+    return len((await client.execute_command("CLIENT", "LIST")).splitlines())
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout(monkeypatch, bench_results):
+    users = {}
+
+    async def fake_auth(websocket, token):
+        # The token is the user id, so each socket belongs to its own user
+        return users.setdefault(token, SimpleNamespace(id=token))
+
+    monkeypatch.setattr("app.api.websocket.get_current_ws_user", fake_auth)
+
+    port = free_port()
+    server, task = await serve(app, port)
+    monitor = redis.from_url(settings.redis_url, decode_responses=True)
+    sockets = []
+    try:
+        connections_before = await redis_connections(monitor)
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+
+        user_ids = [str(uuid4()) for _ in range(CLIENTS)]
+        for user_id in user_ids:
+            sockets.append(await websockets.connect(f"ws://127.0.0.1:{port}/api/ws/progress?token={user_id}"))
+        # Let the endpoints register with the hub
+        await asyncio.sleep(0.5)
+
+        memory_per_socket = (tracemalloc.get_traced_memory()[0] - memory_before) / CLIENTS
+        tracemalloc.stop()
+        extra_connections = await redis_connections(monitor) - connections_before
+
+        latencies = []
+        for round_number in range(ROUNDS):
+            pipe = monitor.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.publish(progress_channel(user_id), json.dumps({"job_id": user_id, "progress": round_number}))
+            sent_at = time.perf_counter()
+            await pipe.execute()
+
+            messages = await asyncio.gather(*(ws.recv() for ws in sockets))
+            received_at = time.perf_counter()
+            assert all(json.loads(m)["progress"] == round_number for m in messages)
+            latencies.append(received_at - sent_at)
+
+        bench_results.record(
+            f"websocket_fanout[{CLIENTS}]",
+            clients=CLIENTS,
+            extra_redis_connections=extra_connections,
+            memory_per_connection_kib=memory_per_socket / 1024,
+            **latency_summary(latencies),
+        )
+
+        # Per-socket subscriptions would need one Redis connection each
+        assert extra_connections < CLIENTS / 10
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+        await monitor.aclose()
+        server.should_exit = True
+        await task
@@ -0,0 +1,125 @@
+"""
+Benchmark: process_video_list throughput against fake upstreams.
+
+Runs BENCH_WORKER_JOBS jobs of BENCH_WORKER_VIDEOS videos concurrently,
+the way one worker process would (shared limiters, pooled clients and
+ProgressSink; real Redis at settings.redis_url, the test database), with
+YouTube and Gemini replaced by the local fakes in fake_upstreams.py.
+
+process_video itself is still a stub, so each video makes the calls the
+finished pipeline will make: one videos.list and one generateContent
+request through call_upstream.
+
+    RUN_BENCHMARKS=1 BENCH_GEMINI_LATENCY_MS=500 pytest tests/benchmarks/test_worker_throughput.py -s
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+import redis.asyncio as redis
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.models.job import ProcessingJob
+from app.models.list import BookmarkList
+from app.models.video import Video
+from app.workers import video_processor
+from app.workers.progress_sink import ProgressSink
+from app.workers.upstream import call_upstream, close_http_clients, create_http_clients, create_limiters
+from tests.benchmarks.fake_upstreams import GEMINI_MODEL
+
+JOBS = int(os.environ.get("BENCH_WORKER_JOBS", "10"))
+VIDEOS_PER_JOB = int(os.environ.get("BENCH_WORKER_VIDEOS", "50"))
+
+
+async def process_video(ctx: dict, video_id: str, list_id: str, schema: dict) -> dict:
+    """The upstream traffic of one video in the finished pipeline."""
+
+    async def fetch_metadata(client):
+        response = await client.get("/videos", params={"part": "snippet,contentDetails", "id": video_id})
+        response.raise_for_status()
+        return response.json()
+
+    async def extract(client):
+        response = await client.post(
+            f"/models/{GEMINI_MODEL}:generateContent",
+            json={"contents": [{"parts": [{"text": f"Summarize video {video_id}"}]}]}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    await call_upstream(ctx, "youtube", "videos.list", fetch_metadata)
+    await call_upstream(ctx, "gemini", "generate_content", extract)
+    return {"status": "success", "video_id": video_id}
+
+
+@pytest.mark.asyncio
+async def test_process_video_list_throughput(
+    fake_upstreams, test_db, test_user, mock_session_factory, monkeypatch, bench_results
+):
+    monkeypatch.setattr(video_processor, "AsyncSessionLocal", mock_session_factory)
+    monkeypatch.setattr(video_processor, "process_video", process_video)
+
+    jobs = []
+    for n in range(JOBS):
+        bookmark_list = BookmarkList(name=f"Worker benchmark {n}", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=VIDEOS_PER_JOB, status="running")
+        test_db.add(job)
+        await test_db.commit()
+        video_ids = (await test_db.execute(
+            insert(Video).returning(Video.id),
+            [
+                {"list_id": bookmark_list.id, "youtube_id": f"w{n:04d}{v:06d}", "processing_status": "pending"}
+                for v in range(VIDEOS_PER_JOB)
+            ]
+        )).scalars().all()
+        await test_db.commit()
+        jobs.append((str(job.id), str(bookmark_list.id), [str(video_id) for video_id in video_ids]))
+
+    redis_client = redis.from_url(settings.redis_url)
+    # What WorkerSettings.on_startup shares between the jobs of a worker
+    shared = {
+        "redis": redis_client,
+        "limiters": create_limiters(),
+        "http_clients": create_http_clients(),
+        "progress_sink": ProgressSink(redis_client, mock_session_factory),
+    }
+    shared["progress_sink"].start()
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            video_processor.process_video_list(dict(shared), job_id, list_id, video_ids)
+            for job_id, list_id, video_ids in jobs
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        await shared["progress_sink"].close()
+        await close_http_clients(shared["http_clients"])
+        await redis_client.aclose()
+
+    videos = JOBS * VIDEOS_PER_JOB
+    processed = sum(result["processed"] for result in results)
+    failed = sum(result["failed"] for result in results)
+    assert processed + failed == videos
+
+    statuses = (await test_db.execute(
+        select(Video.processing_status).where(Video.list_id.in_([list_id for _, list_id, _ in jobs]))
+    )).scalars().all()
+    assert "pending" not in statuses
+
+    youtube, gemini = fake_upstreams
+    bench_results.record(
+        f"process_video_list[{JOBS}x{VIDEOS_PER_JOB}]",
+        videos=videos,
+        failed=failed,
+        duration_s=elapsed,
+        videos_per_second=videos / elapsed,
+        youtube_requests=youtube.requests,
+        gemini_requests=gemini.requests,
+        youtube_concurrency=shared["limiters"]["youtube"].limit,
+        gemini_concurrency=shared["limiters"]["gemini"].limit,
+    )
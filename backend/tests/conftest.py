@@ -1,10 +1,16 @@
+import itertools
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.core.database import get_db
+from app.core import database
+from app.core.database import get_db, normalize_sql
+from app.core.redis import close_arq_pool, close_redis_client
 from app.models import Base
 from app.models.list import BookmarkList
 from app.models.video import Video
@@ -12,6 +18,56 @@ from app.models.user import User
 from app.core.config import settings
 
 
+class MockPipeline:
+    """
+    Stand-in for a redis-py pipeline on a mocked client.
+
+    Queues commands and replays them on the client's (async) mocks on
+    execute(), so tests can keep asserting on e.g. `mock_redis.publish`.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return command
+
+    async def execute(self):
+        commands, self._commands = self._commands, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class StatementRecorder:
+    """
+    SQL statements sent through the test engine, for query budgets.
+
+    Usage:
+        with sql_statements.expect(2):
+            response = await client.get(...)
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    @contextmanager
+    def expect(self, count: int):
+        """Assert that the enclosed code issues exactly `count` statements."""
+        start = len(self.statements)
+        yield
+        issued = self.statements[start:]
+        assert len(issued) == count, (
+            f"Expected {count} SQL statements, got {len(issued)}:\n"
+            + "\n".join(normalize_sql(statement) for statement in issued)
+        )
+
+
 # Test database URL
 # Replace the database name in the URL with _test suffix
 TEST_DATABASE_URL = settings.database_url.rsplit('/', 1)[0] + '/youtube_bookmarks_test'
@@ -37,6 +93,15 @@ async def test_engine():
     await engine.dispose()
 
 
+@pytest.fixture
+def sql_statements(test_engine):
+    """Record the SQL statements of the test (see StatementRecorder)."""
+    recorder = StatementRecorder()
+    event.listen(test_engine.sync_engine, "before_cursor_execute", recorder)
+    yield recorder
+    event.remove(test_engine.sync_engine, "before_cursor_execute", recorder)
+
+
 @pytest.fixture
 async def test_db(test_engine):
     """Create a test database session."""
@@ -56,18 +121,34 @@ async def test_db(test_engine):
 
 
 @pytest.fixture
-async def client(test_db):
-    """Create test client with database override."""
+async def client(test_db, test_engine):
+    """
+    Create test client with database override.
+
+    Writes share the test's session; read-only handlers keep their own
+    autocommit sessions (get_read_db), bound to the test database.
+    """
     async def override_get_db():
         yield test_db
 
     app.dependency_overrides[get_db] = override_get_db
 
+    read_factories = (database.ReadSessionLocal, database.PrimaryReadSessionLocal)
+    binds = [factory.kw["bind"] for factory in read_factories]
+    for factory in read_factories:
+        factory.configure(bind=test_engine.execution_options(isolation_level="AUTOCOMMIT"))
+
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
     app.dependency_overrides.clear()
+    for factory, bind in zip(read_factories, binds):
+        factory.configure(bind=bind)
+
+    # Redis singletons are bound to this test's event loop
+    await close_arq_pool()
+    await close_redis_client()
 
 
 @pytest.fixture
@@ -117,9 +198,12 @@ async def test_video(test_db: AsyncSession, test_list: BookmarkList) -> Video:
 @pytest.fixture
 async def mock_redis():
     """Mock Redis client for testing."""
-    from unittest.mock import AsyncMock
+    from unittest.mock import AsyncMock, MagicMock
     redis_mock = AsyncMock()
     redis_mock.publish = AsyncMock(return_value=1)
+    stream_ids = itertools.count(1)
+    redis_mock.xadd = AsyncMock(side_effect=lambda *args, **kwargs: f"{next(stream_ids)}-0")
+    redis_mock.pipeline = MagicMock(side_effect=lambda *args, **kwargs: MockPipeline(redis_mock))
     return redis_mock
 
 
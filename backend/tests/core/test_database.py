@@ -0,0 +1,165 @@
+"""
+Tests for the database engine profiles.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import create_engine, engine_options
+from tests.conftest import TEST_DATABASE_URL
+
+
+def test_profiles_use_their_own_pool_settings():
+    api = engine_options("api")
+    worker = engine_options("worker")
+
+    assert (api["pool_size"], api["max_overflow"]) == (settings.db_api_pool_size, settings.db_api_max_overflow)
+    assert (worker["pool_size"], worker["max_overflow"]) == (settings.db_worker_pool_size, settings.db_worker_max_overflow)
+    assert api["pool_pre_ping"] and api["pool_recycle"] == settings.db_pool_recycle
+    assert worker["connect_args"]["server_settings"]["statement_timeout"] == str(settings.db_worker_statement_timeout)
+
+
+@pytest.mark.asyncio
+async def test_engine_applies_server_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_api_statement_timeout", 1234)
+    monkeypatch.setattr(settings, "db_idle_in_transaction_session_timeout", 5678)
+    engine = create_engine("api", TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            assert await conn.scalar(text("SHOW statement_timeout")) == "1234ms"
+            assert await conn.scalar(text("SHOW idle_in_transaction_session_timeout")) == "5678ms"
+            assert await conn.scalar(text("SHOW application_name")) == "youtube-bookmarks-api"
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_db_uses_primary_after_a_write(monkeypatch):
+    from types import SimpleNamespace
+    from app.core import database
+
+    primary_session, replica_session = object(), object()
+
+    class Factory:
+        def __init__(self, session):
+            self.session = session
+
+        def __call__(self):
+            return self
+
+        async def __aenter__(self):
+            return self.session
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(database, "PrimaryReadSessionLocal", Factory(primary_session))
+    monkeypatch.setattr(database, "ReadSessionLocal", Factory(replica_session))
+
+    async def session_for(cookies):
+        return await database.get_read_db(SimpleNamespace(cookies=cookies)).__anext__()
+
+    assert await session_for({}) is replica_session
+    assert await session_for({database.PRIMARY_STICKY_COOKIE: "1"}) is primary_session
+
+
+@pytest.mark.asyncio
+async def test_read_sessions_do_not_open_transactions():
+    import asyncio
+    from app.core.database import read_sessionmaker
+
+    # ReadSessionLocal and PrimaryReadSessionLocal are made the same way
+    engine = create_engine("api", TEST_DATABASE_URL)
+    try:
+        async with read_sessionmaker(engine)() as session:
+            first = await session.scalar(text("SELECT now()"))
+            await asyncio.sleep(0.01)
+            # Inside a transaction now() would stay at its start
+            assert await session.scalar(text("SELECT now()")) > first
+            assert await session.scalar(text("SELECT txid_current_if_assigned()")) is None
+    finally:
+        await engine.dispose()
+
+
+def test_successful_writes_mark_client_sticky(monkeypatch):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.testclient import TestClient
+    from app.core import database
+
+    # Pretend a replica is configured
+    monkeypatch.setattr(database, "read_engine", object())
+    app = FastAPI()
+    app.add_middleware(database.ReadYourWritesMiddleware)
+
+    @app.get("/items")
+    async def read_items():
+        return []
+
+    @app.post("/items")
+    async def create_item():
+        return {}
+
+    @app.delete("/items")
+    async def delete_items():
+        raise HTTPException(status_code=404)
+
+    client = TestClient(app)
+    assert database.PRIMARY_STICKY_COOKIE not in client.get("/items").cookies
+    assert database.PRIMARY_STICKY_COOKIE not in client.delete("/items").cookies
+    assert client.post("/items").cookies[database.PRIMARY_STICKY_COOKIE] == "1"
+
+
+def test_normalize_sql_collapses_literals_and_parameter_lists():
+    from app.core.database import normalize_sql
+
+    assert normalize_sql(
+        "SELECT videos.id\n  FROM videos\n WHERE videos.id IN ($1::UUID, $2::UUID, $3::UUID) AND title = 'x' LIMIT 10"
+    ) == "SELECT videos.id FROM videos WHERE videos.id IN ($?::UUID, ...) AND title = ? LIMIT ?"
+
+
+@pytest.mark.asyncio
+async def test_requests_report_their_queries(monkeypatch, caplog):
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from app.core.database import QueryTimingMiddleware, query_stats
+
+    monkeypatch.setattr(settings, "db_slow_query_threshold", 20)
+    engine = create_engine("api", TEST_DATABASE_URL)
+    app = FastAPI()
+    app.add_middleware(QueryTimingMiddleware)
+
+    @app.get("/items")
+    async def read_items():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT pg_sleep(0.03)"))
+        return []
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items")
+    finally:
+        await engine.dispose()
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
+    assert float(response.headers["server-timing"].split(";")[1][4:]) >= 30
+    assert query_stats.get() is None
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert len(slow) == 1 and slow[0].endswith("SELECT pg_sleep(?)")
+
+
+@pytest.mark.asyncio
+async def test_pool_checkouts_are_timed():
+    from prometheus_client import REGISTRY
+
+    before = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+    engine = create_engine("api", TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") == before + 1
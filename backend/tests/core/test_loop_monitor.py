@@ -0,0 +1,52 @@
+"""
+Tests for the event-loop lag monitor.
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.loop_monitor import LoopLagMonitor
+
+
+async def _parse_huge_csv():
+    # Stands in for CPU work on the event loop
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_measured_and_sampled(caplog):
+    caplog.set_level(logging.WARNING, logger="app.core.loop_monitor")
+    stalls = REGISTRY.get_sample_value("event_loop_stalls_total") or 0
+    lag_sum = REGISTRY.get_sample_value("event_loop_lag_seconds_sum") or 0
+
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await asyncio.create_task(_parse_huge_csv(), name="bulk-upload")
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.close()
+
+    assert not monitor.running
+    # One stall, one stack sample
+    assert REGISTRY.get_sample_value("event_loop_stalls_total") == stalls + 1
+    assert REGISTRY.get_sample_value("event_loop_lag_seconds_sum") - lag_sum >= 0.2
+    [record] = [r for r in caplog.records if r.name == "app.core.loop_monitor"]
+    message = record.getMessage()
+    assert "running task bulk-upload (_parse_huge_csv)" in message
+    assert "time.sleep(0.3)" in message
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_logs_nothing(caplog):
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.close()
+
+    assert not [r for r in caplog.records if r.name == "app.core.loop_monitor"]
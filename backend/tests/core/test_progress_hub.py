@@ -0,0 +1,163 @@
+"""
+Tests for the in-process WebSocket fan-out hub.
+
+Uses a real Redis; each test publishes to random user ids.
+"""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.progress_hub import ConnectionQueue, ProgressHub, ProgressMessage
+from app.core.progress_stream import progress_channel
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def hub(redis_client):
+    hub = ProgressHub(redis_client, queue_size=2)
+    await hub.start()
+    yield hub
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_hub_dispatches_to_all_connections_of_a_user(hub, redis_client):
+    alice, bob = uuid4(), uuid4()
+    alice_tab1 = hub.connect(alice)
+    alice_tab2 = hub.connect(alice)
+    bob_queue = hub.connect(bob)
+    assert hub.connection_count == 3
+
+    # One subscription serves every connection
+    published = json.dumps({"job_id": "a", "progress": 50})
+    assert await redis_client.publish(progress_channel(alice), published) == 1
+
+    tab1_message = await asyncio.wait_for(alice_tab1.get(), 1)
+    tab2_message = await asyncio.wait_for(alice_tab2.get(), 1)
+    # Connections share the published text as-is, without re-encoding
+    assert tab1_message.text == published
+    assert tab2_message is tab1_message
+    assert bob_queue.empty()
+
+
+def test_message_parse_keeps_text_and_routing_fields():
+    text = json.dumps({"event_id": "5-0", "job_id": "a", "status": "processing", "progress": 10})
+
+    message = ProgressMessage.parse(text)
+
+    assert message.text == text
+    assert (message.job_id, message.event_id, message.coalescible) == ("a", "5-0", True)
+    with pytest.raises(ValueError):
+        ProgressMessage.parse("[1, 2]")
+    with pytest.raises(ValueError):
+        ProgressMessage.parse("not json")
+
+
+def _put(queue, **progress_data):
+    queue.put(ProgressMessage.from_data(progress_data))
+
+
+def _drain(queue):
+    return [json.loads(queue.get_nowait().text) for _ in range(queue.qsize())]
+
+
+@pytest.mark.asyncio
+async def test_queue_keeps_newest_progress_per_job():
+    queue = ConnectionQueue(maxsize=10, slow_consumer_timeout=10)
+    for progress in (10, 20, 30):
+        _put(queue, job_id="a", status="processing", progress=progress)
+    _put(queue, job_id="b", status="processing", progress=5)
+
+    assert _drain(queue) == [
+        {"job_id": "a", "status": "processing", "progress": 30},
+        {"job_id": "b", "status": "processing", "progress": 5},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queue_never_drops_error_or_final_events():
+    queue = ConnectionQueue(maxsize=2, slow_consumer_timeout=10)
+    _put(queue, job_id="a", status="processing", progress=10, error="Private video")
+    _put(queue, job_id="a", status="processing", progress=20)
+    _put(queue, job_id="a", status="processing", progress=30)
+    _put(queue, job_id="a", status="completed", progress=100)
+
+    assert [m["progress"] for m in _drain(queue)] == [10, 30, 100]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_progress_update():
+    queue = ConnectionQueue(maxsize=2, slow_consumer_timeout=10)
+    for job_id in ("a", "b", "c"):
+        _put(queue, job_id=job_id, status="processing", progress=10)
+
+    assert [m["job_id"] for m in _drain(queue)] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_queue_that_stays_full_flags_slow_consumer(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.core.progress_hub.time.monotonic", lambda: clock[0])
+    queue = ConnectionQueue(maxsize=2, slow_consumer_timeout=5)
+
+    _put(queue, job_id="a", status="processing", progress=10)
+    _put(queue, job_id="b", status="processing", progress=10)
+    assert not queue.slow.is_set()
+
+    # Draining in time resets the timer
+    clock[0] += 4
+    queue.get_nowait()
+    _put(queue, job_id="c", status="processing", progress=10)
+    clock[0] += 4
+    _put(queue, job_id="c", status="processing", progress=20)
+    assert not queue.slow.is_set()
+
+    clock[0] += 2
+    _put(queue, job_id="d", status="processing", progress=10)
+    assert queue.slow.is_set()
+
+
+@pytest.mark.asyncio
+async def test_too_many_final_events_flag_slow_consumer_at_once():
+    queue = ConnectionQueue(maxsize=2, slow_consumer_timeout=10)
+    for job_id in ("a", "b", "c", "d"):
+        _put(queue, job_id=job_id, status="completed", progress=100)
+
+    assert queue.qsize() == 4
+    assert queue.slow.is_set()
+
+
+@pytest.mark.asyncio
+async def test_hub_stops_feeding_slow_consumer(hub):
+    user_id = uuid4()
+    queue = hub.connect(user_id)
+    queue.slow.set()
+
+    hub.dispatch(progress_channel(user_id), json.dumps({"job_id": "a", "progress": 10}))
+
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_stops_delivery(hub):
+    user_id = uuid4()
+    queue = hub.connect(user_id)
+    hub.disconnect(user_id, queue)
+    # Disconnecting twice is harmless
+    hub.disconnect(user_id, queue)
+
+    hub.dispatch(progress_channel(user_id), json.dumps({"progress": 10}))
+
+    assert queue.empty()
+    assert hub.connection_count == 0
@@ -0,0 +1,75 @@
+"""
+Tests for replaying progress events from Redis Streams.
+
+Uses a real Redis with a random user id per test.
+"""
+
+import json
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.progress_stream import parse_event_id, progress_stream, read_progress_since
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def user_id(redis_client):
+    user_id = str(uuid4())
+    yield user_id
+    await redis_client.delete(progress_stream(user_id))
+
+
+async def _append(redis_client, user_id, progress):
+    return await redis_client.xadd(progress_stream(user_id), {"data": json.dumps({"progress": progress})})
+
+
+def test_parse_event_id():
+    assert parse_event_id("1700000000000-3") == (1700000000000, 3)
+    assert parse_event_id("1700000000000-3") < parse_event_id("1700000000001-0")
+    with pytest.raises(ValueError):
+        parse_event_id("not-an-id")
+
+
+@pytest.mark.asyncio
+async def test_read_progress_since_returns_newer_events(redis_client, user_id):
+    first = await _append(redis_client, user_id, 10)
+    second = await _append(redis_client, user_id, 20)
+    third = await _append(redis_client, user_id, 30)
+
+    events, complete = await read_progress_since(redis_client, user_id, first)
+
+    assert complete
+    assert events == [
+        {"event_id": second, "progress": 20},
+        {"event_id": third, "progress": 30},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_progress_since_detects_trimmed_stream(redis_client, user_id):
+    first = await _append(redis_client, user_id, 10)
+    await _append(redis_client, user_id, 20)
+    await _append(redis_client, user_id, 30)
+    await redis_client.xtrim(progress_stream(user_id), maxlen=1, approximate=False)
+
+    events, complete = await read_progress_since(redis_client, user_id, first)
+
+    assert not complete
+    assert [e["progress"] for e in events] == [30]
+
+
+@pytest.mark.asyncio
+async def test_read_progress_since_expired_stream(redis_client, user_id):
+    events, complete = await read_progress_since(redis_client, user_id, "1-0")
+
+    assert events == []
+    assert not complete
@@ -0,0 +1,108 @@
+"""
+Tests for the Redis-backed upstream quota tracker.
+
+Uses a real Redis with a unique key prefix per test.
+"""
+
+import time
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.quota import QuotaTracker, QuotaExceededError, cost_of
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def tracker(redis_client):
+    prefix = f"test-quota-{uuid4()}"
+    yield QuotaTracker(redis_client, prefix=prefix)
+    keys = await redis_client.keys(f"{prefix}:*")
+    if keys:
+        await redis_client.delete(*keys)
+
+
+def test_cost_of_unknown_class():
+    assert cost_of("youtube", "videos.list") == 1
+    with pytest.raises(ValueError):
+        cost_of("youtube", "unknown.method")
+
+
+@pytest.mark.asyncio
+async def test_acquire_consumes_daily_budget(tracker, monkeypatch):
+    monkeypatch.setattr(settings, "youtube_daily_quota", 250)
+
+    await tracker.acquire("youtube", "search.list")  # 100 units
+    await tracker.acquire("youtube", "search.list")  # 200 units
+
+    assert await tracker.has_quota("youtube", 50)
+    assert not await tracker.has_quota("youtube", 51)
+
+    # Third search would exceed the budget: nothing is consumed, error raised
+    with pytest.raises(QuotaExceededError) as exc_info:
+        await tracker.acquire("youtube", "search.list")
+    assert exc_info.value.upstream == "youtube"
+    assert exc_info.value.retry_after > 0
+
+    snapshot = {entry["upstream"]: entry for entry in await tracker.snapshot()}
+    assert snapshot["youtube"]["daily_used"] == 200
+    assert snapshot["youtube"]["daily_remaining"] == 50
+    assert snapshot["youtube"]["exhausted"] is False
+
+
+@pytest.mark.asyncio
+async def test_mark_exhausted(tracker, monkeypatch):
+    monkeypatch.setattr(settings, "youtube_daily_quota", 1000)
+
+    await tracker.mark_exhausted("youtube")
+
+    assert not await tracker.has_quota("youtube", 1)
+    snapshot = {entry["upstream"]: entry for entry in await tracker.snapshot()}
+    assert snapshot["youtube"]["exhausted"] is True
+
+
+@pytest.mark.asyncio
+async def test_unlimited_daily_budget(tracker, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_daily_quota", 0)
+
+    await tracker.consume("gemini", 10_000)
+
+    assert await tracker.has_quota("gemini", 10_000)
+    snapshot = {entry["upstream"]: entry for entry in await tracker.snapshot()}
+    assert snapshot["gemini"]["daily_limit"] is None
+
+
+@pytest.mark.asyncio
+async def test_rate_bucket_waits_instead_of_failing(tracker, monkeypatch):
+    monkeypatch.setattr(settings, "youtube_requests_per_second", 20.0)
+
+    # Burst of 20 is immediate, the next 5 must wait for refill (~0.25s)
+    start = time.monotonic()
+    for _ in range(25):
+        await tracker.acquire("youtube", "videos.list")
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_rate_buckets_are_shared_between_trackers(redis_client, tracker, monkeypatch):
+    """Two trackers (= two worker processes) draw from the same bucket."""
+    monkeypatch.setattr(settings, "youtube_requests_per_second", 10.0)
+    other = QuotaTracker(redis_client, prefix=tracker._prefix)
+
+    start = time.monotonic()
+    for i in range(15):
+        await (tracker if i % 2 else other).acquire("youtube", "videos.list")
+    elapsed = time.monotonic() - start
+
+    # 10 burst tokens, remaining 5 refill at 10/s
+    assert elapsed >= 0.4
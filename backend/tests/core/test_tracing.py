@@ -0,0 +1,180 @@
+"""
+Tests for trace propagation from the API through ARQ and the worker back
+to WebSocket delivery.
+
+The in-memory exporter is installed on the process-wide tracer provider,
+which stays installed for the rest of the session.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import WebSocketDisconnect
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+from sqlalchemy import select, text
+
+from app.core.database import create_engine
+from app.core.job_control import enqueue_video_list
+from app.core.progress_hub import ConnectionQueue, ProgressMessage
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import setup_tracing, shutdown_tracing, tracer
+from app.models import ProcessingJob, Video
+from app.models.job_progress import JobProgressEvent
+from tests.conftest import TEST_DATABASE_URL
+
+@pytest.fixture(scope="module")
+def _exporter():
+    exporter = InMemorySpanExporter()
+    setup_tracing("youtube-bookmarks-test", exporter)
+    return exporter
+
+
+@pytest.fixture
+def spans(_exporter):
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+
+def _named(spans, name):
+    return [span for span in spans.get_finished_spans() if span.name == name]
+
+
+class _OneShotWebSocket:
+    """Accepts one message, then behaves like a disconnected client."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        if self.sent:
+            raise WebSocketDisconnect()
+        self.sent.append(text)
+
+
+@pytest.mark.asyncio
+async def test_trace_follows_job_from_enqueue_to_websocket(spans, test_db, test_list, mock_redis, mock_session_factory):
+    from app.api.websocket import _forward
+    from app.workers.video_processor import process_video_list
+
+    job = ProcessingJob(list_id=test_list.id, total_videos=2, status="running")
+    videos = [Video(list_id=test_list.id, youtube_id=f"trace{i:06d}", processing_status="pending") for i in range(2)]
+    test_db.add_all([job, *videos])
+    await test_db.commit()
+    video_ids = [str(video.id) for video in videos]
+
+    # API: the request enqueues the job
+    arq_pool = AsyncMock()
+    arq_pool.enqueue_job = AsyncMock(return_value=None)
+    with tracer.start_as_current_span("POST /api/lists/{list_id}/videos/bulk") as request_span:
+        await enqueue_video_list(arq_pool, str(job.id), str(test_list.id), video_ids)
+    trace_id = request_span.get_span_context().trace_id
+    trace_context = arq_pool.enqueue_job.await_args.kwargs["trace_context"]
+    assert f"{trace_id:032x}" in trace_context["traceparent"]
+
+    # Worker: the job continues the trace and passes it on in its events
+    with patch("app.workers.video_processor.AsyncSessionLocal", mock_session_factory):
+        await process_video_list({"redis": mock_redis}, str(job.id), str(test_list.id), video_ids, trace_context=trace_context)
+    published = [json.loads(call.args[1]) for call in mock_redis.publish.await_args_list]
+    assert published and all(f"{trace_id:032x}" in event["trace_context"]["traceparent"] for event in published)
+
+    # API: delivering an event to a WebSocket client closes the loop
+    queue = ConnectionQueue(maxsize=10, slow_consumer_timeout=10)
+    queue.put(ProgressMessage.parse(json.dumps(published[-1])))
+    queue.put(ProgressMessage.parse(json.dumps(published[-1])))
+    websocket = _OneShotWebSocket()
+    await _forward(websocket, queue, None, "user")
+
+    [enqueue] = _named(spans, "arq enqueue process_video_list")
+    [job_span] = _named(spans, "process_video_list")
+    assert job_span.parent.span_id == enqueue.context.span_id
+    assert len(_named(spans, "process_video")) == 2
+    flushes = _named(spans, "progress_sink flush")
+    assert flushes and all(flush.links for flush in flushes)
+    send = _named(spans, "websocket send progress")[0]
+    assert send.parent.span_id == job_span.context.span_id
+    # Trace ids are internal: not sent to clients, not stored for replay or history
+    assert "trace_context" not in json.loads(websocket.sent[0])
+    assert all("trace_context" not in json.loads(call.args[1]["data"]) for call in mock_redis.xadd.await_args_list)
+    result = await test_db.execute(select(JobProgressEvent.progress_data).where(JobProgressEvent.job_id == job.id))
+    assert all("trace_context" not in data for data in result.scalars())
+    for span in [enqueue, job_span, *flushes, send]:
+        assert span.context.trace_id == trace_id
+
+
+@pytest.mark.asyncio
+async def test_http_requests_continue_incoming_trace(spans, client, test_list):
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = await client.get(
+        f"/api/lists/{test_list.id}",
+        headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+    )
+    assert response.status_code == 200
+
+    [span] = _named(spans, "GET /api/lists/{list_id}")
+    assert f"{span.context.trace_id:032x}" == trace_id
+    assert span.attributes["http.route"] == "/api/lists/{list_id}"
+    assert span.attributes["http.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_statements_get_client_spans(spans):
+    engine = create_engine("api", TEST_DATABASE_URL)
+    try:
+        with tracer.start_as_current_span("parent") as parent:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM no_such_table"))
+    finally:
+        await engine.dispose()
+
+    ok, failed = _named(spans, "db SELECT")
+    assert ok.parent.span_id == parent.get_span_context().span_id
+    assert ok.attributes["db.statement"] == "SELECT ?"
+    assert failed.status.status_code == StatusCode.ERROR
+
+
+@pytest.mark.asyncio
+async def test_upstream_calls_pass_the_trace_on(spans):
+    from app.workers.upstream import call_upstream, create_http_clients, create_limiters
+
+    received = []
+
+    def handler(request):
+        received.append(request.headers.get("traceparent"))
+        return httpx.Response(200)
+
+    hooks = create_http_clients()["youtube"].event_hooks
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), event_hooks=hooks)
+    ctx = {"limiters": create_limiters(), "http_clients": {"youtube": client}}
+
+    with tracer.start_as_current_span("job"):
+        await call_upstream(ctx, "youtube", "videos.list", lambda http: http.get("https://youtube.test/videos"))
+    await client.aclose()
+
+    [span] = _named(spans, "youtube videos.list")
+    assert received == [f"00-{span.context.trace_id:032x}-{span.context.span_id:016x}-01"]
+
+
+def test_file_exporter_is_closed_on_shutdown(tmp_path, monkeypatch):
+    trace_file = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_exporter", "file")
+    monkeypatch.setattr(settings, "tracing_file", str(trace_file))
+    # A fresh provider of our own; the global one stays the test exporter's
+    monkeypatch.setattr(tracing, "_provider", None)
+    monkeypatch.setattr(tracing.trace, "set_tracer_provider", lambda provider: None)
+
+    setup_tracing("youtube-bookmarks-test")
+    with tracing._provider.get_tracer("test").start_as_current_span("exported"):
+        pass
+    out = tracing._trace_file
+    shutdown_tracing()
+
+    assert out.closed
+    assert tracing._trace_file is None
+    assert json.loads(trace_file.read_text().splitlines()[0])["name"] == "exported"
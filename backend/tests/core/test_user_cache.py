@@ -0,0 +1,85 @@
+"""
+Tests for the WebSocket authentication user cache.
+
+Uses the test database and a real Redis.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.api.deps import get_current_ws_user
+from app.core import user_cache
+from app.core.config import settings
+from app.core.redis import close_redis_client, get_redis_client
+
+
+@pytest.fixture(autouse=True)
+async def clean_cache():
+    user_cache.clear_local_cache()
+    yield
+    user_cache.clear_local_cache()
+    # The Redis singleton is bound to this test's event loop
+    await close_redis_client()
+
+
+def _token(user) -> str:
+    return jwt.encode({"sub": str(user.id)}, settings.secret_key, algorithm=settings.algorithm)
+
+
+@pytest.mark.asyncio
+async def test_reconnect_is_served_from_cache(test_user, mock_session_factory, monkeypatch):
+    monkeypatch.setattr("app.api.deps.AsyncSessionLocal", mock_session_factory)
+    await get_current_ws_user(AsyncMock(), _token(test_user))
+
+    def no_database():
+        raise AssertionError("database used for a cached user")
+
+    monkeypatch.setattr("app.api.deps.AsyncSessionLocal", no_database)
+    # Served from the local LRU ...
+    user = await get_current_ws_user(AsyncMock(), _token(test_user))
+    assert user.id == test_user.id
+    # ... and, in another process, from Redis
+    user_cache.clear_local_cache()
+    user = await get_current_ws_user(AsyncMock(), _token(test_user))
+    assert (user.id, user.email) == (test_user.id, test_user.email)
+
+    redis_client = await get_redis_client()
+    await redis_client.delete(user_cache.user_cache_key(test_user.id))
+
+
+@pytest.mark.asyncio
+async def test_deactivation_invalidates_cached_user(test_db, test_user, mock_session_factory, monkeypatch):
+    monkeypatch.setattr("app.api.deps.AsyncSessionLocal", mock_session_factory)
+    await user_cache.cache_user(test_user)
+
+    test_user.is_active = False
+    await test_db.commit()
+    await asyncio.gather(*user_cache._pending)
+
+    redis_client = await get_redis_client()
+    assert not await redis_client.exists(user_cache.user_cache_key(test_user.id))
+    assert await user_cache.get_cached_user(str(test_user.id)) is None
+
+    websocket = AsyncMock()
+    with pytest.raises(HTTPException):
+        await get_current_ws_user(websocket, _token(test_user))
+    websocket.close.assert_awaited_once_with(code=1008)
+
+
+@pytest.mark.asyncio
+async def test_local_cache_is_bounded_and_expires(user_factory, monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_size", 2)
+    users = [await user_factory(name) for name in ("a", "b", "c")]
+    for user in users:
+        user_cache._remember_locally(str(user.id), user.email)
+
+    assert list(user_cache._local) == [str(users[1].id), str(users[2].id)]
+
+    clock = [user_cache.time.monotonic() + settings.user_cache_local_ttl + 1]
+    monkeypatch.setattr("app.core.user_cache.time.monotonic", lambda: clock[0])
+    assert await user_cache.get_cached_user(str(users[2].id)) is None
+    assert str(users[2].id) not in user_cache._local
@@ -110,7 +110,7 @@ async def test_progress_with_partial_video_failures(test_db: AsyncSession, test_
 
 
 @pytest.mark.asyncio
-async def test_progress_continues_when_redis_fails(test_db: AsyncSession, test_user: User, mock_session_factory):
+async def test_progress_continues_when_redis_fails(test_db: AsyncSession, test_user: User, mock_redis, mock_session_factory):
     """
     Test that worker continues processing when Redis is unavailable.
 
@@ -120,7 +120,7 @@ async def test_progress_continues_when_redis_fails(test_db: AsyncSession, test_u
     from app.workers.video_processor import process_video_list
 
     # Create mock Redis that fails
-    failing_redis = AsyncMock()
+    failing_redis = mock_redis
     failing_redis.publish = AsyncMock(side_effect=Exception("Redis connection failed"))
 
     with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
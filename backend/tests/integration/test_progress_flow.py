@@ -484,3 +484,85 @@ async def test_throttling_verification(test_db: AsyncSession, test_user: User, m
         throttle_ratio = redis_call_count / 100
         assert throttle_ratio < 0.3, \
             f"Throttle ratio should be < 30% (got {throttle_ratio:.1%}), indicating effective throttling"
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_job_stops_cooperatively(test_db: AsyncSession, test_user: User, client, mock_session_factory):
+    """
+    Cancel a job while an ARQ worker runs it: the worker must finish the
+    current video and stop at its control check, so the counters and the
+    "cancelled" event are persisted (no hard task cancellation).
+    """
+    import asyncio
+    from arq import create_pool
+    from arq.worker import Worker, func
+    from app.core.job_control import enqueue_video_list
+    from app.workers.settings import WorkerSettings
+    from app.workers.video_processor import process_video_list
+
+    bookmark_list = BookmarkList(name="Cancel Test List", user_id=test_user.id)
+    test_db.add(bookmark_list)
+    await test_db.commit()
+    job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+    test_db.add(job)
+    videos = [Video(list_id=bookmark_list.id, youtube_id=f"cancel{i}", processing_status="pending") for i in range(3)]
+    test_db.add_all(videos)
+    await test_db.commit()
+    job_id = job.id
+
+    in_flight = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_process_video(ctx, video_id, list_id, schema):
+        calls.append(video_id)
+        if len(calls) == 2:
+            in_flight.set()
+            await release.wait()
+        return {"status": "success", "video_id": video_id}
+
+    # Own queue, so jobs enqueued by other tests are not picked up
+    queue_name = f"arq:test-{uuid4()}"
+    arq_pool = await create_pool(WorkerSettings.redis_settings, default_queue_name=queue_name)
+    worker = Worker(
+        functions=[func(process_video_list, name="process_video_list")],
+        redis_pool=arq_pool,
+        queue_name=queue_name,
+        burst=True,
+        poll_delay=0.05,
+        allow_abort_jobs=True,
+        handle_signals=False,
+    )
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory), \
+            patch('app.workers.video_processor.process_video', slow_process_video), \
+            patch('arq.worker.log_redis_info', AsyncMock()):  # INFO isn't supported by every test Redis
+        await enqueue_video_list(arq_pool, str(job_id), str(bookmark_list.id), [str(v.id) for v in videos])
+        worker_task = asyncio.create_task(worker.main())
+        try:
+            await asyncio.wait_for(in_flight.wait(), timeout=5)
+
+            response = await client.post(f"/api/jobs/{job_id}/cancel")
+            assert response.status_code == 204
+
+            # Several abort polls of the worker while video 2 is in flight
+            await asyncio.sleep(0.3)
+            release.set()
+            await asyncio.wait_for(worker_task, timeout=5)
+        finally:
+            release.set()
+            await worker.close()
+
+    assert len(calls) == 2
+
+    async with mock_session_factory() as session:
+        stored_job = await session.get(ProcessingJob, job_id)
+        assert stored_job.status == "cancelled"
+        assert stored_job.processed_count == 2
+
+        result = await session.execute(
+            select(JobProgressEvent)
+            .where(JobProgressEvent.job_id == job_id)
+            .order_by(JobProgressEvent.created_at)
+        )
+        events = result.scalars().all()
+    assert events[-1].progress_data["status"] == "cancelled"
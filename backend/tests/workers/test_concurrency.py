@@ -0,0 +1,107 @@
+"""
+Tests for the AIMD limiter used for outbound worker calls.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.metrics import UPSTREAM_CONCURRENCY_LIMIT
+from app.workers.concurrency import AdaptiveLimiter, is_overload
+
+
+def make_status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.test")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_is_overload():
+    assert is_overload(make_status_error(429))
+    assert is_overload(make_status_error(503))
+    assert is_overload(httpx.ReadTimeout("timeout"))
+    assert not is_overload(make_status_error(404))
+    assert not is_overload(httpx.PoolTimeout("no free connection"))
+    assert not is_overload(ValueError("boom"))
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_on_fast_success():
+    limiter = AdaptiveLimiter("test-up", initial=2, maximum=4, target_latency=1.0)
+
+    # One full window of fast successes grows the limit by one slot
+    for _ in range(4):
+        async with limiter.slot():
+            pass
+
+    assert limiter.limit == 3
+    assert UPSTREAM_CONCURRENCY_LIMIT.labels("test-up")._value.get() == 3
+
+
+@pytest.mark.asyncio
+async def test_no_increase_above_target_latency():
+    limiter = AdaptiveLimiter("test-slow", initial=2, maximum=4, target_latency=0.0)
+
+    for _ in range(10):
+        async with limiter.slot():
+            await asyncio.sleep(0.001)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_never_exceeds_maximum():
+    limiter = AdaptiveLimiter("test-max", initial=2, maximum=3, target_latency=1.0)
+
+    for _ in range(50):
+        async with limiter.slot():
+            pass
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_once_per_congestion_event():
+    limiter = AdaptiveLimiter("test-429", initial=8, maximum=16, target_latency=1.0)
+    release = asyncio.Event()
+
+    async def rate_limited_call():
+        async with limiter.slot():
+            await release.wait()
+            raise make_status_error(429)
+
+    # Four concurrent calls all get 429: the window halves only once
+    tasks = [asyncio.create_task(rate_limited_call()) for _ in range(4)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+    # A call started after the decrease can shrink it again
+    with pytest.raises(httpx.ReadTimeout):
+        async with limiter.slot():
+            raise httpx.ReadTimeout("timeout")
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_bounds_in_flight_calls():
+    limiter = AdaptiveLimiter("test-bound", initial=2, maximum=2, target_latency=1.0)
+    peak = 0
+    running = 0
+
+    async def call():
+        nonlocal peak, running
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[call() for _ in range(10)])
+
+    assert peak == 2
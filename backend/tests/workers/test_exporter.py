@@ -0,0 +1,25 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.workers.exporter import sample_queue_depth
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_is_sampled_until_cancelled(monkeypatch):
+    monkeypatch.setattr(settings, "worker_metrics_interval", 0.01)
+    redis = AsyncMock()
+    redis.zcard = AsyncMock(side_effect=[7, ConnectionError("down"), 3, 3, 3, 3])
+
+    task = asyncio.create_task(sample_queue_depth(redis))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # A failed sample doesn't stop the sampler
+    assert REGISTRY.get_sample_value("arq_queue_depth") == 3
+    redis.zcard.assert_awaited_with("arq:queue")
@@ -0,0 +1,145 @@
+"""
+Tests for the job_progress_events partition maintenance and compaction.
+
+Runs against the partitioned test table (created by metadata.create_all
+with only the DEFAULT partition).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models import ProcessingJob
+from app.models.job_progress import JobProgressEvent
+from app.workers.maintenance import (
+    compact_progress_events,
+    drop_expired_partitions,
+    ensure_partition,
+    list_partitions,
+    maintain_progress_partitions,
+)
+
+
+async def _partition_of(test_engine, event_id) -> str:
+    async with test_engine.connect() as conn:
+        return await conn.scalar(
+            text("SELECT tableoid::regclass::text FROM job_progress_events WHERE id = :id"),
+            {"id": event_id}
+        )
+
+
+@pytest.fixture
+async def job(test_db, test_list):
+    job = ProcessingJob(list_id=test_list.id, total_videos=3, status="running")
+    test_db.add(job)
+    await test_db.commit()
+    return job
+
+
+@pytest.mark.asyncio
+async def test_new_partition_takes_over_rows_from_default(test_db, test_engine, job):
+    month = datetime(2031, 5, 1, tzinfo=timezone.utc)
+    event = JobProgressEvent(job_id=job.id, progress_data={"progress": 1}, created_at=month + timedelta(days=3))
+    test_db.add(event)
+    await test_db.commit()
+    assert await _partition_of(test_engine, event.id) == "job_progress_events_default"
+
+    async with test_engine.begin() as conn:
+        assert await ensure_partition(conn, month)
+        # Idempotent
+        assert not await ensure_partition(conn, month)
+
+    assert await _partition_of(test_engine, event.id) == "job_progress_events_p203105"
+
+
+@pytest.mark.asyncio
+async def test_maintenance_creates_upcoming_and_drops_expired_partitions(test_db, test_engine, job, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "progress_partitions_ahead", 1)
+    monkeypatch.setattr(settings, "progress_retention_months", 3)
+
+    async with test_engine.begin() as conn:
+        await ensure_partition(conn, datetime(2030, 1, 1, tzinfo=timezone.utc))
+    expired = JobProgressEvent(
+        job_id=job.id,
+        progress_data={"progress": 1},
+        created_at=datetime(2030, 1, 15, tzinfo=timezone.utc)
+    )
+    test_db.add(expired)
+    await test_db.commit()
+
+    result = await maintain_progress_partitions({}, test_engine, now=datetime(2030, 5, 20, tzinfo=timezone.utc))
+
+    assert result["created"] == ["job_progress_events_p203005", "job_progress_events_p203006"]
+    assert result["dropped"] == ["job_progress_events_p203001"]
+    async with test_engine.connect() as conn:
+        assert "job_progress_events_p203001" not in await list_partitions(conn)
+        # The DEFAULT partition is never dropped
+        assert "job_progress_events_default" in await list_partitions(conn)
+        assert not await drop_expired_partitions(conn, datetime(2030, 5, 20, tzinfo=timezone.utc), 3)
+    test_db.expunge(expired)
+    result = await test_db.execute(select(JobProgressEvent).where(JobProgressEvent.job_id == job.id))
+    assert result.scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_maintenance_creates_each_partition_once(test_engine, monkeypatch):
+    import asyncio
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "progress_partitions_ahead", 2)
+    monkeypatch.setattr(settings, "progress_retention_months", 120)
+
+    # Several workers starting at once (run_at_startup)
+    now = datetime(2032, 8, 10, tzinfo=timezone.utc)
+    results = await asyncio.gather(*(maintain_progress_partitions({}, test_engine, now=now) for _ in range(3)))
+
+    created = [name for result in results for name in result["created"]]
+    assert sorted(created) == [
+        "job_progress_events_p203208", "job_progress_events_p203209", "job_progress_events_p203210"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_compaction_collapses_finished_job_history(test_db, job, mock_session_factory, client, test_user):
+    start = datetime.now(timezone.utc) - timedelta(days=2)
+    events = [
+        {"status": "processing", "progress": 33, "video_id": "v1"},
+        {"status": "processing", "progress": 66, "video_id": "v2", "error": "Private video"},
+        {"status": "completed", "progress": 100, "message": "Done"},
+    ]
+    for i, progress_data in enumerate(events):
+        test_db.add(JobProgressEvent(job_id=job.id, progress_data=progress_data, created_at=start + timedelta(seconds=i)))
+    job.status = "completed"
+    await test_db.commit()
+
+    async def job_events():
+        async with mock_session_factory() as session:
+            result = await session.execute(select(JobProgressEvent).where(JobProgressEvent.job_id == job.id))
+            return result.scalars().all()
+
+    # Not finished long enough yet
+    await compact_progress_events({}, mock_session_factory)
+    assert len(await job_events()) == 3
+
+    # Other tests' jobs share the database, so check this job's rows only
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+    result = await compact_progress_events({}, mock_session_factory, now=later)
+    assert result["jobs"] >= 1
+    rows = await job_events()
+    # Compacted jobs are not picked up again
+    await compact_progress_events({}, mock_session_factory, now=later)
+    assert [row.id for row in await job_events()] == [rows[0].id]
+
+    assert len(rows) == 1
+    summary = rows[0].progress_data
+    assert summary["status"] == "completed"
+    assert (summary["event_count"], summary["error_count"]) == (3, 1)
+    assert summary["errors"] == [{"video_id": "v2", "error": "Private video"}]
+    assert rows[0].created_at == start + timedelta(seconds=2)
+
+    # The progress endpoint still reports the last error
+    response = await client.get(f"/api/jobs/{job.id}/progress")
+    assert response.status_code == 200
+    assert response.json()["last_error"] == "Private video"
+    assert response.json()["last_error_video_id"] == "v2"
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.core.metrics import PROGRESS_EVENTS_DROPPED
+from app.models.job import ProcessingJob
+from app.models.job_progress import JobProgressEvent
+from app.models.list import BookmarkList
+from app.workers.progress_sink import ProgressSink
+
+
+@pytest.fixture
+async def job(test_db, test_user):
+    bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+    test_db.add(bookmark_list)
+    await test_db.commit()
+
+    job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+    test_db.add(job)
+    await test_db.commit()
+    return job
+
+
+async def _events(test_db, job_id):
+    result = await test_db.execute(
+        select(JobProgressEvent)
+        .where(JobProgressEvent.job_id == job_id)
+        .order_by(JobProgressEvent.created_at)
+    )
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_flush_batches_publishes_and_inserts(test_db, job, mock_redis, mock_session_factory):
+    sink = ProgressSink(mock_redis, mock_session_factory)
+    for progress in (10, 20, 30):
+        sink.submit("1", str(job.id), {"progress": progress})
+    assert sink.backlog == 3
+
+    await sink.flush()
+
+    assert sink.backlog == 0
+    # One round trip for the stream appends, one for the publishes
+    assert mock_redis.pipeline.call_count == 2
+    assert mock_redis.xadd.call_count == 3
+    stream, fields = mock_redis.xadd.call_args_list[0][0]
+    assert stream == "progress:stream:1"
+    assert json.loads(fields["data"]) == {"progress": 10}
+
+    published = [json.loads(c[0][1]) for c in mock_redis.publish.call_args_list]
+    assert [m["event_id"] for m in published] == ["1-0", "2-0", "3-0"]
+
+    # One snapshot update per job, holding the newest values
+    mock_redis.hset.assert_awaited_once()
+    assert mock_redis.hset.call_args[0][0] == f"job:{job.id}:progress"
+    assert mock_redis.hset.call_args[1]["mapping"]["progress"] == "30"
+    assert mock_redis.hset.call_args[1]["mapping"]["event_id"] == "3-0"
+
+    events = await _events(test_db, job.id)
+    assert [e.progress_data["progress"] for e in events] == [10, 20, 30]
+    assert [e.progress_data["event_id"] for e in events] == ["1-0", "2-0", "3-0"]
+    assert len({e.created_at for e in events}) == 3
+
+
+@pytest.mark.asyncio
+async def test_background_flush_and_close(test_db, job, mock_redis, mock_session_factory):
+    sink = ProgressSink(mock_redis, mock_session_factory, flush_interval=0.01)
+    sink.start()
+    assert sink.running
+
+    sink.submit("1", str(job.id), {"progress": 10})
+    # Flushed by the background task, without an explicit flush()
+    for _ in range(100):
+        if mock_redis.publish.call_count:
+            break
+        await asyncio.sleep(0.01)
+    assert mock_redis.publish.call_count == 1
+
+    sink.submit("1", str(job.id), {"progress": 100})
+    await sink.close()
+    assert not sink.running
+    assert len(await _events(test_db, job.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_drops_oldest(mock_redis, mock_session_factory):
+    dropped = PROGRESS_EVENTS_DROPPED.labels("backlog_full")
+    before = dropped._value.get()
+
+    sink = ProgressSink(mock_redis, mock_session_factory, max_backlog=2)
+    for progress in (10, 20, 30):
+        sink.submit("1", "job", {"job_id": "job", "progress": progress})
+
+    assert sink.backlog == 2
+    assert dropped._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_keeps_final_and_error_events(mock_redis, mock_session_factory):
+    sink = ProgressSink(mock_redis, mock_session_factory, max_backlog=2)
+    sink.submit("1", "job", {"job_id": "job", "status": "processing", "error": "Video unavailable"})
+    sink.submit("1", "job", {"job_id": "job", "status": "processing", "progress": 50})
+    sink.submit("1", "job", {"job_id": "job", "status": "cancelled"})
+    # No plain update left to drop: a further one is dropped, a final event kept
+    sink.submit("1", "job", {"job_id": "job", "status": "processing", "progress": 60})
+    sink.submit("1", "job", {"job_id": "job", "status": "completed"})
+
+    assert [event[2].get("error") or event[2]["status"] for event in sink._events] == [
+        "Video unavailable", "cancelled", "completed"
+    ]
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Video
+from app.models.list import BookmarkList
+from app.models.job import ProcessingJob
+from app.workers.status_writer import JobStatusWriter
+
+
+@pytest.fixture
+async def job_with_videos(test_db, test_user):
+    bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+    test_db.add(bookmark_list)
+    await test_db.commit()
+
+    videos = [
+        Video(list_id=bookmark_list.id, youtube_id=f"vid{i:08d}", processing_status="pending")
+        for i in range(3)
+    ]
+    job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+    test_db.add_all([*videos, job])
+    await test_db.commit()
+    return job, videos
+
+
+async def _reload(test_db, job, videos):
+    job_id, video_ids = job.id, [v.id for v in videos]
+    test_db.expire_all()
+    job = await test_db.get(ProcessingJob, job_id)
+    result = await test_db.execute(
+        select(Video).where(Video.id.in_(video_ids)).order_by(Video.youtube_id)
+    )
+    return job, result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_statuses_and_counters(test_db, job_with_videos, mock_session_factory):
+    job, videos = job_with_videos
+    writer = JobStatusWriter(mock_session_factory, str(job.id))
+
+    writer.record(str(videos[0].id), "completed")
+    writer.record(str(videos[1].id), "failed", "Video unavailable")
+    assert await writer.flush()
+    assert writer.pending == 0
+
+    writer.record(str(videos[2].id), "completed")
+    assert await writer.flush(job_status="completed")
+
+    job, videos = await _reload(test_db, job, videos)
+    assert [v.processing_status for v in videos] == ["completed", "failed", "completed"]
+    assert videos[1].error_message == "Video unavailable"
+    assert job.processed_count == 2
+    assert job.failed_count == 1
+    assert job.status == "completed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_status, final_status", [
+    # Paused after the worker's last control check: every video is done
+    ("paused", "completed"),
+    # A cancel from the API always wins
+    ("cancelled", "cancelled"),
+])
+async def test_final_status_after_late_pause_or_cancel(
+    test_db, job_with_videos, mock_session_factory, api_status, final_status
+):
+    job, videos = job_with_videos
+    writer = JobStatusWriter(mock_session_factory, str(job.id))
+
+    job.status = api_status
+    await test_db.commit()
+
+    writer.record(str(videos[0].id), "completed")
+    assert await writer.flush(job_status="completed")
+
+    job, _ = await _reload(test_db, job, videos)
+    assert job.status == final_status
+    assert job.processed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_maybe_flush_waits_for_full_batch(test_db, job_with_videos, mock_session_factory):
+    job, videos = job_with_videos
+    writer = JobStatusWriter(mock_session_factory, str(job.id), flush_every=2, flush_interval=3600)
+
+    writer.record(str(videos[0].id), "completed")
+    await writer.maybe_flush()
+    assert writer.pending == 1
+
+    writer.record(str(videos[1].id), "completed")
+    await writer.maybe_flush()
+    assert writer.pending == 0
+
+    job, _ = await _reload(test_db, job, videos)
+    assert job.processed_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_buffer(job_with_videos):
+    job, videos = job_with_videos
+
+    def broken_factory():
+        raise ConnectionError("database down")
+
+    writer = JobStatusWriter(broken_factory, str(job.id))
+    writer.record(str(videos[0].id), "completed")
+
+    assert not await writer.flush()
+    assert writer.pending == 1
@@ -0,0 +1,55 @@
+"""
+Tests for the worker's outbound call layer and its lifecycle hooks.
+"""
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.config import settings
+from app.workers.concurrency import AdaptiveLimiter
+from app.workers.settings import WorkerSettings, startup, shutdown
+from app.workers.upstream import call_upstream
+
+
+@pytest.mark.asyncio
+async def test_call_upstream_consults_quota_then_limiter():
+    quota = AsyncMock()
+    limiter = AdaptiveLimiter("youtube", initial=1, maximum=1, target_latency=1.0)
+    client = object()
+    ctx = {"quota": quota, "limiters": {"youtube": limiter}, "http_clients": {"youtube": client}}
+
+    async def request(http_client):
+        assert http_client is client
+        assert limiter.in_flight == 1
+        return "response"
+
+    result = await call_upstream(ctx, "youtube", "videos.list", request)
+
+    assert result == "response"
+    quota.acquire.assert_awaited_once_with("youtube", "videos.list")
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_startup_creates_pooled_clients(mock_redis, monkeypatch):
+    monkeypatch.setattr(settings, "worker_metrics_port", 0)
+    assert WorkerSettings.on_startup is startup
+    assert WorkerSettings.on_shutdown is shutdown
+
+    ctx = {"redis": mock_redis}
+    await startup(ctx)
+
+    clients = ctx["http_clients"]
+    assert set(clients) == {"youtube", "gemini"}
+    youtube = clients["youtube"]
+    assert isinstance(youtube, httpx.AsyncClient)
+    assert str(youtube.base_url).rstrip("/") == settings.youtube_api_base_url
+    assert youtube.timeout.read == settings.youtube_timeout
+    assert youtube.timeout.connect == settings.upstream_connect_timeout
+    assert set(ctx["limiters"]) == {"youtube", "gemini"}
+
+    await shutdown(ctx)
+
+    assert youtube.is_closed
+    assert "http_clients" not in ctx
@@ -98,21 +98,6 @@ async def test_process_video_with_retry_on_transient_error(test_db, test_user):
     assert result["status"] == "success"
 
 
-@pytest.fixture
-async def mock_redis():
-    """Mock Redis client for testing."""
-    redis_mock = AsyncMock()
-    redis_mock.publish = AsyncMock(return_value=1)
-    return redis_mock
-
-
-@pytest.fixture
-async def mock_session_factory(test_engine):
-    """Mock AsyncSessionLocal factory to use test database."""
-    from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
-
-
 @pytest.mark.asyncio
 async def test_worker_publishes_progress_to_redis_and_db(mock_redis, test_db, test_user, mock_session_factory):
     """Test that worker publishes progress to both Redis and DB"""
@@ -331,3 +316,286 @@ async def test_user_id_cached_in_context(mock_redis, test_db, test_user, mock_se
         # Assert: Context contains cached user_id
         assert "job_user_id" in ctx
         assert ctx["job_user_id"] == str(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_worker_pauses_when_quota_exhausted(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that an exhausted daily quota defers the remainder instead of failing videos"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+        list_id = bookmark_list.id
+
+        job = ProcessingJob(list_id=list_id, total_videos=3, status="running")
+        test_db.add(job)
+        await test_db.commit()
+        job_id = job.id
+
+        video_ids = [str(uuid4()) for _ in range(3)]
+
+        # Gemini quota runs out after the first video (youtube, gemini per video)
+        quota = MagicMock()
+        quota.has_quota = AsyncMock(side_effect=[True, True, True, False])
+        quota.seconds_until_reset = MagicMock(return_value=3600)
+
+        ctx = {"redis": mock_redis, "quota": quota}
+        result = await process_video_list(ctx, str(job_id), str(list_id), video_ids)
+
+        assert result == {"job_id": str(job_id), "processed": 1, "failed": 0, "paused": True}
+
+        # Only the unprocessed remainder is re-enqueued, deferred until the reset
+        mock_redis.enqueue_job.assert_awaited_once()
+        call = mock_redis.enqueue_job.await_args
+        assert call.args == ("process_video_list", str(job_id), str(list_id), video_ids[1:])
+        # trace_context is only passed while tracing is enabled
+        kwargs = {name: value for name, value in call.kwargs.items() if name != "trace_context"}
+        assert kwargs == {
+            "checkpoint": {"position": 1, "total_videos": 3, "processed": 1, "failed": 0},
+            "_defer_by": 3600
+        }
+
+        # Client is told the job is paused, and so is anyone polling the job
+        last_message = json.loads(mock_redis.publish.call_args_list[-1][0][1])
+        assert last_message["status"] == "paused"
+        assert last_message["current_video"] == 1
+        assert "gemini" in last_message["message"]
+
+        await test_db.refresh(job)
+        assert job.status == "paused"
+        assert job.processed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_continuation_sets_job_running(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that the deferred continuation of a quota pause marks the job running again"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="paused", processed_count=1)
+        test_db.add(job)
+        await test_db.commit()
+
+        statuses = []
+
+        async def record_status(ctx, video_id, list_id, schema):
+            async with mock_session_factory() as session:
+                statuses.append(await session.scalar(
+                    select(ProcessingJob.status).where(ProcessingJob.id == job.id)
+                ))
+            return {"status": "success", "video_id": video_id}
+
+        with patch('app.workers.video_processor.process_video', record_status):
+            result = await process_video_list(
+                {"redis": mock_redis}, str(job.id), str(bookmark_list.id), [str(uuid4()), str(uuid4())],
+                checkpoint={"position": 1, "total_videos": 3, "processed": 1, "failed": 0}
+            )
+
+        assert result["processed"] == 3
+        assert statuses == ["running", "running"]
+
+        await test_db.refresh(job)
+        assert job.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_worker_resumes_from_checkpoint(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that a continued job keeps position and counters of the earlier run"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=4, status="running")
+        test_db.add(job)
+        await test_db.commit()
+
+        ctx = {"redis": mock_redis}
+        result = await process_video_list(
+            ctx, str(job.id), str(bookmark_list.id), [str(uuid4()), str(uuid4())],
+            checkpoint={"position": 2, "total_videos": 4, "processed": 1, "failed": 1}
+        )
+
+        assert result["processed"] == 3
+        assert result["failed"] == 1
+
+        first_message = json.loads(mock_redis.publish.call_args_list[0][0][1])
+        assert first_message["progress"] == 50
+        assert first_message["current_video"] == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_pauses_on_request(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that a pause request checkpoints the remainder and stops the job"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+        test_db.add(job)
+        await test_db.commit()
+
+        video_ids = [str(uuid4()) for _ in range(3)]
+        # Not paused before video 1, paused from video 2 on
+        mock_redis.get.side_effect = [None, b"pause", b"pause"]
+
+        ctx = {"redis": mock_redis}
+        result = await process_video_list(ctx, str(job.id), str(bookmark_list.id), video_ids)
+
+        assert result == {"job_id": str(job.id), "processed": 1, "failed": 0, "paused": True}
+
+        key, payload = mock_redis.set.call_args[0]
+        assert key == f"job:{job.id}:checkpoint"
+        saved = json.loads(payload)
+        assert saved["video_ids"] == video_ids[1:]
+        assert saved["checkpoint"] == {"position": 1, "total_videos": 3, "processed": 1, "failed": 0}
+
+        last_message = json.loads(mock_redis.publish.call_args_list[-1][0][1])
+        assert last_message["status"] == "paused"
+        assert last_message["current_video"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_continues_when_resumed_during_checkpoint(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that the worker keeps going if it wins the checkpoint after a quick resume"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=2, status="running")
+        test_db.add(job)
+        await test_db.commit()
+
+        # Paused before video 1, resumed before the worker re-checked the flag
+        mock_redis.get.side_effect = [b"pause", None, None]
+        mock_redis.getdel.return_value = b'{"list_id": "x", "video_ids": [], "checkpoint": {}}'
+
+        ctx = {"redis": mock_redis}
+        result = await process_video_list(
+            ctx, str(job.id), str(bookmark_list.id), [str(uuid4()), str(uuid4())]
+        )
+
+        assert result == {"job_id": str(job.id), "processed": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_worker_stops_on_cancel(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that a cancel request stops the job without a checkpoint"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+        test_db.add(job)
+        await test_db.commit()
+
+        mock_redis.get.side_effect = [None, None, b"cancel"]
+
+        ctx = {"redis": mock_redis}
+        result = await process_video_list(
+            ctx, str(job.id), str(bookmark_list.id), [str(uuid4()) for _ in range(3)]
+        )
+
+        assert result == {"job_id": str(job.id), "processed": 2, "failed": 0, "cancelled": True}
+        mock_redis.set.assert_not_called()
+
+        last_message = json.loads(mock_redis.publish.call_args_list[-1][0][1])
+        assert last_message["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_worker_persists_video_status_and_counters(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that the job's counters and final status are written to the database"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        videos = [
+            Video(list_id=bookmark_list.id, youtube_id=f"vid{i:08d}", processing_status="pending")
+            for i in range(3)
+        ]
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=3, status="running")
+        test_db.add_all([*videos, job])
+        await test_db.commit()
+
+        ctx = {"redis": mock_redis}
+        job_id, list_id = job.id, bookmark_list.id
+        await process_video_list(ctx, str(job_id), str(list_id), [str(v.id) for v in videos])
+
+        test_db.expire_all()
+        job = await test_db.get(ProcessingJob, job_id)
+        assert job.processed_count == 3
+        assert job.failed_count == 0
+        assert job.status == "completed"
+
+        result = await test_db.execute(select(Video.processing_status).where(Video.list_id == list_id))
+        assert set(result.scalars().all()) == {"completed"}
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_empty_video_list(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that a job without videos completes instead of dividing by zero"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=0, status="running")
+        test_db.add(job)
+        await test_db.commit()
+
+        ctx = {"redis": mock_redis}
+        result = await process_video_list(ctx, str(job.id), str(bookmark_list.id), [])
+
+        assert result == {"job_id": str(job.id), "processed": 0, "failed": 0}
+        messages = [json.loads(call[0][1]) for call in mock_redis.publish.call_args_list]
+        assert messages[0]["progress"] == 0
+        assert messages[-1]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_job_paused_after_last_check(mock_redis, test_db, test_user, mock_session_factory):
+    """Test that a pause arriving after the last control check doesn't strand the job"""
+    from app.workers.video_processor import process_video_list
+
+    with patch('app.workers.video_processor.AsyncSessionLocal', mock_session_factory):
+        bookmark_list = BookmarkList(name="Test List", user_id=test_user.id)
+        test_db.add(bookmark_list)
+        await test_db.commit()
+
+        # The API paused the job while its last video was being processed
+        job = ProcessingJob(list_id=bookmark_list.id, total_videos=2, status="paused")
+        test_db.add(job)
+        await test_db.commit()
+
+        ctx = {"redis": mock_redis}
+        job_id = job.id
+        result = await process_video_list(ctx, str(job_id), str(bookmark_list.id), [str(uuid4()), str(uuid4())])
+
+        assert result == {"job_id": str(job_id), "processed": 2, "failed": 0}
+        test_db.expire_all()
+        job = await test_db.get(ProcessingJob, job_id)
+        assert job.status == "completed"
+        mock_redis.delete.assert_awaited_with(f"job:{job_id}:control")
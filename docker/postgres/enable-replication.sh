@@ -0,0 +1,5 @@
+#!/bin/sh
+# Runs once when the primary's data directory is initialized: allow
+# streaming replication connections for the postgres-replica service.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -11,6 +11,8 @@ const statusColors = {
   completed: 'bg-green-500',
   failed: 'bg-red-500',
   completed_with_errors: 'bg-amber-500',
+  paused: 'bg-yellow-400',
+  cancelled: 'bg-gray-500',
 };
 
 const statusBadgeClasses = {
@@ -19,6 +21,8 @@ const statusBadgeClasses = {
   completed: 'bg-green-50 text-green-900 border border-green-200',
   failed: 'bg-red-50 text-red-900 border border-red-200',
   completed_with_errors: 'bg-amber-50 text-amber-900 border border-amber-300',
+  paused: 'bg-yellow-50 text-yellow-900 border border-yellow-300',
+  cancelled: 'bg-gray-100 text-gray-700 border border-gray-400',
 };
 
 const statusLabels = {
@@ -27,6 +31,8 @@ const statusLabels = {
   completed: 'Completed',
   failed: 'Failed',
   completed_with_errors: 'Completed with errors',
+  paused: 'Paused',
+  cancelled: 'Cancelled',
 };
 
 const statusIcons = {
@@ -35,6 +41,8 @@ const statusIcons = {
   completed: '✓',
   failed: '✗',
   completed_with_errors: '⚠️',
+  paused: '⏸',
+  cancelled: '⏹',
 };
 
 export function ProgressBar({ progress }: ProgressBarProps) {
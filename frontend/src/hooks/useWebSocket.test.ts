@@ -294,6 +294,59 @@ describe('useWebSocket', () => {
 
     });
 
+    it('relies on stream replay instead of history API when last_event_id is known', async () => {
+      const mockFetch = vi.fn().mockResolvedValue({ ok: true, json: async () => [] });
+      global.fetch = mockFetch;
+
+      renderHook(() => useWebSocket());
+
+      await act(async () => {
+        await vi.advanceTimersByTimeAsync(0);
+      });
+
+      const wsInstance = MockWebSocket.instances[0]!;
+      await act(async () => {
+        wsInstance.simulateMessage({ type: 'auth_confirmed', authenticated: true });
+        wsInstance.simulateMessage({
+          job_id: 'job-123',
+          event_id: '1700000000000-0',
+          status: 'processing',
+          progress: 50,
+          current_video: 5,
+          total_videos: 10,
+          message: 'Processing video 5/10'
+        });
+      });
+
+      // Disconnect and reconnect
+      await act(async () => {
+        wsInstance.close();
+      });
+      await act(async () => {
+        await vi.advanceTimersByTimeAsync(3000);
+      });
+
+      const wsInstance2 = MockWebSocket.instances[1]!;
+      expect(wsInstance2.url).toContain('last_event_id=1700000000000-0');
+      await act(async () => {
+        wsInstance2.simulateMessage({ type: 'auth_confirmed', authenticated: true });
+        await vi.runOnlyPendingTimersAsync();
+      });
+
+      // The server replays from its stream: no Postgres round trip
+      expect(mockFetch).not.toHaveBeenCalled();
+
+      // Only an incomplete replay falls back to the history API
+      await act(async () => {
+        wsInstance2.simulateMessage({ type: 'replay_incomplete' });
+        await vi.runOnlyPendingTimersAsync();
+      });
+      expect(mockFetch).toHaveBeenCalledWith(
+        expect.stringContaining('/api/jobs/job-123/progress-history'),
+        expect.anything()
+      );
+    });
+
     it('does NOT call history API on initial connect', async () => {
       const mockFetch = vi.fn();
       global.fetch = mockFetch;
@@ -4,14 +4,18 @@ import { useState, useEffect, useRef } from 'react';
  * Progress update data structure received from WebSocket
  */
 export interface ProgressUpdate {
+  event_id?: string; // Redis stream id, used to resume after reconnect
   job_id: string;
-  status: 'pending' | 'processing' | 'completed' | 'failed' | 'completed_with_errors';
+  status: 'pending' | 'processing' | 'completed' | 'failed' | 'completed_with_errors' | 'paused' | 'cancelled';
   progress: number;
   current_video: number;
   total_videos: number;
   message: string;
   video_id?: string;
   error?: string;
+  processed?: number;
+  failed?: number;
+  eta_seconds?: number;
   timestamp?: number; // Added on frontend for cleanup logic
 }
 
@@ -39,7 +43,8 @@ const COMPLETED_JOB_TTL = 5 * 60 * 1000; // 5 minutes
  * Features:
  * - Post-connection authentication (Option B security fix)
  * - Automatic reconnection with exponential backoff
- * - History API integration on reconnect
+ * - Replay of missed events on reconnect (last_event_id)
+ * - History API fallback when the replay is incomplete
  * - Job cleanup after TTL
  *
  * @returns WebSocket state and job progress map
@@ -57,6 +62,7 @@ export function useWebSocket(): UseWebSocketReturn {
   const isReconnectingRef = useRef(false); // Track if this is a reconnection
   const monitoredJobsRef = useRef<Set<string>>(new Set()); // Track jobs for history API
   const lastConnectedTimeRef = useRef<Map<string, number>>(new Map()); // Issue #2: Track last connected time per job
+  const lastEventIdRef = useRef<string | null>(null); // Resume point for server-side replay
 
   useEffect(() => {
     const connect = () => {
@@ -70,7 +76,11 @@ export function useWebSocket(): UseWebSocketReturn {
 
       // Connect WITH token as query parameter (backend expects this)
       // TODO: Move to post-connection auth (Option B) once backend supports it
-      const ws = new WebSocket(`${WS_URL}?token=${token}`);
+      // On reconnect the server replays everything after the last event we saw
+      const resume = lastEventIdRef.current
+        ? `&last_event_id=${encodeURIComponent(lastEventIdRef.current)}`
+        : '';
+      const ws = new WebSocket(`${WS_URL}?token=${token}${resume}`);
 
       ws.onopen = async () => {
         console.log('WebSocket connected');
@@ -101,8 +111,14 @@ export function useWebSocket(): UseWebSocketReturn {
           if (data.type === 'auth_confirmed' && data.authenticated) {
             setAuthStatus('authenticated');
 
-            // Issue #1: NOW fetch history after auth confirmed (not in onopen)
-            if (isReconnectingRef.current && monitoredJobsRef.current.size > 0) {
+            // Issue #1: NOW fetch history after auth confirmed (not in onopen).
+            // With a known last_event_id the server replays from its stream
+            // instead; history is only the fallback (see replay_incomplete)
+            if (
+              isReconnectingRef.current &&
+              !lastEventIdRef.current &&
+              monitoredJobsRef.current.size > 0
+            ) {
               fetchJobHistory(Array.from(monitoredJobsRef.current), token);
             }
             return;
@@ -114,9 +130,21 @@ export function useWebSocket(): UseWebSocketReturn {
             return;
           }
 
+          // Server could not replay everything we missed: fill the gap from history
+          if (data.type === 'replay_incomplete') {
+            if (monitoredJobsRef.current.size > 0) {
+              fetchJobHistory(Array.from(monitoredJobsRef.current), token);
+            }
+            return;
+          }
+
           // Handle progress updates
           const update: ProgressUpdate = data;
 
+          if (update.event_id) {
+            lastEventIdRef.current = update.event_id;
+          }
+
           // Add timestamp for cleanup logic
           update.timestamp = Date.now();
 
@@ -127,7 +155,7 @@ export function useWebSocket(): UseWebSocketReturn {
           monitoredJobsRef.current.add(update.job_id);
 
           // Issue #3: Remove from monitored set after TTL if terminal state
-          if (['completed', 'failed', 'completed_with_errors'].includes(update.status)) {
+          if (['completed', 'failed', 'completed_with_errors', 'cancelled'].includes(update.status)) {
             setTimeout(() => {
               monitoredJobsRef.current.delete(update.job_id);
             }, COMPLETED_JOB_TTL);